@@ -13,7 +13,7 @@ from rest_framework.views import APIView
 from authentik import authentik_build_hash, authentik_version
 from authentik.admin.tasks import VERSION_CACHE_KEY, VERSION_NULL, update_latest_version
 from authentik.core.api.utils import PassiveSerializer
-from authentik.outposts.models import Outpost
+from authentik.outposts.models import Outpost, OutpostState
 from authentik.tenants.utils import get_current_tenant
 
 
@@ -55,12 +55,11 @@ class VersionSerializer(PassiveSerializer):
 
     def get_outpost_outdated(self, _) -> bool:
         """Check if any outpost is outdated/has a version mismatch"""
-        any_outdated = False
-        for outpost in Outpost.objects.all():
-            for state in outpost.state:
+        for states in OutpostState.for_outposts(Outpost.objects.all()).values():
+            for state in states:
                 if state.version_outdated:
-                    any_outdated = True
-        return any_outdated
+                    return True
+        return False
 
 
 class VersionView(APIView):
@@ -1,17 +1,166 @@
 """Pagination which includes total pages and current page"""
 
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from json import JSONDecodeError, dumps, loads
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
 from drf_spectacular.plumbing import build_object_type
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 
+from authentik.api.v3.schema.query import QUERY_PARAMS
 from authentik.api.v3.schema.response import PAGINATION
 
 
+def estimate_count(queryset: QuerySet) -> int:
+    """Estimate the number of rows of `queryset` without counting them. For unfiltered
+    querysets the table statistics are used, otherwise the query planner's estimate."""
+    connection = connections[queryset.db]
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # Tables which have never been analyzed report -1
+            if row and row[0] >= 0:
+                return row[0]
+        sql, params = queryset.order_by().query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class KeysetPage:
+    """Single page of a keyset paginated queryset.
+
+    The queryset is ordered by its current ordering with the primary key appended,
+    and the cursor contains the values of the ordering fields of the first or last
+    row of a page, so the next page can be selected with an indexed comparison
+    instead of an OFFSET."""
+
+    def __init__(self, queryset: QuerySet, page_size: int, cursor: str):
+        self.queryset = queryset
+        self.page_size = page_size
+        self.ordering = self.get_ordering(queryset)
+        self.values, self.reverse = self.decode_cursor(cursor)
+        self.object_list = []
+        self.has_next = False
+        self.has_previous = False
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    @staticmethod
+    def get_ordering(queryset: QuerySet) -> list[str]:
+        """Get the ordering of the queryset as field names, with the primary key appended
+        to make the ordering stable"""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not all(isinstance(field, str) and field != "?" for field in ordering):
+            ordering = []
+        if not {"pk", "-pk", queryset.model._meta.pk.name}.intersection(
+            field.lstrip("-") for field in ordering
+        ):
+            ordering.append("pk")
+        return ordering
+
+    def decode_cursor(self, cursor: str) -> tuple[list | None, bool]:
+        if not cursor:
+            return None, False
+        try:
+            data = loads(b64decode(cursor.encode(), validate=True))
+            values, reverse = data["v"], bool(data["r"])
+        except (BinasciiError, JSONDecodeError, KeyError, TypeError, ValueError):
+            raise NotFound("Invalid cursor") from None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        return values, reverse
+
+    def encode_cursor(self, values: tuple, reverse: bool) -> str:
+        return b64encode(
+            dumps({"v": list(values), "r": reverse}, cls=DjangoJSONEncoder).encode()
+        ).decode()
+
+    def _after(self, field: str, value, descending: bool) -> Q:
+        """Rows ordered strictly after `value` in a single field, in PostgreSQL NULL values
+        are sorted last in ascending order, and first in descending order"""
+        if descending:
+            if value is None:
+                return Q(**{f"{field}__isnull": False})
+            return Q(**{f"{field}__lt": value})
+        if value is None:
+            return Q(pk__in=[])
+        return Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+
+    def _equal(self, field: str, value) -> Q:
+        if value is None:
+            return Q(**{f"{field}__isnull": True})
+        return Q(**{field: value})
+
+    def paginate(self):
+        fields = [field.lstrip("-") for field in self.ordering]
+        descending = [field.startswith("-") for field in self.ordering]
+        if self.reverse:
+            descending = [not desc for desc in descending]
+        queryset = self.queryset.order_by(
+            *[
+                f"-{field}" if desc else field
+                for field, desc in zip(fields, descending, strict=True)
+            ]
+        )
+        if self.values is not None:
+            # (a, b, c) > (x, y, z) is a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+            condition = Q(pk__in=[])
+            for idx, field in enumerate(fields):
+                term = self._after(field, self.values[idx], descending[idx])
+                for prev_idx in range(idx):
+                    term &= self._equal(fields[prev_idx], self.values[prev_idx])
+                condition |= term
+            queryset = queryset.filter(condition)
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = self.values is not None
+        self.object_list = rows
+        if not rows:
+            return
+        boundaries = {
+            row[0]: row[1:]
+            for row in self.queryset.order_by()
+            .filter(pk__in=[rows[0].pk, rows[-1].pk])
+            .values_list("pk", *fields)
+        }
+        if self.has_next:
+            self.next_cursor = self.encode_cursor(boundaries[rows[-1].pk], False)
+        if self.has_previous:
+            self.previous_cursor = self.encode_cursor(boundaries[rows[0].pk], True)
+
+
 class Pagination(pagination.PageNumberPagination):
-    """Pagination which includes total pages and current page"""
+    """Pagination which includes total pages and current page.
+
+    When the `cursor` query parameter is given (empty for the first page), keyset
+    pagination is used instead, which doesn't use OFFSETs and doesn't count all rows.
+    In that case `next_cursor` and `previous_cursor` are returned, the page number fields
+    are 0, and `count` is an estimate."""
 
     page_query_param = "page"
     page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+
+    keyset: KeysetPage | None = None
 
     def get_page_size(self, request):
         if self.page_size_query_param in request.query_params:
@@ -20,7 +169,43 @@ class Pagination(pagination.PageNumberPagination):
                 return min(super().get_page_size(request), request.tenant.pagination_max_page_size)
         return request.tenant.pagination_default_page_size
 
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.cursor_query_param not in request.query_params or not isinstance(
+            queryset, QuerySet
+        ):
+            return super().paginate_queryset(queryset, request, view)
+        self.request = request
+        self.keyset = KeysetPage(
+            queryset,
+            self.get_page_size(request),
+            request.query_params[self.cursor_query_param],
+        )
+        self.keyset.paginate()
+        self.keyset_count = estimate_count(queryset)
+        return self.keyset.object_list
+
+    def get_keyset_paginated_response(self, data):
+        return Response(
+            {
+                "pagination": {
+                    "next": 0,
+                    "previous": 0,
+                    "count": self.keyset_count,
+                    "current": 0,
+                    "total_pages": 0,
+                    "start_index": 1 if self.keyset.object_list else 0,
+                    "end_index": len(self.keyset.object_list),
+                    "next_cursor": self.keyset.next_cursor or "",
+                    "previous_cursor": self.keyset.previous_cursor or "",
+                },
+                "results": data,
+            }
+        )
+
     def get_paginated_response(self, data):
+        if self.keyset:
+            return self.get_keyset_paginated_response(data)
         previous_page_number = 0
         if self.page.has_previous():
             previous_page_number = self.page.previous_page_number()
@@ -51,6 +236,12 @@ class Pagination(pagination.PageNumberPagination):
             required=["pagination", "results"],
         )
 
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            QUERY_PARAMS["cursor"].schema,
+        ]
+
 
 class SmallerPagination(Pagination):
     """Smaller pagination for objects which might require a lot of queries
@@ -0,0 +1,56 @@
+"""Pagination tests"""
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from authentik.core.models import Group
+from authentik.core.tests.utils import create_test_admin_user
+from authentik.lib.generators import generate_id
+
+
+class TestPagination(APITestCase):
+    """Pagination tests"""
+
+    def setUp(self) -> None:
+        self.user = create_test_admin_user()
+        self.client.force_login(self.user)
+        self.prefix = generate_id()
+        for idx in range(7):
+            Group.objects.create(name=f"{self.prefix}-{idx}")
+
+    def _list(self, **params) -> dict:
+        response = self.client.get(
+            reverse("authentik_api:group-list"),
+            data={"search": self.prefix, "ordering": "name", **params},
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_cursor(self):
+        """Test cursor pagination forwards and backwards"""
+        expected = [group["pk"] for group in self._list(page_size=100)["results"]]
+        self.assertEqual(len(expected), 7)
+
+        body = self._list(page_size=3, cursor="")
+        self.assertEqual(body["pagination"]["previous_cursor"], "")
+        pages = [[group["pk"] for group in body["results"]]]
+        while body["pagination"]["next_cursor"]:
+            body = self._list(page_size=3, cursor=body["pagination"]["next_cursor"])
+            pages.append([group["pk"] for group in body["results"]])
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        # And back again
+        body = self._list(page_size=3, cursor=body["pagination"]["previous_cursor"])
+        self.assertEqual([group["pk"] for group in body["results"]], pages[1])
+        body = self._list(page_size=3, cursor=body["pagination"]["previous_cursor"])
+        self.assertEqual([group["pk"] for group in body["results"]], pages[0])
+        self.assertEqual(body["pagination"]["previous_cursor"], "")
+
+    def test_cursor_invalid(self):
+        """Test invalid cursor"""
+        response = self.client.get(
+            reverse("authentik_api:group-list"),
+            data={"cursor": "foo"},
+        )
+        self.assertEqual(response.status_code, 404)
@@ -18,6 +18,20 @@ QUERY_PARAMS = {
             description=_("Which field to use when ordering the results."),
         ),
     ),
+    "cursor": ResolvedComponent(
+        name="QueryPaginationCursor",
+        type=ResolvedComponent.PARAMETER,
+        object="QueryPaginationCursor",
+        schema=build_parameter_type(
+            name="cursor",
+            schema=build_basic_type(OpenApiTypes.STR),
+            location="query",
+            description=_(
+                "Use cursor-based pagination, empty for the first page. When given, "
+                "the page parameter is ignored and the count is an estimate."
+            ),
+        ),
+    ),
     "page": ResolvedComponent(
         name="QueryPaginationPage",
         type=ResolvedComponent.PARAMETER,
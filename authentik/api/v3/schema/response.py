@@ -70,6 +70,8 @@ PAGINATION = ResolvedComponent(
             "total_pages": build_basic_type(OpenApiTypes.NUMBER),
             "start_index": build_basic_type(OpenApiTypes.NUMBER),
             "end_index": build_basic_type(OpenApiTypes.NUMBER),
+            "next_cursor": build_basic_type(OpenApiTypes.STR),
+            "previous_cursor": build_basic_type(OpenApiTypes.STR),
         },
         required=[
             "next",
@@ -9,12 +9,19 @@ from django.apps import AppConfig
 from django.conf import settings
 from django.db import DatabaseError, InternalError, ProgrammingError
 from dramatiq.broker import get_broker
+from prometheus_client import Histogram
 from structlog.stdlib import BoundLogger, get_logger
 
 from authentik.lib.utils.time import fqdn_rand
 from authentik.root.signals import startup
 from authentik.tasks.schedules.common import ScheduleSpec
 
+HIST_BLUEPRINTS_APPLY_TIME = Histogram(
+    "authentik_blueprints_apply_time_seconds",
+    "Duration of validating and applying a blueprint",
+    ["tenant", "blueprint"],
+)
+
 
 class ManagedAppConfig(AppConfig):
     """Basic reconciliation logic for apps"""
@@ -1,6 +1,7 @@
 """Apply blueprint from commandline"""
 
 from sys import exit as sys_exit
+from time import perf_counter
 
 from django.core.management.base import BaseCommand, no_translations
 from structlog.stdlib import get_logger
@@ -23,13 +24,28 @@ class Command(BaseCommand):
                 for blueprint_path in options.get("blueprints", []):
                     content = BlueprintInstance(path=blueprint_path).retrieve()
                     importer = Importer.from_string(content)
-                    valid, logs = importer.validate()
+                    start = perf_counter()
+                    valid, logs = importer.validate_and_apply()
                     if not valid:
                         self.stderr.write("Blueprint invalid")
                         for log in logs:
                             self.stderr.write(f"\t{log.logger}: {log.event}: {log.attributes}")
                         sys_exit(1)
-                    importer.apply()
+                    self.stdout.write(
+                        f"Applied {blueprint_path} ({len(importer.timings)} entries) "
+                        f"in {perf_counter() - start:.2f}s"
+                    )
+                    if options["timings"]:
+                        for timing in importer.timings:
+                            self.stdout.write(
+                                f"\t{timing.model} {timing.id or ''}: "
+                                f"{timing.duration * 1000:.2f}ms"
+                            )
 
     def add_arguments(self, parser):
         parser.add_argument("blueprints", nargs="+", type=str)
+        parser.add_argument(
+            "--timings",
+            action="store_true",
+            help="Show how long each entry took to apply.",
+        )
@@ -0,0 +1,88 @@
+"""Benchmark blueprint discovery"""
+
+from os import utime
+from pathlib import Path
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import perf_counter, time_ns
+
+from django.core.cache import cache
+from yaml import dump
+
+from authentik.blueprints.v1.tasks import BlueprintFileIndex, blueprints_find
+from authentik.lib.config import CONFIG
+from authentik.lib.generators import generate_id
+from authentik.lib.management.benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    """Benchmark finding blueprints in a directory of generated blueprints, without and with
+    the file index. The directory is removed afterwards."""
+
+    operation = "Runs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--files",
+            default=2000,
+            type=int,
+            help="How many blueprint files should be generated.",
+        )
+        parser.add_argument(
+            "-n",
+            "--runs",
+            default=5,
+            type=int,
+            help="How often blueprints should be discovered per run.",
+        )
+
+    def create_files(self, root: Path, count: int):
+        """Create `count` blueprints, each in its own directory like bundled blueprints"""
+        # Set the modification time in the past, so the files can be indexed
+        modified = time_ns() - 60 * 10**9
+        for idx in range(count):
+            directory = root / f"dir-{idx % 50}"
+            directory.mkdir(exist_ok=True)
+            path = directory / f"blueprint-{idx}.yaml"
+            path.write_text(
+                dump(
+                    {
+                        "version": 1,
+                        "metadata": {"name": generate_id(), "labels": {"foo": "bar"}},
+                        "entries": [
+                            {
+                                "model": "authentik_core.group",
+                                "identifiers": {"name": generate_id()},
+                                "attrs": {"attributes": {"foo": generate_id()}},
+                            }
+                            for _ in range(10)
+                        ],
+                    }
+                )
+            )
+            utime(path, ns=(modified, modified))
+
+    def benchmark(self, runs: int, clear: bool) -> list[float]:
+        """Find blueprints `runs` times, returning the duration of each run"""
+        durations = []
+        root = Path(CONFIG.get("blueprints_dir"))
+        for _ in range(runs):
+            if clear:
+                cache.delete(BlueprintFileIndex(root).cache_key)
+            start = perf_counter()
+            blueprints_find()
+            durations.append(perf_counter() - start)
+        return durations
+
+    def handle_benchmark(self, **options):
+        root = Path(mkdtemp("authentik-blueprints-benchmark"))
+        try:
+            self.create_files(root, options["files"])
+            with CONFIG.patch("blueprints_dir", str(root)):
+                self.output("Without file index", self.benchmark(options["runs"], True))
+                # Fill the index
+                blueprints_find()
+                self.output("With file index", self.benchmark(options["runs"], False))
+                cache.delete(BlueprintFileIndex(root).cache_key)
+        finally:
+            rmtree(root)
@@ -38,6 +38,31 @@ class TestBlueprintsV1(TransactionTestCase):
         )
         self.assertFalse(importer.validate()[0])
 
+    def test_validate_and_apply(self):
+        """Test validating and applying in a single pass"""
+        name = generate_id()
+        importer = Importer.from_string(
+            f'{{"version": 1, "entries": [{{"identifiers": {{"name": "{name}"}}, '
+            '"model": "authentik_core.Group"}]}'
+        )
+        applied, _ = importer.validate_and_apply()
+        self.assertTrue(applied)
+        self.assertTrue(Group.objects.filter(name=name).exists())
+        self.assertEqual(len(importer.timings), 1)
+        self.assertEqual(importer.timings[0].model, "authentik_core.Group")
+
+        # Entries before an invalid entry are rolled back
+        other_name = generate_id()
+        importer = Importer.from_string(
+            f'{{"version": 1, "entries": [{{"identifiers": {{"name": "{other_name}"}}, '
+            '"model": "authentik_core.Group"}, {"identifiers": {}, "attrs": {}, '
+            '"model": "authentik_core.Group"}]}'
+        )
+        applied, logs = importer.validate_and_apply()
+        self.assertFalse(applied)
+        self.assertTrue(logs)
+        self.assertFalse(Group.objects.filter(name=other_name).exists())
+
     def test_validated_import_dict_identifiers(self):
         """Test importing blueprints with dict identifiers."""
         Group.objects.filter(name__istartswith="test").delete()
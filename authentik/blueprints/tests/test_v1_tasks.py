@@ -1,13 +1,22 @@
 """Test blueprints v1 tasks"""
 
 from hashlib import sha512
+from os import utime
+from pathlib import Path
 from tempfile import NamedTemporaryFile, mkdtemp
+from time import time_ns
+from unittest.mock import patch
 
 from django.test import TransactionTestCase
 from yaml import dump
 
 from authentik.blueprints.models import BlueprintInstance, BlueprintInstanceStatus
-from authentik.blueprints.v1.tasks import apply_blueprint, blueprints_discovery, blueprints_find
+from authentik.blueprints.v1.tasks import (
+    apply_blueprint,
+    blueprints_discovery,
+    blueprints_find,
+    parse_blueprint_file,
+)
 from authentik.lib.config import CONFIG
 from authentik.lib.generators import generate_id
 
@@ -35,6 +44,30 @@ class TestBlueprintsV1Tasks(TransactionTestCase):
             blueprints = blueprints_find()
             self.assertEqual(blueprints, [])
 
+    @CONFIG.patch("blueprints_dir", TMP)
+    def test_file_index(self):
+        """Test unchanged files are not parsed again"""
+        with NamedTemporaryFile(mode="w+", suffix=".yaml", dir=TMP) as file:
+            file.write(dump({"version": 1, "entries": []}))
+            file.flush()
+            # Files modified just before they're indexed are always parsed again
+            modified = time_ns() - 10 * 10**9
+            utime(file.name, ns=(modified, modified))
+            with patch(
+                "authentik.blueprints.v1.tasks.parse_blueprint_file",
+                wraps=parse_blueprint_file,
+            ) as parse:
+                blueprints_find()
+                parse.reset_mock()
+                blueprints = blueprints_find()
+                self.assertIn(Path(file.name).name, [blueprint.path for blueprint in blueprints])
+                parse.assert_not_called()
+
+                file.write(dump({"metadata": {"name": generate_id()}}))
+                file.flush()
+                blueprints_find()
+                parse.assert_called_once()
+
     @CONFIG.patch("blueprints_dir", TMP)
     def test_valid(self):
         """Test valid file"""
@@ -2,6 +2,8 @@
 
 from contextlib import contextmanager
 from copy import deepcopy
+from dataclasses import dataclass
+from time import perf_counter
 from typing import Any
 
 from dacite.config import Config
@@ -113,6 +115,15 @@ def transaction_rollback():
         pass
 
 
+@dataclass(slots=True)
+class EntryTiming:
+    """How long processing a single blueprint entry took"""
+
+    model: str
+    id: str | None
+    duration: float
+
+
 def rbac_models() -> dict:
     models = {}
     for app in get_apps():
@@ -131,6 +142,7 @@ class Importer:
 
     def __init__(self, blueprint: Blueprint, context: dict | None = None):
         self.__pk_map: dict[Any, Model] = {}
+        self.timings: list[EntryTiming] = []
         self._import = blueprint
         self.logger = get_logger()
         ctx = self.default_context()
@@ -344,63 +356,78 @@ class Importer:
     def _apply_models(self, raise_errors=False) -> bool:
         """Apply (create/update) models yaml"""
         self.__pk_map = {}
+        self.timings = []
         for entry in self._import.iter_entries():
-            model_app_label, model_name = entry.get_model(self._import).split(".")
-            try:
-                model: type[SerializerModel] = registry.get_model(model_app_label, model_name)
-            except LookupError:
-                self.logger.warning(
-                    "App or Model does not exist", app=model_app_label, model=model_name
-                )
+            model_path = entry.get_model(self._import)
+            start = perf_counter()
+            applied = self._apply_entry(entry, model_path, raise_errors)
+            duration = perf_counter() - start
+            self.timings.append(EntryTiming(model_path, entry.id, duration))
+            self.logger.debug(
+                "Processed entry", model=model_path, id=entry.id, duration=f"{duration:.4f}s"
+            )
+            if not applied:
                 return False
-            # Validate each single entry
-            serializer = None
-            try:
-                serializer = self._validate_single(entry)
-            except EntryInvalidError as exc:
-                # For deleting objects we don't need the serializer to be valid
-                if entry.get_state(self._import) == BlueprintEntryDesiredState.ABSENT:
-                    serializer = exc.serializer
-                else:
-                    self.logger.warning(f"Entry invalid: {exc}", entry=entry, error=exc)
-                    if raise_errors:
-                        raise exc
-                    return False
-            if not serializer:
-                continue
+        return True
 
-            state = entry.get_state(self._import)
-            if state in [
-                BlueprintEntryDesiredState.PRESENT,
-                BlueprintEntryDesiredState.CREATED,
-                BlueprintEntryDesiredState.MUST_CREATED,
-            ]:
-                instance = serializer.instance
-                if (
-                    instance
-                    and not instance._state.adding
-                    and state == BlueprintEntryDesiredState.CREATED
-                ):
-                    self.logger.debug(
-                        "Instance exists, skipping",
-                        model=model,
-                        instance=instance,
-                        pk=instance.pk,
-                    )
-                else:
-                    instance = serializer.save()
-                    self.logger.debug("Updated model", model=instance)
-                if "pk" in entry.identifiers:
-                    self.__pk_map[entry.identifiers["pk"]] = instance.pk
-                entry._state = BlueprintEntryState(instance)
-                self._apply_permissions(instance, entry)
-            elif state == BlueprintEntryDesiredState.ABSENT:
-                instance: Model | None = serializer.instance
-                if instance and instance.pk:
-                    instance.delete()
-                    self.logger.debug("Deleted model", mode=instance)
-                    continue
-                self.logger.debug("Entry to delete with no instance, skipping")
+    def _apply_entry(self, entry: BlueprintEntry, model_path: str, raise_errors=False) -> bool:
+        """Apply (create/update/delete) a single entry, returns False if the entry is invalid"""
+        model_app_label, model_name = model_path.split(".")
+        try:
+            model: type[SerializerModel] = registry.get_model(model_app_label, model_name)
+        except LookupError:
+            self.logger.warning(
+                "App or Model does not exist", app=model_app_label, model=model_name
+            )
+            return False
+        # Validate each single entry
+        serializer = None
+        try:
+            serializer = self._validate_single(entry)
+        except EntryInvalidError as exc:
+            # For deleting objects we don't need the serializer to be valid
+            if entry.get_state(self._import) == BlueprintEntryDesiredState.ABSENT:
+                serializer = exc.serializer
+            else:
+                self.logger.warning(f"Entry invalid: {exc}", entry=entry, error=exc)
+                if raise_errors:
+                    raise exc
+                return False
+        if not serializer:
+            return True
+
+        state = entry.get_state(self._import)
+        if state in [
+            BlueprintEntryDesiredState.PRESENT,
+            BlueprintEntryDesiredState.CREATED,
+            BlueprintEntryDesiredState.MUST_CREATED,
+        ]:
+            instance = serializer.instance
+            if (
+                instance
+                and not instance._state.adding
+                and state == BlueprintEntryDesiredState.CREATED
+            ):
+                self.logger.debug(
+                    "Instance exists, skipping",
+                    model=model,
+                    instance=instance,
+                    pk=instance.pk,
+                )
+            else:
+                instance = serializer.save()
+                self.logger.debug("Updated model", model=instance)
+            if "pk" in entry.identifiers:
+                self.__pk_map[entry.identifiers["pk"]] = instance.pk
+            entry._state = BlueprintEntryState(instance)
+            self._apply_permissions(instance, entry)
+        elif state == BlueprintEntryDesiredState.ABSENT:
+            instance: Model | None = serializer.instance
+            if instance and instance.pk:
+                instance.delete()
+                self.logger.debug("Deleted model", mode=instance)
+                return True
+            self.logger.debug("Entry to delete with no instance, skipping")
         return True
 
     def validate(self, raise_validation_errors=False) -> tuple[bool, list[LogEvent]]:
@@ -421,3 +448,16 @@ class Importer:
         self.logger.debug("Finished blueprint import validation")
         self._import = orig_import
         return successful, logs
+
+    def validate_and_apply(self) -> tuple[bool, list[LogEvent]]:
+        """Validate and apply the blueprint in a single pass. Entries are applied in a
+        transaction which is rolled back when an entry is invalid, which has the same result
+        as `validate` followed by `apply`, while only processing each entry once."""
+        if self._import.version != 1:
+            self.logger.warning("Invalid blueprint version")
+            return False, [LogEvent("Invalid blueprint version", log_level="warning", logger=None)]
+        with capture_logs() as logs:
+            successful = self.apply()
+            if not successful:
+                self.logger.warning("Blueprint validation failed")
+        return successful, logs
@@ -48,10 +48,8 @@ class ApplyBlueprintMetaSerializer(PassiveSerializer):
         # and prevent deadlocks when called from within another blueprint task
         blueprint_content = self.blueprint_instance.retrieve()
         importer = Importer.from_string(blueprint_content, self.blueprint_instance.context)
-        valid, logs = importer.validate()
+        _, logs = importer.validate_and_apply()
         [log.log() for log in logs]
-        if valid:
-            importer.apply()
         return MetaResult()
 
 
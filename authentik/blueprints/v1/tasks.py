@@ -1,14 +1,16 @@
 """v1 blueprints tasks"""
 
 from dataclasses import asdict, dataclass, field
-from hashlib import sha512
+from hashlib import sha256, sha512
 from pathlib import Path
 from sys import platform
+from time import perf_counter, time_ns
 from uuid import UUID
 
 from dacite.core import from_dict
 from django.conf import settings
-from django.db import DatabaseError, InternalError, ProgrammingError
+from django.core.cache import cache
+from django.db import DatabaseError, InternalError, ProgrammingError, connection
 from django.utils.text import slugify
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
@@ -25,6 +27,7 @@ from watchdog.observers import Observer
 from yaml import load
 from yaml.error import YAMLError
 
+from authentik.blueprints.apps import HIST_BLUEPRINTS_APPLY_TIME
 from authentik.blueprints.models import (
     BlueprintInstance,
     BlueprintInstanceStatus,
@@ -34,15 +37,18 @@ from authentik.blueprints.v1.common import BlueprintLoader, BlueprintMetadata, E
 from authentik.blueprints.v1.importer import Importer
 from authentik.blueprints.v1.labels import LABEL_AUTHENTIK_INSTANTIATE
 from authentik.blueprints.v1.oci import OCI_PREFIX
-from authentik.events.logs import capture_logs
 from authentik.events.utils import sanitize_dict
 from authentik.lib.config import CONFIG
 from authentik.tasks.apps import PRIORITY_HIGH
 from authentik.tasks.middleware import CurrentTask
-from authentik.tasks.schedules.models import Schedule
 from authentik.tenants.models import Tenant
 
 LOGGER = get_logger()
+CACHE_KEY_BLUEPRINT_FILE_INDEX = "goauthentik.io/blueprints/file_index/%s"
+CACHE_TIMEOUT_BLUEPRINT_FILE_INDEX = 60 * 60 * 24
+# Files modified less than this many nanoseconds before they were indexed are parsed again,
+# as they might have been changed again without their size or modification time changing
+INDEX_RACY_NS = 2 * 10**9
 
 
 @dataclass
@@ -91,10 +97,13 @@ class BlueprintEventHandler(FileSystemEventHandler):
 
     def on_created(self, event: FileSystemEvent):
         """Process file creation"""
-        LOGGER.debug("new blueprint file created, starting discovery")
+        path = Path(event.src_path)
+        root = Path(CONFIG.get("blueprints_dir")).absolute()
+        rel_path = str(path.relative_to(root))
+        LOGGER.debug("new blueprint file created, starting discovery", path=rel_path)
         for tenant in Tenant.objects.filter(ready=True):
             with tenant:
-                Schedule.dispatch_by_actor(blueprints_discovery)
+                blueprints_discovery.send_with_options(kwargs={"path": rel_path})
 
     def on_modified(self, event: FileSystemEvent):
         """Process file modification"""
@@ -119,32 +128,107 @@ def blueprints_find_dict():
     return blueprints
 
 
-def blueprints_find() -> list[BlueprintFile]:
-    """Find blueprints and return valid ones"""
+def parse_blueprint_file(root: Path, path: Path, stat) -> BlueprintFile | None:
+    """Parse blueprint file `path`, returns None if it's not a valid blueprint"""
+    rel_path = path.relative_to(root)
+    data = path.read_bytes()
+    try:
+        raw_blueprint = load(data.decode("utf-8"), BlueprintLoader)
+    except YAMLError as exc:
+        raw_blueprint = None
+        LOGGER.warning("failed to parse blueprint", exc=exc, path=str(rel_path))
+    if not raw_blueprint:
+        return None
+    metadata = raw_blueprint.get("metadata", None)
+    version = raw_blueprint.get("version", 1)
+    if version != 1:
+        LOGGER.warning("invalid blueprint version", version=version, path=str(rel_path))
+        return None
+    file_hash = sha512(data).hexdigest()
+    blueprint = BlueprintFile(str(rel_path), version, file_hash, int(stat.st_mtime))
+    blueprint.meta = from_dict(BlueprintMetadata, metadata) if metadata else None
+    return blueprint
+
+
+class BlueprintFileIndex:
+    """Index of the files in the blueprints directory, keyed by their path relative to the
+    directory, with the size and modification time each file had when it was parsed.
+
+    Files whose size and modification time haven't changed since are not parsed and hashed
+    again. The index is persisted in the cache, so it's shared by all workers."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.cache_key = (
+            CACHE_KEY_BLUEPRINT_FILE_INDEX % sha256(str(root.absolute()).encode()).hexdigest()
+        )
+        # Path -> (size, modification time, time indexed, blueprint)
+        self.entries: dict[str, tuple[int, int, int, BlueprintFile | None]] = (
+            cache.get(self.cache_key) or {}
+        )
+        self.changed = False
+
+    def get(self, path: Path) -> BlueprintFile | None:
+        """Get blueprint of file `path`, parsing it if it's not indexed or changed"""
+        rel_path = str(path.relative_to(self.root))
+        try:
+            stat = path.stat()
+        except OSError:
+            # Removed since the directory was listed
+            self.remove(rel_path)
+            return None
+        entry = self.entries.get(rel_path)
+        if (
+            entry
+            and entry[:2] == (stat.st_size, stat.st_mtime_ns)
+            and entry[2] - stat.st_mtime_ns > INDEX_RACY_NS
+        ):
+            return entry[3]
+        blueprint = parse_blueprint_file(self.root, path, stat)
+        self.entries[rel_path] = (stat.st_size, stat.st_mtime_ns, time_ns(), blueprint)
+        self.changed = True
+        return blueprint
+
+    def remove(self, rel_path: str):
+        if self.entries.pop(rel_path, None):
+            self.changed = True
+
+    def retain(self, rel_paths: set[str]):
+        """Remove entries of all files not in `rel_paths`"""
+        for rel_path in set(self.entries.keys()) - rel_paths:
+            self.remove(rel_path)
+
+    def save(self):
+        if not self.changed:
+            return
+        cache.set(self.cache_key, self.entries, timeout=CACHE_TIMEOUT_BLUEPRINT_FILE_INDEX)
+        self.changed = False
+
+
+def blueprints_find(path: str | None = None) -> list[BlueprintFile]:
+    """Find blueprints and return valid ones, optionally only the blueprint at `path`
+    (relative to the blueprints directory)"""
     blueprints = []
     root = Path(CONFIG.get("blueprints_dir"))
-    for path in root.rglob("**/*.yaml"):
-        rel_path = path.relative_to(root)
+    index = BlueprintFileIndex(root)
+    if path:
+        paths = [root / path] if (root / path).is_file() and path.endswith(".yaml") else []
+        if not paths:
+            index.remove(path)
+    else:
+        paths = root.rglob("**/*.yaml")
+    found = set()
+    for file_path in paths:
         # Check if any part in the path starts with a dot and assume a hidden file
-        if any(part for part in path.parts if part.startswith(".")):
+        if any(part for part in file_path.parts if part.startswith(".")):
             continue
-        with open(path, encoding="utf-8") as blueprint_file:
-            try:
-                raw_blueprint = load(blueprint_file.read(), BlueprintLoader)
-            except YAMLError as exc:
-                raw_blueprint = None
-                LOGGER.warning("failed to parse blueprint", exc=exc, path=str(rel_path))
-            if not raw_blueprint:
-                continue
-            metadata = raw_blueprint.get("metadata", None)
-            version = raw_blueprint.get("version", 1)
-            if version != 1:
-                LOGGER.warning("invalid blueprint version", version=version, path=str(rel_path))
-                continue
-        file_hash = sha512(path.read_bytes()).hexdigest()
-        blueprint = BlueprintFile(str(rel_path), version, file_hash, int(path.stat().st_mtime))
-        blueprint.meta = from_dict(BlueprintMetadata, metadata) if metadata else None
-        blueprints.append(blueprint)
+        found.add(str(file_path.relative_to(root)))
+        blueprint = index.get(file_path)
+        if blueprint:
+            blueprints.append(blueprint)
+    if not path:
+        index.retain(found)
+    index.save()
     return blueprints
 
 
@@ -152,9 +236,7 @@ def blueprints_find() -> list[BlueprintFile]:
 def blueprints_discovery(path: str | None = None):
     self = CurrentTask.get_task()
     count = 0
-    for blueprint in blueprints_find():
-        if path and blueprint.path != path:
-            continue
+    for blueprint in blueprints_find(path):
         check_blueprint_v1_file(blueprint)
         count += 1
     self.info(f"Successfully imported {count} files.")
@@ -206,19 +288,26 @@ def apply_blueprint(instance_pk: UUID):
         importer = Importer.from_string(blueprint_content, instance.context)
         if importer.blueprint.metadata:
             instance.metadata = asdict(importer.blueprint.metadata)
-        valid, logs = importer.validate()
-        if not valid:
+        start = perf_counter()
+        applied, logs = importer.validate_and_apply()
+        duration = perf_counter() - start
+        HIST_BLUEPRINTS_APPLY_TIME.labels(
+            tenant=connection.schema_name,
+            blueprint=instance.name,
+        ).observe(duration)
+        if not applied:
             instance.status = BlueprintInstanceStatus.ERROR
             instance.save()
             self.logs(logs)
             return
-        with capture_logs() as logs:
-            applied = importer.apply()
-            if not applied:
-                instance.status = BlueprintInstanceStatus.ERROR
-                instance.save()
-                self.logs(logs)
-                return
+        slowest = sorted(importer.timings, key=lambda timing: timing.duration, reverse=True)
+        self.info(
+            f"Applied {len(importer.timings)} entries in {duration:.2f}s",
+            slowest_entries=[
+                {"model": timing.model, "id": timing.id, "duration": round(timing.duration, 4)}
+                for timing in slowest[:5]
+            ],
+        )
         instance.status = BlueprintInstanceStatus.SUCCESSFUL
         instance.last_applied_hash = file_hash
         instance.last_applied = now()
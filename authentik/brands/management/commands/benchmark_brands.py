@@ -0,0 +1,49 @@
+"""Benchmark brand resolution"""
+
+from time import perf_counter
+
+from authentik.brands.models import Brand
+from authentik.brands.utils import BrandIndex, query_brand
+from authentik.lib.generators import generate_id
+from authentik.lib.management.benchmark import BenchmarkCommand
+
+
+class Command(BenchmarkCommand):
+    """Benchmark resolving brands by host with a query per request and with the in-memory
+    brand index. All objects created are removed afterwards."""
+
+    operation = "Resolutions"
+    unit = "us"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n",
+            "--requests",
+            default=10000,
+            type=int,
+            help="How many hosts should be resolved per run.",
+        )
+        parser.add_argument(
+            "--brands",
+            default=100,
+            type=int,
+            help="How many brands should be created.",
+        )
+
+    def benchmark(self, resolve, hosts: list[str]) -> list[float]:
+        """Resolve all `hosts`, returning the duration of each resolution"""
+        durations = []
+        for host in hosts:
+            start = perf_counter()
+            resolve(host)
+            durations.append(perf_counter() - start)
+        return durations
+
+    def handle_benchmark(self, **options):
+        count = options["requests"]
+        domains = [f"{generate_id(8)}.example.com" for _ in range(max(options["brands"], 1))]
+        Brand.objects.bulk_create([Brand(domain=domain) for domain in domains])
+        hosts = [f"app.{domains[idx % len(domains)]}" for idx in range(count)]
+        self.output("Query", self.benchmark(query_brand, hosts))
+        index = BrandIndex(list(Brand.objects.all()))
+        self.output("Index", self.benchmark(index.match, hosts))
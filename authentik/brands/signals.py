@@ -0,0 +1,14 @@
+"""authentik brand signals"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from authentik.brands.models import Brand
+from authentik.brands.utils import BRAND_RESOLVER
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+def brand_invalidate_index(sender, instance: Brand, **_):
+    """Invalidate the brand index of the tenant in all processes"""
+    BRAND_RESOLVER.notify()
@@ -8,6 +8,7 @@ from rest_framework.test import APITestCase
 from authentik.blueprints.tests import apply_blueprint
 from authentik.brands.api import Themes
 from authentik.brands.models import Brand
+from authentik.brands.utils import DEFAULT_BRAND, BrandIndex, query_brand
 from authentik.core.models import Application
 from authentik.core.tests.utils import create_test_admin_user, create_test_brand
 from authentik.lib.generators import generate_id
@@ -200,6 +201,18 @@ class TestBrands(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
 
+    def test_brand_index(self):
+        """Test brand index matches the same brands as the query"""
+        Brand.objects.create(domain="bar.baz", branding_title="custom-weak")
+        Brand.objects.create(domain="foo.bar.baz", branding_title="custom-strong")
+        Brand.objects.create(domain="other", default=True, branding_title="custom-default")
+        index = BrandIndex(list(Brand.objects.all()))
+        for host in ["foo.bar.baz", "FOO.bar.baz", "other.bar.baz", "bar.baz", "qux", "other"]:
+            with self.subTest(host=host):
+                self.assertEqual(index.match(host), query_brand(host))
+        Brand.objects.all().delete()
+        self.assertEqual(BrandIndex([]).match("foo"), DEFAULT_BRAND)
+
     def test_webfinger_no_app(self):
         """Test Webfinger"""
         create_test_brand()
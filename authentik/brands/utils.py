@@ -1,28 +1,35 @@
 """Brand utilities"""
 
+from copy import copy
 from typing import Any
 
+from django.db import DEFAULT_DB_ALIAS, connection
 from django.db.models import Case, F, IntegerField, Q, Value, When
 from django.db.models.functions import Length
 from django.http.request import HttpRequest
 from django.utils.html import _json_script_escapes
 from django.utils.safestring import mark_safe
+from structlog.stdlib import get_logger
 
 from authentik import authentik_full_version
 from authentik.brands.models import Brand
 from authentik.lib.sentry import get_http_meta
+from authentik.lib.utils.notify import NotifyListener
 from authentik.tenants.models import Tenant
 
+LOGGER = get_logger()
 _q_default = Q(default=True)
 DEFAULT_BRAND = Brand(domain="fallback")
+# Channel brand changes are sent to, with the schema name of the tenant as payload
+BRANDS_CHANNEL = "authentik_brands"
 
 
-def get_brand_for_request(request: HttpRequest) -> Brand:
-    """Get brand object for current request"""
+def query_brand(host: str) -> Brand:
+    """Get brand object for `host` from the database"""
 
     brand = (
         Brand.objects.annotate(
-            host_domain=Value(request.get_host()),
+            host_domain=Value(host),
             domain_length=Length("domain"),
             match_priority=Case(
                 When(
@@ -51,6 +58,103 @@ def get_brand_for_request(request: HttpRequest) -> Brand:
     return brand
 
 
+class BrandIndex:
+    """All brands of a tenant indexed by their (lowercase) domain, matched against a host
+    the same way as `query_brand`: the brand with the longest domain the host ends with,
+    preferring the default brand, otherwise the default brand."""
+
+    def __init__(self, brands: list[Brand]):
+        self.domains: dict[str, Brand] = {}
+        self.default: Brand | None = None
+        for brand in brands:
+            if brand.default and not self.default:
+                self.default = brand
+            domain = brand.domain.lower()
+            if domain not in self.domains or (brand.default and not self.domains[domain].default):
+                self.domains[domain] = brand
+
+    def match(self, host: str) -> Brand:
+        host = host.lower()
+        # Suffixes from longest to shortest, including the empty suffix
+        for idx in range(len(host) + 1):
+            brand = self.domains.get(host[idx:])
+            if brand:
+                return brand
+        return self.default or DEFAULT_BRAND
+
+
+class BrandResolver(NotifyListener):
+    """Resolve brands from a per-process, per-tenant index of all brands.
+
+    Brand changes are sent to all processes with PostgreSQL's NOTIFY. Indexes are only used
+    while notifications are received, otherwise brands are queried for every request.
+    Indexes are loaded from the primary database, as read replicas might not have received
+    a change yet when its notification arrives."""
+
+    channel = BRANDS_CHANNEL
+    thread_name = "authentik-brand-listener"
+
+    def __init__(self):
+        super().__init__()
+        self._indexes: dict[str, BrandIndex] = {}
+        # Incremented on every invalidation of a tenant's index, and `_resets` when all
+        # indexes are removed, so that indexes loaded before are not stored after it
+        self._generations: dict[str, int] = {}
+        self._resets = 0
+
+    def resolve(self, host: str) -> Brand:
+        """Get brand object for `host`, without a query when the index is loaded"""
+        if not self.listening:
+            return query_brand(host)
+        schema_name = connection.schema_name
+        index = self._indexes.get(schema_name)
+        if not index:
+            generation = self._generation(schema_name)
+            index = BrandIndex(list(Brand.objects.using(DEFAULT_DB_ALIAS).all()))
+            with self._lock:
+                # Don't store indexes loaded while the connection was re-established, or
+                # before a notification for the tenant was received
+                if self._listening and self._generation(schema_name) == generation:
+                    self._indexes[schema_name] = index
+        # Copy the brand so objects related to it aren't cached across requests
+        return copy(index.match(host))
+
+    def invalidate(self, schema_name: str):
+        """Remove the index of the tenant with `schema_name`"""
+        with self._lock:
+            self._generations[schema_name] = self._generations.get(schema_name, 0) + 1
+            self._indexes.pop(schema_name, None)
+
+    def clear(self):
+        """Remove all indexes"""
+        with self._lock:
+            self.reset()
+
+    def reset(self):
+        self._resets += 1
+        self._indexes.clear()
+
+    def notified(self, payload: str):
+        self.invalidate(payload)
+
+    def _generation(self, schema_name: str) -> tuple[int, int]:
+        return self._resets, self._generations.get(schema_name, 0)
+
+    def notify(self):
+        """Invalidate the index of the current tenant in all processes, once the current
+        transaction is committed"""
+        self.invalidate(connection.schema_name)
+        self.send(connection.schema_name)
+
+
+BRAND_RESOLVER = BrandResolver()
+
+
+def get_brand_for_request(request: HttpRequest) -> Brand:
+    """Get brand object for current request"""
+    return BRAND_RESOLVER.resolve(request.get_host())
+
+
 def context_processor(request: HttpRequest) -> dict[str, Any]:
     """Context Processor that injects brand object into every template"""
     brand = getattr(request, "brand", DEFAULT_BRAND)
@@ -6,6 +6,7 @@ from typing import Any
 
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.models import AnonymousUser, Permission
+from django.db.models import Manager
 from django.db.transaction import atomic
 from django.db.utils import IntegrityError
 from django.urls import reverse_lazy
@@ -85,7 +86,7 @@ from authentik.flows.exceptions import FlowNonApplicableException
 from authentik.flows.models import FlowToken
 from authentik.flows.planner import PLAN_CONTEXT_PENDING_USER, FlowPlanner
 from authentik.flows.views.executor import QS_KEY_TOKEN
-from authentik.lib.avatars import get_avatar
+from authentik.lib.avatars import get_avatar, get_avatars
 from authentik.lib.utils.reflection import ConditionalInheritance
 from authentik.rbac.api.roles import RoleSerializer
 from authentik.rbac.decorators import permission_required
@@ -120,6 +121,17 @@ class PartialGroupSerializer(ModelSerializer):
         ]
 
 
+class UserListSerializer(ListSerializer):
+    """List serializer which gets the avatars of all users at once"""
+
+    def to_representation(self, data):
+        users = list(data.all() if isinstance(data, Manager) else data)
+        self.context.setdefault("avatars", {}).update(
+            get_avatars(users, self.context.get("request"))
+        )
+        return super().to_representation(users)
+
+
 class UserSerializer(ModelSerializer):
     """User Serializer"""
 
@@ -221,6 +233,9 @@ class UserSerializer(ModelSerializer):
 
     def get_avatar(self, user: User) -> str:
         """User's avatar, either a http/https URL or a data URI"""
+        avatars = self.context.get("avatars", {})
+        if user.pk in avatars:
+            return avatars[user.pk]
         return get_avatar(user, self.context.get("request"))
 
     def validate_path(self, path: str) -> str:
@@ -251,6 +266,7 @@ class UserSerializer(ModelSerializer):
 
     class Meta:
         model = User
+        list_serializer_class = UserListSerializer
         fields = [
             "pk",
             "username",
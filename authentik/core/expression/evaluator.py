@@ -1,8 +1,11 @@
 """Property Mapping Evaluator"""
 
+from hashlib import sha256
+from threading import Lock
 from types import CodeType
 from typing import Any
 
+from cachetools import LRUCache
 from django.db.models import Model
 from django.http import HttpRequest
 from prometheus_client import Histogram
@@ -20,6 +23,37 @@ PROPERTY_MAPPING_TIME = Histogram(
 )
 
 
+class CompiledExpressionCache:
+    """Process-wide cache of compiled property mapping expressions, so mappings
+    don't need to be re-compiled for every request they're used in.
+
+    Compiled code depends on the expression, the filename and the names of all
+    context variables (see `BaseEvaluator.wrap_expression`), which are all part of the key.
+    Entries of a mapping are removed when it is saved or deleted."""
+
+    def __init__(self, maxsize: int):
+        self._lock = Lock()
+        self._entries = LRUCache(maxsize=maxsize)
+
+    def get(self, key: tuple) -> CodeType | None:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: tuple, code: CodeType):
+        with self._lock:
+            self._entries[key] = code
+
+    def invalidate(self, model_pk: str):
+        """Remove all compiled expressions of the model with `model_pk`"""
+        model_pk = str(model_pk)
+        with self._lock:
+            for key in [key for key in self._entries.keys() if key[0] == model_pk]:
+                self._entries.pop(key, None)
+
+
+COMPILED_EXPRESSIONS = CompiledExpressionCache(maxsize=1024)
+
+
 class PropertyMappingEvaluator(BaseEvaluator):
     """Custom Evaluator that adds some different context variables."""
 
@@ -88,6 +122,21 @@ class PropertyMappingEvaluator(BaseEvaluator):
 
     def compile(self, expression: str | None = None) -> Any:
         if not self._compiled:
-            compiled = super().compile(expression or self.model.expression)
+            expression = expression or self.model.expression
+            model_pk = getattr(self.model, "pk", None)
+            # Unsaved models have nothing to invalidate the cache with
+            if model_pk is None:
+                self._compiled = super().compile(expression)
+                return self._compiled
+            key = (
+                str(model_pk),
+                self._filename,
+                ",".join(self._context.keys()),
+                sha256(expression.encode()).hexdigest(),
+            )
+            compiled = COMPILED_EXPRESSIONS.get(key)
+            if not compiled:
+                compiled = super().compile(expression)
+                COMPILED_EXPRESSIONS.set(key, compiled)
             self._compiled = compiled
         return self._compiled
@@ -0,0 +1,83 @@
+"""Benchmark session serialization and storage"""
+
+import pickle  # nosec
+from time import perf_counter
+
+from authentik.core.models import Session
+from authentik.core.sessions import SESSION_DATA_CACHE, SessionStore
+from authentik.core.tests.utils import create_test_admin_user, create_test_flow
+from authentik.flows.planner import PLAN_CONTEXT_PENDING_USER, FlowPlan
+from authentik.flows.views.executor import SESSION_KEY_PLAN
+from authentik.lib.generators import generate_id
+from authentik.lib.management.benchmark import BenchmarkCommand
+from authentik.stages.dummy.models import DummyStage
+
+
+class Command(BenchmarkCommand):
+    """Benchmark the size of sessions containing a flow plan, and how long loading and saving
+    them takes, with and without the session data cache. All objects created are removed
+    afterwards."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n",
+            "--iterations",
+            default=1000,
+            type=int,
+            help="How often sessions should be loaded and saved per run.",
+        )
+        parser.add_argument(
+            "--stages",
+            default=10,
+            type=int,
+            help="How many stages the flow plan in the session should have.",
+        )
+
+    def create_session(self, stage_count: int) -> str:
+        """Create a session with a flow plan, similar to a session during a flow"""
+        flow = create_test_flow()
+        plan = FlowPlan(flow_pk=flow.pk.hex)
+        for _ in range(stage_count):
+            plan.append_stage(DummyStage.objects.create(name=generate_id()))
+        plan.context[PLAN_CONTEXT_PENDING_USER] = create_test_admin_user()
+        store = SessionStore()
+        store[SESSION_KEY_PLAN] = plan
+        store.save()
+        return store.session_key
+
+    def benchmark(self, session_key: str, count: int) -> tuple[list[float], list[float]]:
+        """Load and save the session `count` times, returning the durations of each load and
+        each save"""
+        loads, saves = [], []
+        for idx in range(count):
+            start = perf_counter()
+            store = SessionStore(session_key)
+            store.load()
+            loads.append(perf_counter() - start)
+            store["counter"] = idx
+            start = perf_counter()
+            store.save()
+            saves.append(perf_counter() - start)
+        return loads, saves
+
+    def handle_benchmark(self, **options):
+        count = options["iterations"]
+        max_size = SESSION_DATA_CACHE.max_size
+        session_key = self.create_session(options["stages"])
+        try:
+            encoded = bytes(Session.objects.get(session_key=session_key).session_data)
+            legacy = pickle.dumps(SessionStore().decode(encoded), protocol=pickle.HIGHEST_PROTOCOL)
+            self.stdout.write(f"Session size (pickle): {len(legacy)} bytes")
+            self.stdout.write(f"Session size (encoded): {len(encoded)} bytes")
+            SESSION_DATA_CACHE.max_size = 0
+            loads, saves = self.benchmark(session_key, count)
+            self.output("Load without session data cache", loads)
+            self.output("Save without session data cache", saves)
+            SESSION_DATA_CACHE.max_size = max(max_size, 1)
+            SESSION_DATA_CACHE.clear()
+            loads, saves = self.benchmark(session_key, count)
+            self.output("Load with session data cache", loads)
+            self.output("Save with session data cache", saves)
+        finally:
+            SESSION_DATA_CACHE.max_size = max_size
+            SESSION_DATA_CACHE.clear()
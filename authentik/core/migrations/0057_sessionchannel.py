@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 14:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_core", "0056_user_roles"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SessionChannel",
+            fields=[
+                ("expires", models.DateTimeField(default=None, null=True)),
+                ("expiring", models.BooleanField(default=True)),
+                ("channel_name", models.TextField(primary_key=True, serialize=False)),
+                ("session_key", models.TextField()),
+            ],
+            options={
+                "verbose_name": "Session Channel",
+                "verbose_name_plural": "Session Channels",
+                "indexes": [
+                    models.Index(fields=["expires"], name="authentik_c_expires_772bef_idx"),
+                    models.Index(fields=["expiring"], name="authentik_c_expirin_89a042_idx"),
+                    models.Index(
+                        fields=["expiring", "expires"], name="authentik_c_expirin_7d486c_idx"
+                    ),
+                    models.Index(
+                        fields=["session_key", "expires"], name="authentik_c_session_00e7a5_idx"
+                    ),
+                ],
+                "default_permissions": [],
+            },
+        ),
+    ]
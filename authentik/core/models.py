@@ -41,6 +41,7 @@ from authentik.lib.merge import MERGE_LIST_UNIQUE
 from authentik.lib.models import (
     CreatedUpdatedModel,
     DomainlessFormattedURLValidator,
+    InternallyManagedMixin,
     SerializerModel,
 )
 from authentik.lib.utils.time import timedelta_from_string
@@ -1243,6 +1244,25 @@ class Session(ExpiringModel, AbstractBaseSession):
         raise NotImplementedError
 
 
+class SessionChannel(InternallyManagedMixin, ExpiringModel):
+    """Channel of an open websocket connection of a session, which is a member of the
+    session's channel group until the connection is closed or the membership expires"""
+
+    channel_name = models.TextField(primary_key=True)
+    session_key = models.TextField()
+
+    class Meta:
+        verbose_name = _("Session Channel")
+        verbose_name_plural = _("Session Channels")
+        indexes = ExpiringModel.Meta.indexes + [
+            models.Index(fields=["session_key", "expires"]),
+        ]
+        default_permissions = []
+
+    def __str__(self):
+        return self.channel_name
+
+
 class AuthenticatedSession(SerializerModel):
     session = models.OneToOneField(Session, on_delete=models.CASCADE, primary_key=True)
     # We use the session as primary key, but we need the API to be able to reference
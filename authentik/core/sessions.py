@@ -1,18 +1,77 @@
 """authentik sessions engine"""
 
 import pickle  # nosec
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from threading import Lock
 
 from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.sessions.backends.base import CreateError, UpdateError
 from django.contrib.sessions.backends.db import SessionStore as SessionBase
 from django.core.exceptions import SuspiciousOperation
+from django.db import DatabaseError, IntegrityError, connection, router, transaction
+from django.db.models import BinaryField, Case, F, Value, When
 from django.utils import timezone
 from django.utils.functional import cached_property
 from structlog.stdlib import get_logger
 
+from authentik.lib.config import CONFIG
 from authentik.root.middleware import ClientIPMiddleware
 
 LOGGER = get_logger()
 
+# First byte of encoded session data, data saved before the format was versioned
+# is a plain pickle, which starts with the PROTO opcode (0x80)
+SESSION_FORMAT_PICKLE = b"\x01"
+SESSION_FORMAT_PICKLE_ZLIB = b"\x02"
+
+
+class SessionDataCache:
+    """Cache the encoded data of sessions per process, keyed by the session key and the
+    time the session was last saved at (`last_used`, which is updated on every save).
+
+    When a session is loaded, its data is only fetched from the database if it was saved
+    since it was cached, otherwise the cached data is decoded. At most
+    `sessions.cache_size` sessions are kept, evicting the least recently used session."""
+
+    def __init__(self):
+        self.max_size = CONFIG.get_int("sessions.cache_size", 1000)
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple[str, str], tuple[datetime, bytes]] = OrderedDict()
+
+    def get(self, session_key: str) -> tuple[datetime, bytes] | None:
+        """Get the time the cached data of `session_key` was saved at, and the data"""
+        if self.max_size <= 0:
+            return None
+        key = (connection.schema_name, session_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, session_key: str, last_used: datetime, session_data: bytes):
+        if self.max_size <= 0:
+            return
+        key = (connection.schema_name, session_key)
+        with self._lock:
+            self._entries[key] = (last_used, session_data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, session_key: str):
+        with self._lock:
+            self._entries.pop((connection.schema_name, session_key), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+SESSION_DATA_CACHE = SessionDataCache()
+
 
 class SessionStore(SessionBase):
     def __init__(self, session_key=None, last_ip=None, last_user_agent=""):
@@ -32,49 +91,126 @@ class SessionStore(SessionBase):
     def model_fields(self):
         return [k.value for k in self.model.Keys]
 
+    def _get_queryset(self, cached: tuple[datetime, bytes] | None):
+        queryset = self.model.objects.select_related(
+            "authenticatedsession",
+            "authenticatedsession__user",
+        )
+        if not cached:
+            return queryset
+        # Only fetch the session data if the session was saved since it was cached
+        return queryset.defer("session_data").annotate(
+            changed_session_data=Case(
+                When(last_used=cached[0], then=Value(None, output_field=BinaryField())),
+                default=F("session_data"),
+                output_field=BinaryField(),
+            )
+        )
+
+    def _set_session_data(self, session, cached: tuple[datetime, bytes] | None):
+        if cached:
+            changed = session.changed_session_data
+            session.session_data = cached[1] if changed is None else bytes(changed)
+        else:
+            session.session_data = bytes(session.session_data)
+        SESSION_DATA_CACHE.set(session.session_key, session.last_used, session.session_data)
+        # Compared to the data when saving, to skip saving unchanged sessions
+        self._store(session)
+        return session
+
     def _get_session_from_db(self):
+        cached = SESSION_DATA_CACHE.get(self.session_key)
         try:
-            return self.model.objects.select_related(
-                "authenticatedsession",
-                "authenticatedsession__user",
-            ).get(
+            session = self._get_queryset(cached).get(
                 session_key=self.session_key,
                 expires__gt=timezone.now(),
             )
+            return self._set_session_data(session, cached)
         except (self.model.DoesNotExist, SuspiciousOperation) as exc:
             if isinstance(exc, SuspiciousOperation):
                 LOGGER.warning(str(exc))
             self._session_key = None
 
     async def _aget_session_from_db(self):
+        cached = SESSION_DATA_CACHE.get(self.session_key)
         try:
-            return await self.model.objects.select_related(
-                "authenticatedsession",
-                "authenticatedsession__user",
-            ).aget(
+            session = await self._get_queryset(cached).aget(
                 session_key=self.session_key,
                 expires__gt=timezone.now(),
             )
+            return self._set_session_data(session, cached)
         except (self.model.DoesNotExist, SuspiciousOperation) as exc:
             if isinstance(exc, SuspiciousOperation):
                 LOGGER.warning(str(exc))
             self._session_key = None
 
     def encode(self, session_dict):
-        return pickle.dumps(session_dict, protocol=pickle.HIGHEST_PROTOCOL)
+        data = pickle.dumps(session_dict, protocol=pickle.HIGHEST_PROTOCOL)
+        threshold = CONFIG.get_int("sessions.compression_threshold", 1024)
+        if threshold >= 0 and len(data) >= threshold:
+            return SESSION_FORMAT_PICKLE_ZLIB + zlib.compress(data, 1)
+        return SESSION_FORMAT_PICKLE + data
 
     def decode(self, session_data):
+        session_data = bytes(session_data)
         try:
+            if session_data[:1] == SESSION_FORMAT_PICKLE_ZLIB:
+                session_data = zlib.decompress(session_data[1:])
+            elif session_data[:1] == SESSION_FORMAT_PICKLE:
+                session_data = session_data[1:]
             return pickle.loads(session_data)  # nosec
-        except (pickle.PickleError, AttributeError, TypeError):
+        except (pickle.PickleError, AttributeError, TypeError, EOFError, zlib.error):
             # PickleError, ValueError - unpickling exceptions
             # AttributeError - can happen when Django model fields (e.g., FileField) are unpickled
             #                  and their descriptors fail to initialize (e.g., missing storage)
             # TypeError - can happen with incompatible pickled objects
+            # EOFError, zlib.error - truncated or corrupted data
             # If any of these happen, just return an empty dictionary (an empty session)
             pass
         return {}
 
+    def is_unchanged(self, obj) -> bool:
+        """Check if the session would be saved with the same data it was loaded with"""
+        stored = getattr(self, "_stored", None)
+        if not stored or obj.session_data != stored["session_data"]:
+            return False
+        return all(getattr(obj, k) == stored[k] for k in ["expires", *self.model_fields])
+
+    def _store(self, obj):
+        self._stored = {
+            "session_data": obj.session_data,
+            "expires": obj.expires,
+            **{k: getattr(obj, k) for k in self.model_fields},
+        }
+
+    def save(self, must_create=False):
+        """Save the session to the database, unless it hasn't changed since it was loaded,
+        for example when only the same values were set again"""
+        if self.session_key is None:
+            return self.create()
+        data = self._get_session(no_load=must_create)
+        obj = self.create_model_instance(data)
+        if not must_create and self.is_unchanged(obj):
+            return
+        using = router.db_for_write(self.model, instance=obj)
+        try:
+            with transaction.atomic(using=using):
+                obj.save(force_insert=must_create, force_update=not must_create, using=using)
+        except IntegrityError:
+            if must_create:
+                raise CreateError from None
+            raise
+        except DatabaseError:
+            if not must_create:
+                raise UpdateError from None
+            raise
+        SESSION_DATA_CACHE.set(obj.session_key, obj.last_used, obj.session_data)
+        self._store(obj)
+
+    def delete(self, session_key=None):
+        SESSION_DATA_CACHE.invalidate(session_key or self.session_key)
+        return super().delete(session_key)
+
     def load(self):
         s = self._get_session_from_db()
         if s:
@@ -15,6 +15,7 @@ from authentik.core.models import (
     AuthenticatedSession,
     BackchannelProvider,
     ExpiringModel,
+    PropertyMapping,
     Session,
     User,
     default_token_duration,
@@ -30,6 +31,17 @@ login_failed = Signal()
 LOGGER = get_logger()
 
 
+@receiver(post_save)
+@receiver(post_delete)
+def property_mapping_invalidate_compiled(sender: type[Model], instance, **_):
+    """Remove compiled expressions of a changed property mapping"""
+    if not isinstance(instance, PropertyMapping):
+        return
+    from authentik.core.expression.evaluator import COMPILED_EXPRESSIONS
+
+    COMPILED_EXPRESSIONS.invalidate(instance.pk)
+
+
 @receiver(post_save, sender=Application)
 def post_save_application(sender: type[Model], instance, created: bool, **_):
     """Clear user's application cache upon application creation"""
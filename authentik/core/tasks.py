@@ -1,7 +1,9 @@
 """authentik core tasks"""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from django.core.cache import cache
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from django_channels_postgres.models import GroupChannel, Message
@@ -15,6 +17,7 @@ from authentik.core.models import (
     ExpiringModel,
     User,
 )
+from authentik.lib.avatars import AVATAR_STATUS_TTL_SECONDS, check_avatar_url
 from authentik.lib.utils.db import chunked_queryset
 from authentik.tasks.middleware import CurrentTask
 
@@ -60,3 +63,15 @@ def clean_temporary_users():
             user.delete()
             deleted_users += 1
     self.info(f"Successfully deleted {deleted_users} users.")
+
+
+@actor(description=_("Check avatar URLs and cache the results."))
+def check_avatar_urls(lookups: list[tuple[str, str, str]]):
+    """Check avatar URLs concurrently, `lookups` is a list of tuples of the URL and
+    the cache keys for the hostname's availability and the URL's status"""
+    entries = {}
+    with ThreadPoolExecutor(max_workers=8, thread_name_prefix="authentik-avatars") as executor:
+        for _avatar, result in executor.map(lambda lookup: check_avatar_url(*lookup), lookups):
+            entries.update(result)
+    cache.set_many(entries, timeout=AVATAR_STATUS_TTL_SECONDS)
+    cache.delete_many([f"{cache_key_image_url}/pending" for *_, cache_key_image_url in lookups])
@@ -1,5 +1,7 @@
 """authentik core property mapping tests"""
 
+from unittest.mock import patch
+
 from django.test import RequestFactory, TestCase
 from guardian.shortcuts import get_anonymous_user
 
@@ -27,6 +29,20 @@ class TestPropertyMappings(TestCase):
         mapping = PropertyMapping.objects.create(name=generate_id(), expression="return 'test'")
         self.assertEqual(mapping.evaluate(None, None), "test")
 
+    def test_expression_compile_cache(self):
+        """Test compiled expressions are re-used and invalidated on save"""
+        mapping = PropertyMapping.objects.create(name=generate_id(), expression="return 'test'")
+        with patch(
+            "authentik.lib.expression.evaluator.compile", wraps=compile, create=True
+        ) as compile_mock:
+            self.assertEqual(mapping.evaluate(None, None, foo="bar"), "test")
+            self.assertEqual(mapping.evaluate(None, None, foo="baz"), "test")
+            self.assertEqual(compile_mock.call_count, 1)
+            mapping.expression = "return foo"
+            mapping.save()
+            self.assertEqual(mapping.evaluate(None, None, foo="bar"), "bar")
+            self.assertEqual(compile_mock.call_count, 2)
+
     def test_expression_syntax(self):
         """Test expression syntax error"""
         mapping = PropertyMapping.objects.create(name=generate_id(), expression="-")
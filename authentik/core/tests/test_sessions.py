@@ -0,0 +1,86 @@
+"""Test session store"""
+
+import pickle  # nosec
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from authentik.core.models import Session
+from authentik.core.sessions import (
+    SESSION_DATA_CACHE,
+    SESSION_FORMAT_PICKLE,
+    SESSION_FORMAT_PICKLE_ZLIB,
+    SessionStore,
+)
+from authentik.lib.generators import generate_id
+
+
+class TestSessionStore(TestCase):
+    """Test session store"""
+
+    def setUp(self):
+        super().setUp()
+        SESSION_DATA_CACHE.clear()
+
+    def test_codec(self):
+        """Test encoding and decoding, including sessions saved before compression"""
+        store = SessionStore()
+        small = {"foo": "bar"}
+        large = {"foo": generate_id(10) * 1000}
+        self.assertEqual(store.encode(small)[:1], SESSION_FORMAT_PICKLE)
+        self.assertEqual(store.decode(store.encode(small)), small)
+        encoded = store.encode(large)
+        self.assertEqual(encoded[:1], SESSION_FORMAT_PICKLE_ZLIB)
+        self.assertLess(len(encoded), len(pickle.dumps(large)))
+        self.assertEqual(store.decode(encoded), large)
+        self.assertEqual(store.decode(pickle.dumps(small)), small)
+        self.assertEqual(store.decode(encoded[:10]), {})
+
+    def test_load_cached(self):
+        """Test session data is only loaded from the database when it changed"""
+        store = SessionStore()
+        store["foo"] = "bar"
+        store.save()
+        # Changed without saving the session, so the cached data is still used
+        Session.objects.filter(session_key=store.session_key).update(
+            session_data=store.encode({"foo": "baz"})
+        )
+        self.assertEqual(SessionStore(store.session_key)["foo"], "bar")
+
+        # Saved by another process, whose cache is updated
+        cached = SESSION_DATA_CACHE.get(store.session_key)
+        other = SessionStore(store.session_key)
+        other["foo"] = "qux"
+        other.save()
+        SESSION_DATA_CACHE.set(store.session_key, *cached)
+        self.assertEqual(SessionStore(store.session_key)["foo"], "qux")
+
+    def test_save_unchanged(self):
+        """Test unchanged sessions are not saved"""
+        store = SessionStore()
+        store["foo"] = "bar"
+        store.set_expiry(now() + timedelta(hours=1))
+        store.save()
+        last_used = Session.objects.get(session_key=store.session_key).last_used
+
+        store = SessionStore(store.session_key)
+        store["foo"] = "bar"
+        store.save()
+        self.assertEqual(Session.objects.get(session_key=store.session_key).last_used, last_used)
+
+        store["foo"] = "baz"
+        store.save()
+        self.assertNotEqual(Session.objects.get(session_key=store.session_key).last_used, last_used)
+
+    def test_save_expiry(self):
+        """Test sessions are saved when only their expiry changed"""
+        store = SessionStore()
+        store["foo"] = "bar"
+        store.save()
+        expires = Session.objects.get(session_key=store.session_key).expires
+
+        store = SessionStore(store.session_key)
+        store["foo"] = "bar"
+        store.save()
+        self.assertGreater(Session.objects.get(session_key=store.session_key).expires, expires)
@@ -258,3 +258,32 @@ class TestUsersAvatars(APITestCase):
         body = loads(response.content.decode())
         # Should fallback to default avatar since Content-Type is not image/*
         self.assertEqual(body["user"]["avatar"], "/static/dist/assets/images/user_default.png")
+
+    def test_avatars_list_background(self):
+        """Test avatars of user lists are checked in the background"""
+        cache.clear()
+        self.set_avatar_mode("https://example.com/avatar/%(username)s,initials")
+        self.client.force_login(self.admin)
+        with Mocker() as mocker:
+            mocker.head(
+                f"https://example.com/avatar/{self.admin.username}",
+                headers={"Content-Type": "image/png"},
+            )
+            response = self.client.get(
+                reverse("authentik_api:user-list"),
+                data={"username": self.admin.username},
+            )
+            self.assertEqual(response.status_code, 200)
+            body = loads(response.content.decode())
+            # The URL hasn't been checked yet, so the next mode is used
+            self.assertIn("data:image/svg+xml;base64,", body["results"][0]["avatar"])
+
+            response = self.client.get(
+                reverse("authentik_api:user-list"),
+                data={"username": self.admin.username},
+            )
+            self.assertEqual(response.status_code, 200)
+            body = loads(response.content.decode())
+            self.assertEqual(
+                body["results"][0]["avatar"], f"https://example.com/avatar/{self.admin.username}"
+            )
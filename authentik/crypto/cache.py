@@ -0,0 +1,99 @@
+"""Process-wide cache of parsed key material"""
+
+from collections.abc import Callable
+from hashlib import sha256
+from threading import Lock
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import xmlsec
+from jwcrypto.jwk import JWK
+
+if TYPE_CHECKING:
+    from authentik.crypto.models import CertificateKeyPair
+
+T = TypeVar("T")
+
+
+class KeyCache:
+    """Cache objects derived from a CertificateKeyPair (parsed certificates and keys,
+    xmlsec keys, JWKs, etc) per process.
+
+    Entries are keyed by the keypair's primary key, the kind of object and a fingerprint
+    of the key material, so a keypair changed by another process is never served stale.
+    Entries of a keypair are dropped when the keypair is saved or deleted."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._entries: dict[tuple[str, str], tuple[str, Any]] = {}
+
+    @staticmethod
+    def fingerprint(keypair: "CertificateKeyPair") -> str:
+        """Fingerprint of the keypair's certificate and key data"""
+        digest = sha256(keypair.certificate_data.encode())
+        digest.update(b"\0")
+        digest.update(keypair.key_data.encode())
+        return digest.hexdigest()
+
+    def get(self, keypair: "CertificateKeyPair", kind: str, factory: Callable[[], T]) -> T:
+        """Get object of `kind` for `keypair`, calling `factory` on a miss. Exceptions
+        raised by `factory` are not cached."""
+        key = (str(keypair.pk), kind)
+        fingerprint = KeyCache.fingerprint(keypair)
+        entry = self._entries.get(key)
+        if entry and entry[0] == fingerprint:
+            return entry[1]
+        value = factory()
+        # Don't cache objects of keypairs which have not been saved yet
+        if keypair._state.adding:
+            return value
+        with self._lock:
+            self._entries[key] = (fingerprint, value)
+        return value
+
+    def invalidate(self, keypair_pk: str):
+        """Remove all cached objects of keypair `keypair_pk`"""
+        keypair_pk = str(keypair_pk)
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == keypair_pk]:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all cached objects"""
+        with self._lock:
+            self._entries.clear()
+
+
+KEY_CACHE = KeyCache()
+
+
+def get_xmlsec_key(keypair: "CertificateKeyPair", with_private_key=True) -> xmlsec.Key:
+    """Get xmlsec key of the keypair, either the private key with the certificate loaded
+    or just the certificate. xmlsec duplicates keys when they're assigned to a context
+    or added to a keys manager, so the returned key can be shared."""
+
+    def factory():
+        if not with_private_key:
+            return xmlsec.Key.from_memory(
+                keypair.certificate_data,
+                xmlsec.constants.KeyDataFormatCertPem,
+                None,
+            )
+        key = xmlsec.Key.from_memory(
+            keypair.key_data,
+            xmlsec.constants.KeyDataFormatPem,
+            None,
+        )
+        key.load_cert_from_memory(
+            keypair.certificate_data,
+            xmlsec.constants.KeyDataFormatCertPem,
+        )
+        return key
+
+    return KEY_CACHE.get(keypair, f"xmlsec_key/{with_private_key}", factory)
+
+
+def get_certificate_jwk(keypair: "CertificateKeyPair") -> JWK:
+    """Get JWK of the keypair's certificate's public key"""
+    return KEY_CACHE.get(
+        keypair, "jwk_certificate", lambda: JWK.from_pem(keypair.certificate_data.encode())
+    )
@@ -23,6 +23,7 @@ from rest_framework.serializers import Serializer
 from structlog.stdlib import get_logger
 
 from authentik.blueprints.models import ManagedModel
+from authentik.crypto.cache import KEY_CACHE
 from authentik.lib.models import CreatedUpdatedModel, SerializerModel
 
 LOGGER = get_logger()
@@ -146,8 +147,12 @@ class CertificateKeyPair(SerializerModel, ManagedModel, CreatedUpdatedModel):
     def certificate(self) -> Certificate:
         """Get python cryptography Certificate instance"""
         if not self._cert:
-            self._cert = load_pem_x509_certificate(
-                self.certificate_data.encode("utf-8"), default_backend()
+            self._cert = KEY_CACHE.get(
+                self,
+                "certificate",
+                lambda: load_pem_x509_certificate(
+                    self.certificate_data.encode("utf-8"), default_backend()
+                ),
             )
         return self._cert
 
@@ -165,10 +170,14 @@ class CertificateKeyPair(SerializerModel, ManagedModel, CreatedUpdatedModel):
         """Get python cryptography PrivateKey instance"""
         if not self._private_key and self.key_data != "":
             try:
-                self._private_key = load_pem_private_key(
-                    str.encode("\n".join([x.strip() for x in self.key_data.split("\n")])),
-                    password=None,
-                    backend=default_backend(),
+                self._private_key = KEY_CACHE.get(
+                    self,
+                    "private_key",
+                    lambda: load_pem_private_key(
+                        str.encode("\n".join([x.strip() for x in self.key_data.split("\n")])),
+                        password=None,
+                        backend=default_backend(),
+                    ),
                 )
             except ValueError as exc:
                 LOGGER.warning(exc)
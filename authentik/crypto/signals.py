@@ -6,10 +6,11 @@ from ssl import CertificateError
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.x509 import Certificate
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from structlog.stdlib import get_logger
 
+from authentik.crypto.cache import KEY_CACHE
 from authentik.crypto.models import (
     CertificateKeyPair,
     detect_key_type,
@@ -68,3 +69,12 @@ def certificate_key_pair_pre_save(
         legacy_kid = generate_key_id_legacy(instance.key_data)
         if instance.kid not in (new_kid, legacy_kid):
             instance.kid = new_kid
+
+
+@receiver(post_save, sender="authentik_crypto.CertificateKeyPair")
+@receiver(post_delete, sender="authentik_crypto.CertificateKeyPair")
+def certificate_key_pair_invalidate_cache(
+    sender: type[CertificateKeyPair], instance: CertificateKeyPair, **_
+):
+    """Remove cached key objects of the keypair"""
+    KEY_CACHE.invalidate(instance.pk)
@@ -20,6 +20,7 @@ from authentik.core.tests.utils import (
 )
 from authentik.crypto.api import CertificateKeyPairSerializer
 from authentik.crypto.builder import CertificateBuilder
+from authentik.crypto.cache import get_xmlsec_key
 from authentik.crypto.models import CertificateKeyPair, generate_key_id, generate_key_id_legacy
 from authentik.crypto.tasks import MANAGED_DISCOVERED, certificate_discovery
 from authentik.lib.config import CONFIG
@@ -39,6 +40,22 @@ class TestCrypto(APITestCase):
         )
         self.assertIsNone(cert.private_key)
 
+    def test_model_key_cache(self):
+        """Test parsed keys are shared between instances and invalidated on save"""
+        keypair = create_test_cert()
+        first = CertificateKeyPair.objects.get(pk=keypair.pk)
+        second = CertificateKeyPair.objects.get(pk=keypair.pk)
+        self.assertIs(first.private_key, second.private_key)
+        self.assertIs(first.certificate, second.certificate)
+        self.assertIs(get_xmlsec_key(first), get_xmlsec_key(second))
+        other = create_test_cert()
+        keypair.certificate_data = other.certificate_data
+        keypair.key_data = other.key_data
+        keypair.save()
+        third = CertificateKeyPair.objects.get(pk=keypair.pk)
+        self.assertIsNot(first.private_key, third.private_key)
+        self.assertEqual(third.certificate, other.certificate)
+
     def test_serializer(self):
         """Test API Validation"""
         keypair = create_test_cert()
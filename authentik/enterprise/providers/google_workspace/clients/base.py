@@ -1,5 +1,10 @@
+from collections import deque
+from contextlib import contextmanager
+from itertools import batched
+from time import monotonic, sleep
+
 from django.db.models import Model
-from django.http import HttpResponseBadRequest, HttpResponseNotFound
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, HttpResponseNotFound
 from google.auth.exceptions import GoogleAuthError, TransportError
 from googleapiclient.discovery import build
 from googleapiclient.errors import Error, HttpError
@@ -7,10 +12,15 @@ from googleapiclient.http import HttpRequest
 from httplib2 import HttpLib2Error, HttpLib2ErrorWithResponse
 
 from authentik.enterprise.providers.google_workspace.models import GoogleWorkspaceProvider
-from authentik.lib.sync.outgoing import HTTP_CONFLICT
+from authentik.lib.sync.outgoing import (
+    HTTP_CONFLICT,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_TOO_MANY_REQUESTS,
+)
 from authentik.lib.sync.outgoing.base import SAFE_METHODS, BaseOutgoingSyncClient
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
+    BaseSyncException,
     DryRunRejected,
     NotFoundSyncException,
     ObjectExistsSyncException,
@@ -18,6 +28,28 @@ from authentik.lib.sync.outgoing.exceptions import (
     TransientSyncException,
 )
 
+# Maximum number of requests in a single batch supported by the Admin SDK
+BATCH_SIZE = 1000
+# Number of times rate-limited requests of a batch are sent
+BATCH_ATTEMPTS = 4
+BATCH_BACKOFF_SECONDS = 2
+# Default Directory API quota of queries per minute
+QUOTA_QUERIES_PER_MINUTE = 2400
+QUOTA_WINDOW_SECONDS = 60
+THROTTLED_REASONS = ["rateLimitExceeded", "userRateLimitExceeded", "quotaExceeded"]
+
+
+def _is_throttled(exc: HttpError) -> bool:
+    """Check if a request failed due to rate limiting"""
+    if exc.status_code in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+        return True
+    if exc.status_code != HttpResponseForbidden.status_code:
+        return False
+    details = exc.error_details if isinstance(exc.error_details, list) else []
+    return any(
+        isinstance(detail, dict) and detail.get("reason") in THROTTLED_REASONS for detail in details
+    )
+
 
 class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict](
     BaseOutgoingSyncClient[TModel, TConnection, TSchema, GoogleWorkspaceProvider]
@@ -25,6 +57,7 @@ class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict
     """Base client for syncing to google workspace"""
 
     domains: list
+    can_batch = True
 
     def __init__(self, provider: GoogleWorkspaceProvider) -> None:
         super().__init__(provider)
@@ -34,6 +67,8 @@ class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict
             cache_discovery=False,
             **provider.google_credentials(),
         )
+        # Number of queries sent by this client, to stay within the API quota
+        self._queries: deque[tuple[float, int]] = deque()
         self.__prefetch_domains()
 
     def __prefetch_domains(self):
@@ -46,22 +81,110 @@ class GoogleWorkspaceSyncClient[TModel: Model, TConnection: Model, TSchema: dict
     def _request(self, request: HttpRequest):
         if self.provider.dry_run and request.method.upper() not in SAFE_METHODS:
             raise DryRunRejected(request.uri, request.method, request.body)
+        with self._map_exceptions(request.body):
+            self._pace(1)
+            return request.execute()
+
+    @contextmanager
+    def _map_exceptions(self, body=None):
         try:
-            response = request.execute()
+            yield
         except GoogleAuthError as exc:
             if isinstance(exc, TransportError):
                 raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
             raise StopSync(exc) from exc
         except HttpLib2Error as exc:
             if isinstance(exc, HttpLib2ErrorWithResponse):
-                self._response_handle_status_code(request.body, exc.response.status, exc)
+                self._response_handle_status_code(body, exc.response.status, exc)
             raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
         except HttpError as exc:
-            self._response_handle_status_code(request.body, exc.status_code, exc)
+            self._response_handle_status_code(body, exc.status_code, exc)
             raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
         except Error as exc:
             raise TransientSyncException(f"Failed to send request: {str(exc)}") from exc
-        return response
+
+    def _pace(self, queries: int):
+        """Wait until `queries` can be sent without exceeding the queries per minute quota"""
+        while True:
+            now = monotonic()
+            while self._queries and now - self._queries[0][0] > QUOTA_WINDOW_SECONDS:
+                self._queries.popleft()
+            sent = sum(count for _, count in self._queries)
+            if not self._queries or sent + queries <= QUOTA_QUERIES_PER_MINUTE:
+                break
+            sleep(QUOTA_WINDOW_SECONDS - (now - self._queries[0][0]))
+        self._queries.append((now, queries))
+
+    def _batch(self, requests: dict[str, HttpRequest]) -> dict[str, dict | BaseSyncException]:
+        """Send `requests` in batches of up to `BATCH_SIZE` requests, and return the response
+        or the exception of each request by its ID. Rate-limited requests are sent again with
+        an exponential backoff, up to `BATCH_ATTEMPTS` times."""
+        results = {}
+        throttled = {}
+
+        def callback(request_id: str, response: dict, exception: HttpError | None):
+            if exception is None:
+                results[request_id] = response or {}
+            elif _is_throttled(exception):
+                results[request_id] = TransientSyncException(
+                    f"Failed to send request: {str(exception)}"
+                )
+                throttled[request_id] = requests[request_id]
+            else:
+                results[request_id] = self._batch_exception(requests[request_id], exception)
+
+        pending = dict(requests)
+        for attempt in range(BATCH_ATTEMPTS):
+            throttled.clear()
+            for chunk in batched(pending.items(), BATCH_SIZE, strict=False):
+                batch = self.directory_service.new_batch_http_request(callback=callback)
+                for request_id, request in chunk:
+                    batch.add(request, request_id=request_id)
+                with self._map_exceptions():
+                    self._pace(len(chunk))
+                    batch.execute()
+            if not throttled or attempt == BATCH_ATTEMPTS - 1:
+                break
+            sleep(BATCH_BACKOFF_SECONDS * 2**attempt)
+            pending = dict(throttled)
+        return results
+
+    def _batch_exception(self, request: HttpRequest, exc: HttpError) -> BaseSyncException:
+        """Get the sync exception `_request` would raise for a failed request"""
+        try:
+            self._response_handle_status_code(request.body, exc.status_code, exc)
+        except BaseSyncException as sync_exc:
+            return sync_exc
+        return TransientSyncException(f"Failed to send request: {str(exc)}")
+
+    def batch_send(self, requests: dict[str, HttpRequest]) -> dict[str, dict | BaseSyncException]:
+        return self._batch(requests)
+
+    def batch_result(
+        self,
+        obj: TModel,
+        connection: TConnection | None,
+        request: HttpRequest,
+        result: dict | BaseSyncException | None,
+    ) -> TConnection | None:
+        if result is None or isinstance(result, TransientSyncException):
+            raise result or TransientSyncException()
+        if isinstance(result, BaseSyncException):
+            return None
+        if connection:
+            connection.attributes = result
+            connection.save()
+        else:
+            connection = self.batch_connection(obj, result)
+        self.batch_written(obj, connection)
+        return connection
+
+    def batch_connection(self, obj: TModel, response: dict) -> TConnection:
+        """Create the connection for `obj` after it was created in a batch"""
+        raise NotImplementedError()
+
+    def batch_written(self, obj: TModel, connection: TConnection):
+        """Called after `obj` was created or updated in a batch"""
 
     def _response_handle_status_code(self, request: dict, status_code: int, root_exc: Exception):
         if status_code == HttpResponseNotFound.status_code:
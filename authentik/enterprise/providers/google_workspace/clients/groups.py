@@ -1,5 +1,6 @@
 from django.db import transaction
 from django.utils.text import slugify
+from googleapiclient.http import HttpRequest
 
 from authentik.core.models import Group
 from authentik.enterprise.providers.google_workspace.clients.base import GoogleWorkspaceSyncClient
@@ -12,6 +13,7 @@ from authentik.enterprise.providers.google_workspace.models import (
 from authentik.lib.sync.mapper import PropertyMappingManager
 from authentik.lib.sync.outgoing.base import Direction
 from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
     NotFoundSyncException,
     ObjectExistsSyncException,
     TransientSyncException,
@@ -104,6 +106,29 @@ class GoogleWorkspaceGroupClient(
             # Resource missing is handled by self.write, which will re-create the group
             raise
 
+    def batch_request(
+        self, group: Group, connection: GoogleWorkspaceProviderGroup | None
+    ) -> HttpRequest:
+        google_group = self.to_schema(group, connection)
+        self.check_email_valid(google_group["email"])
+        if connection:
+            return self.directory_service.groups().update(
+                groupKey=connection.google_id,
+                body=google_group,
+            )
+        return self.directory_service.groups().insert(body=google_group)
+
+    def batch_connection(self, group: Group, response: dict) -> GoogleWorkspaceProviderGroup:
+        return GoogleWorkspaceProviderGroup.objects.create(
+            provider=self.provider,
+            group=group,
+            google_id=response["id"],
+            attributes=response,
+        )
+
+    def batch_written(self, group: Group, connection: GoogleWorkspaceProviderGroup):
+        self.create_sync_members(group, connection)
+
     def write(self, obj: Group):
         google_group, created = super().write(obj)
         self.create_sync_members(obj, google_group)
@@ -125,6 +150,9 @@ class GoogleWorkspaceGroupClient(
             return self._patch_remove_users(group, users_set)
 
     def _patch(self, google_group_id: str, direction: Direction, members: list[str]):
+        members = list(members)
+        if len(members) > 1 and not self.provider.dry_run:
+            return self._patch_batch(google_group_id, direction, members)
         for user in members:
             try:
                 if direction == Direction.add:
@@ -144,6 +172,26 @@ class GoogleWorkspaceGroupClient(
             except TransientSyncException:
                 raise
 
+    def _patch_batch(self, google_group_id: str, direction: Direction, members: list[str]):
+        """Add or remove multiple members using batch requests"""
+        requests = {}
+        for user in members:
+            if direction == Direction.add:
+                requests[user] = self.directory_service.members().insert(
+                    groupKey=google_group_id, body={"email": user}
+                )
+            if direction == Direction.remove:
+                requests[user] = self.directory_service.members().delete(
+                    groupKey=google_group_id, memberKey=user
+                )
+        responses = self._batch(requests)
+        for user in members:
+            response = responses.get(user)
+            if isinstance(response, ObjectExistsSyncException):
+                continue
+            if isinstance(response, BaseSyncException):
+                raise response
+
     def _patch_add_users(self, group: Group, users_set: set[int]):
         """Add users in users_set to group"""
         if len(users_set) < 1:
@@ -1,4 +1,6 @@
+from email.parser import FeedParser
 from json import dumps
+from urllib.parse import urlparse
 
 from httplib2 import Response
 
@@ -35,7 +37,37 @@ class MockHTTP:
     ):
         key = (uri, method.upper())
         self._recorded_requests.append((uri, method, body, headers))
+        content_type = (headers or {}).get("content-type", "")
+        if content_type.startswith("multipart/mixed"):
+            return self._batch_request(uri, body, content_type)
         if key not in self._responses and self.raise_on_unrecorded:
             raise AssertionError(key)
         body, meta = self._responses[key]
         return Response(meta), body.encode("utf-8")
+
+    def _batch_request(self, uri: str, body: str, content_type: str):
+        """Respond to each request of a batch with its recorded response"""
+        parser = FeedParser()
+        parser.feed(f"content-type: {content_type}\r\n\r\n{body}")
+        parsed = urlparse(uri)
+        parts = []
+        for part in parser.close().get_payload():
+            request_line, payload = part.get_payload().split("\n", 1)
+            method, path, _ = request_line.split(" ", 2)
+            _, _, request_body = payload.partition("\n\n")
+            response, content = self.request(
+                f"{parsed.scheme}://{parsed.netloc}{path}", method, body=request_body or None
+            )
+            parts.append(
+                "--batch\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'][1:]}\r\n\r\n"
+                f"HTTP/1.1 {response.status} OK\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{content.decode('utf-8')}\r\n"
+            )
+        parts.append("--batch--")
+        return (
+            Response({"status": "200", "content-type": 'multipart/mixed; boundary="batch"'}),
+            "".join(parts).encode("utf-8"),
+        )
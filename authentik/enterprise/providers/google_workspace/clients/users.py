@@ -1,4 +1,5 @@
 from django.db import transaction
+from googleapiclient.http import HttpRequest
 
 from authentik.core.models import User
 from authentik.enterprise.providers.google_workspace.clients.base import GoogleWorkspaceSyncClient
@@ -94,6 +95,27 @@ class GoogleWorkspaceUserClient(GoogleWorkspaceSyncClient[User, GoogleWorkspaceP
         connection.attributes = response
         connection.save()
 
+    def batch_request(
+        self, user: User, connection: GoogleWorkspaceProviderUser | None
+    ) -> HttpRequest:
+        google_user = self.to_schema(user, connection)
+        self.check_email_valid(
+            google_user["primaryEmail"], *[x["address"] for x in google_user.get("emails", [])]
+        )
+        if connection:
+            return self.directory_service.users().update(
+                userKey=connection.google_id, body=google_user
+            )
+        return self.directory_service.users().insert(body=google_user)
+
+    def batch_connection(self, user: User, response: dict) -> GoogleWorkspaceProviderUser:
+        return GoogleWorkspaceProviderUser.objects.create(
+            provider=self.provider,
+            user=user,
+            google_id=response["primaryEmail"],
+            attributes=response,
+        )
+
     def discover(self):
         """Iterate through all users and connect them with authentik users if possible"""
         request = self.directory_service.users().list(
@@ -311,6 +311,65 @@ class GoogleWorkspaceUserTests(TestCase):
             self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
             self.assertEqual(len(http.requests()), 5)
 
+    def test_sync_batch(self):
+        """Test full sync with multiple users, which are created in a batch request"""
+        http = MockHTTP()
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/customer/my_customer/domains?key={self.api_key}&alt=json",
+            domains_list_v1_mock,
+        )
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/users?customer=my_customer&maxResults=500&orderBy=email&key={self.api_key}&alt=json",
+            method="GET",
+            body={"users": []},
+        )
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/groups?customer=my_customer&maxResults=500&orderBy=email&key={self.api_key}&alt=json",
+            method="GET",
+            body={"groups": []},
+        )
+        http.add_response(
+            f"https://admin.googleapis.com/admin/directory/v1/users?key={self.api_key}&alt=json",
+            method="POST",
+            body={"primaryEmail": f"{generate_id()}@goauthentik.io"},
+        )
+        self.app.backchannel_providers.remove(self.provider)
+        users = []
+        for _ in range(3):
+            uid = generate_id()
+            users.append(
+                User.objects.create(
+                    username=uid,
+                    name=f"{uid} {uid}",
+                    email=f"{uid}@goauthentik.io",
+                )
+            )
+        self.app.backchannel_providers.add(self.provider)
+        with patch(
+            "authentik.enterprise.providers.google_workspace.models.GoogleWorkspaceProvider.google_credentials",
+            MagicMock(return_value={"developerKey": self.api_key, "http": http}),
+        ):
+            google_workspace_sync.send(self.provider.pk).get_result()
+            for user in users:
+                self.assertTrue(
+                    GoogleWorkspaceProviderUser.objects.filter(
+                        user=user, provider=self.provider
+                    ).exists()
+                )
+            self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
+            batches = [
+                request
+                for request in http.requests()
+                if (request[3] or {}).get("content-type", "").startswith("multipart/mixed")
+            ]
+            self.assertEqual(len(batches), 1)
+            inserted = [
+                loads(request[2])["primaryEmail"]
+                for request in http.requests()
+                if request[1] == "POST" and request[2] and request not in batches
+            ]
+            self.assertCountEqual(inserted, [user.email for user in users])
+
     def test_sync_discover_multiple(self):
         """Test user discovery, running multiple times"""
         uid = generate_id()
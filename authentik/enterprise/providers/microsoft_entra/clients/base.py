@@ -1,6 +1,8 @@
-from asyncio import run
+from asyncio import Semaphore, gather, new_event_loop, sleep
 from collections.abc import Coroutine
 from dataclasses import asdict
+from functools import cached_property
+from json import dumps, loads
 from typing import Any
 
 import httpx
@@ -10,27 +12,38 @@ from azure.core.exceptions import (
     ServiceResponseError,
 )
 from azure.identity.aio import ClientSecretCredential
+from deepmerge import always_merger
 from django.db.models import Model
 from django.http import HttpResponseBadRequest, HttpResponseNotFound
 from kiota_abstractions.api_error import APIError
 from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import Parsable
 from kiota_authentication_azure.azure_identity_authentication_provider import (
     AzureIdentityAuthenticationProvider,
 )
 from kiota_http.kiota_client_factory import KiotaClientFactory
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
 from msgraph.generated.models.entity import Entity
 from msgraph.generated.models.o_data_errors.o_data_error import ODataError
 from msgraph.graph_request_adapter import GraphRequestAdapter, options
 from msgraph.graph_service_client import GraphServiceClient
 from msgraph_core import GraphClientFactory
+from msgraph_core.requests.batch_request_builder import BatchRequestBuilder
+from msgraph_core.requests.batch_request_content import BatchRequestContent
+from msgraph_core.requests.batch_request_item import BatchRequestItem
 from opentelemetry import trace
 
 from authentik.enterprise.providers.microsoft_entra.models import MicrosoftEntraProvider
 from authentik.events.utils import sanitize_item
-from authentik.lib.sync.outgoing import HTTP_CONFLICT
+from authentik.lib.sync.outgoing import (
+    HTTP_CONFLICT,
+    HTTP_SERVICE_UNAVAILABLE,
+    HTTP_TOO_MANY_REQUESTS,
+)
 from authentik.lib.sync.outgoing.base import SAFE_METHODS, BaseOutgoingSyncClient
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
+    BaseSyncException,
     DryRunRejected,
     NotFoundSyncException,
     ObjectExistsSyncException,
@@ -59,17 +72,55 @@ class AuthentikRequestAdapter(GraphRequestAdapter):
         return await super().get_http_response_message(request_info, parent_span, claims=claims)
 
 
+# Maximum number of requests in a single JSON batch supported by Graph
+BATCH_SIZE = 20
+# Maximum number of batches sent concurrently
+BATCH_CONCURRENCY = 4
+# Number of times throttled requests of a batch are sent
+BATCH_ATTEMPTS = 3
+BATCH_DEFAULT_RETRY_AFTER_SECONDS = 5
+BATCH_MAX_RETRY_AFTER_SECONDS = 60
+
+
+def _retry_after(response: dict) -> float:
+    """Seconds to wait before retrying a throttled request of a batch"""
+    headers = {key.lower(): value for key, value in (response.get("headers") or {}).items()}
+    try:
+        retry_after = float(headers.get("retry-after", BATCH_DEFAULT_RETRY_AFTER_SECONDS))
+    except ValueError:
+        retry_after = BATCH_DEFAULT_RETRY_AFTER_SECONDS
+    return min(max(retry_after, 0), BATCH_MAX_RETRY_AFTER_SECONDS)
+
+
 class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict](
     BaseOutgoingSyncClient[TModel, TConnection, TSchema, MicrosoftEntraProvider]
 ):
-    """Base client for syncing to microsoft entra"""
+    """Base client for syncing to microsoft entra
+
+    All requests of a client are run on the same event loop with the same Graph client, so that
+    HTTP connections and access tokens are re-used; `close` must be called when the client is
+    not used anymore."""
 
     domains: list
+    can_batch = True
+    entity_type: type[Parsable]
 
     def __init__(self, provider: MicrosoftEntraProvider) -> None:
         super().__init__(provider)
         self.credentials = provider.microsoft_credentials()
-        self.__prefetch_domains()
+        self._loop = new_event_loop()
+        try:
+            self.__prefetch_domains()
+        except BaseException:
+            self.close()
+            raise
+
+    @cached_property
+    def http_client(self) -> httpx.AsyncClient:
+        """HTTP client used for all requests of this client"""
+        return GraphClientFactory.create_with_default_middleware(
+            options=options, client=KiotaClientFactory.get_default_client()
+        )
 
     def get_request_adapter(
         self, credentials: ClientSecretCredential, scopes: list[str] | None = None
@@ -84,18 +135,24 @@ class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict]
         return AuthentikRequestAdapter(
             auth_provider=auth_provider,
             provider=self.provider,
-            client=GraphClientFactory.create_with_default_middleware(
-                options=options, client=KiotaClientFactory.get_default_client()
-            ),
+            client=self.http_client,
         )
 
-    @property
+    @cached_property
     def client(self):
         return GraphServiceClient(request_adapter=self.get_request_adapter(**self.credentials))
 
+    def close(self):
+        if self._loop.is_closed():
+            return
+        if "http_client" in self.__dict__:
+            self._loop.run_until_complete(self.http_client.aclose())
+        self._loop.run_until_complete(self.credentials["credentials"].close())
+        self._loop.close()
+
     def _request[T](self, request: Coroutine[Any, Any, T]) -> T:
         try:
-            return run(request)
+            return self._loop.run_until_complete(request)
         except ClientAuthenticationError as exc:
             raise StopSync(exc, None, None) from exc
         except ODataError as exc:
@@ -109,8 +166,113 @@ class MicrosoftEntraSyncClient[TModel: Model, TConnection: Model, TSchema: dict]
                 raise BadRequestSyncException("Bad request", exc.response_headers) from exc
             if exc.response_status_code == HTTP_CONFLICT:
                 raise ObjectExistsSyncException("Object exists", exc.response_headers) from exc
+            # The retry middleware already waited for `Retry-After` before giving up
+            if exc.response_status_code in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+                raise TransientSyncException("Request throttled") from exc
             raise exc
 
+    def _batch(self, requests: dict[str, RequestInformation]) -> dict[str, dict]:
+        """Send `requests` using JSON batching, and return the response of each request by
+        its ID. Requests that are throttled are sent again after the longest `Retry-After`
+        of their batch, up to `BATCH_ATTEMPTS` times."""
+        return self._request(self._batch_async(requests))
+
+    async def _batch_async(self, requests: dict[str, RequestInformation]) -> dict[str, dict]:
+        builder = BatchRequestBuilder(self.client.request_adapter)
+        semaphore = Semaphore(BATCH_CONCURRENCY)
+
+        async def send(chunk: list[tuple[str, RequestInformation]]) -> list[dict]:
+            content = BatchRequestContent()
+            for request_id, request in chunk:
+                content.add_request(request_id, BatchRequestItem(request, id=request_id))
+            async with semaphore:
+                body = await self.client.request_adapter.send_primitive_async(
+                    await builder.to_post_request_information(content), "bytes", None
+                )
+            return loads(body).get("responses", [])
+
+        responses = {}
+        pending = list(requests.items())
+        for attempt in range(BATCH_ATTEMPTS):
+            results = await gather(
+                *[
+                    send(pending[idx : idx + BATCH_SIZE])
+                    for idx in range(0, len(pending), BATCH_SIZE)
+                ]
+            )
+            throttled = []
+            for response in (response for result in results for response in result):
+                responses[response["id"]] = response
+                if response.get("status") in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+                    throttled.append(response)
+            if not throttled or attempt == BATCH_ATTEMPTS - 1:
+                break
+            await sleep(max(_retry_after(response) for response in throttled))
+            pending = [(response["id"], requests[response["id"]]) for response in throttled]
+        return responses
+
+    def _check_batch_response(self, response: dict | None):
+        """Raise the same exceptions for the response of a batched request as `_request`"""
+        status = response.get("status") if response else None
+        if status is None:
+            raise TransientSyncException("No response for batched request")
+        if status == HttpResponseNotFound.status_code:
+            raise NotFoundSyncException("Object not found")
+        if status == HttpResponseBadRequest.status_code:
+            raise BadRequestSyncException(response.get("body"))
+        if status == HTTP_CONFLICT:
+            raise ObjectExistsSyncException(response.get("body"))
+        if status in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+            raise TransientSyncException("Request throttled")
+        if status >= HttpResponseBadRequest.status_code:
+            raise TransientSyncException(response.get("body"))
+
+    def _batch_entity(self, response: dict) -> Parsable | None:
+        """Parse the body of a batched response"""
+        body = response.get("body")
+        if not isinstance(body, dict):
+            return None
+        return (
+            JsonParseNodeFactory()
+            .get_root_parse_node("application/json", dumps(body).encode())
+            .get_object_value(self.entity_type)
+        )
+
+    def batch_send(self, requests: dict[str, RequestInformation]) -> dict[str, dict]:
+        return self._batch(requests)
+
+    def batch_result(
+        self,
+        obj: TModel,
+        connection: TConnection | None,
+        request: RequestInformation,
+        result: dict | None,
+    ) -> TConnection | None:
+        try:
+            self._check_batch_response(result)
+        except TransientSyncException:
+            raise
+        except BaseSyncException:
+            return None
+        entity = self._batch_entity(result)
+        if connection and entity:
+            always_merger.merge(connection.attributes, self.entity_as_dict(entity))
+            connection.save()
+        elif not connection:
+            if not entity:
+                raise TransientSyncException("No body in response of batched request")
+            connection = self.connection_type.objects.create(
+                provider=self.provider,
+                microsoft_id=entity.id,
+                attributes=self.entity_as_dict(entity),
+                **{self.connection_type_query: obj},
+            )
+        self.batch_written(obj, connection)
+        return connection
+
+    def batch_written(self, obj: TModel, connection: TConnection):
+        """Called after `obj` was created or updated in a batch"""
+
     def __prefetch_domains(self):
         self.domains = []
         organizations = self._request(self.client.organization.get())
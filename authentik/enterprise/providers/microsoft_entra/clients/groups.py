@@ -1,5 +1,6 @@
 from deepmerge import always_merger
 from django.db import transaction
+from kiota_abstractions.request_information import RequestInformation
 from msgraph.generated.groups.groups_request_builder import GroupsRequestBuilder
 from msgraph.generated.models.group import Group as MSGroup
 from msgraph.generated.models.reference_create import ReferenceCreate
@@ -31,6 +32,7 @@ class MicrosoftEntraGroupClient(
     connection_type = MicrosoftEntraProviderGroup
     connection_type_query = "group"
     can_discover = True
+    entity_type = MSGroup
 
     def __init__(self, provider: MicrosoftEntraProvider) -> None:
         super().__init__(provider)
@@ -115,6 +117,20 @@ class MicrosoftEntraGroupClient(
             # Resource missing is handled by self.write, which will re-create the group
             raise
 
+    def batch_request(
+        self, group: Group, connection: MicrosoftEntraProviderGroup | None
+    ) -> RequestInformation:
+        microsoft_group = self.to_schema(group, connection)
+        if connection:
+            microsoft_group.id = connection.microsoft_id
+            return self.client.groups.by_group_id(
+                connection.microsoft_id
+            ).to_patch_request_information(microsoft_group)
+        return self.client.groups.to_post_request_information(microsoft_group)
+
+    def batch_written(self, group: Group, connection: MicrosoftEntraProviderGroup):
+        self.create_sync_members(group, connection)
+
     def write(self, obj: Group):
         microsoft_group, created = super().write(obj)
         self.create_sync_members(obj, microsoft_group)
@@ -136,6 +152,9 @@ class MicrosoftEntraGroupClient(
             return self._patch_remove_users(group, users_set)
 
     def _patch(self, microsoft_group_id: str, direction: Direction, members: list[str]):
+        members = list(members)
+        if len(members) > 1 and not self.provider.dry_run:
+            return self._patch_batch(microsoft_group_id, direction, members)
         for user in members:
             try:
                 if direction == Direction.add:
@@ -158,6 +177,30 @@ class MicrosoftEntraGroupClient(
             except TransientSyncException:
                 raise
 
+    def _patch_batch(self, microsoft_group_id: str, direction: Direction, members: list[str]):
+        """Add or remove multiple members using JSON batching"""
+        requests = {}
+        for user in members:
+            if direction == Direction.add:
+                request_body = ReferenceCreate(
+                    odata_id=f"https://graph.microsoft.com/v1.0/directoryObjects/{user}",
+                )
+                requests[user] = self.client.groups.by_group_id(
+                    microsoft_group_id
+                ).members.ref.to_post_request_information(request_body)
+            if direction == Direction.remove:
+                requests[user] = (
+                    self.client.groups.by_group_id(microsoft_group_id)
+                    .members.by_directory_object_id(user)
+                    .ref.to_delete_request_information()
+                )
+        responses = self._batch(requests)
+        for user in members:
+            try:
+                self._check_batch_response(responses.get(user))
+            except ObjectExistsSyncException:
+                pass
+
     def _patch_add_users(self, group: Group, users_set: set[int]):
         """Add users in users_set to group"""
         if len(users_set) < 1:
@@ -1,5 +1,6 @@
 from deepmerge import always_merger
 from django.db import transaction
+from kiota_abstractions.request_information import RequestInformation
 from msgraph.generated.models.user import User as MSUser
 from msgraph.generated.users.users_request_builder import UsersRequestBuilder
 
@@ -26,6 +27,7 @@ class MicrosoftEntraUserClient(MicrosoftEntraSyncClient[User, MicrosoftEntraProv
     connection_type = MicrosoftEntraProviderUser
     connection_type_query = "user"
     can_discover = True
+    entity_type = MSUser
 
     def __init__(self, provider: MicrosoftEntraProvider) -> None:
         super().__init__(provider)
@@ -137,6 +139,17 @@ class MicrosoftEntraUserClient(MicrosoftEntraSyncClient[User, MicrosoftEntraProv
             always_merger.merge(connection.attributes, self.entity_as_dict(response))
             connection.save()
 
+    def batch_request(
+        self, user: User, connection: MicrosoftEntraProviderUser | None
+    ) -> RequestInformation:
+        microsoft_user = self.to_schema(user, connection)
+        self.check_email_valid(microsoft_user.user_principal_name)
+        if connection:
+            return self.client.users.by_user_id(
+                connection.microsoft_id
+            ).to_patch_request_information(microsoft_user)
+        return self.client.users.to_post_request_information(microsoft_user)
+
     def discover(self):
         """Iterate through all users and connect them with authentik users if possible"""
         request_configuration = UsersRequestBuilder.UsersRequestBuilderGetRequestConfiguration(
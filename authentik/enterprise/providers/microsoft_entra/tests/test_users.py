@@ -1,5 +1,6 @@
 """Microsoft Entra User tests"""
 
+from json import dumps, loads
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from azure.identity.aio import ClientSecretCredential
@@ -473,6 +474,80 @@ class MicrosoftEntraUserTests(APITestCase):
                 self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
                 mod_user_list.assert_called_once()
 
+    def test_sync_batch(self):
+        """Test full sync with multiple users, which are created using JSON batching"""
+        self.app.backchannel_providers.remove(self.provider)
+        users = []
+        for _ in range(3):
+            uid = generate_id()
+            users.append(
+                User.objects.create(
+                    username=uid,
+                    name=f"{uid} {uid}",
+                    email=f"{uid}@goauthentik.io",
+                )
+            )
+        self.app.backchannel_providers.add(self.provider)
+        microsoft_ids = {}
+
+        async def batch(request_info, *args):
+            responses = []
+            for request in loads(request_info.content)["requests"]:
+                microsoft_ids[request["id"]] = generate_id()
+                responses.append(
+                    {
+                        "id": request["id"],
+                        "status": 201,
+                        "headers": {"Content-Type": "application/json"},
+                        "body": {"id": microsoft_ids[request["id"]]},
+                    }
+                )
+            return dumps({"responses": responses}).encode()
+
+        with (
+            patch(
+                "authentik.enterprise.providers.microsoft_entra.models.MicrosoftEntraProvider.microsoft_credentials",
+                MagicMock(return_value={"credentials": self.creds}),
+            ),
+            patch(
+                "msgraph.generated.organization.organization_request_builder.OrganizationRequestBuilder.get",
+                AsyncMock(
+                    return_value=OrganizationCollectionResponse(
+                        value=[
+                            Organization(verified_domains=[VerifiedDomain(name="goauthentik.io")])
+                        ]
+                    )
+                ),
+            ),
+            patch(
+                "msgraph.generated.users.users_request_builder.UsersRequestBuilder.get",
+                AsyncMock(return_value=UserCollectionResponse(value=[])),
+            ),
+            patch(
+                "msgraph.generated.users.users_request_builder.UsersRequestBuilder.post",
+                AsyncMock(return_value=MSUser(id=generate_id())),
+            ) as user_create,
+            patch(
+                "msgraph.generated.groups.groups_request_builder.GroupsRequestBuilder.get",
+                AsyncMock(return_value=GroupCollectionResponse(value=[])),
+            ),
+            patch(
+                "authentik.enterprise.providers.microsoft_entra.clients.base.AuthentikRequestAdapter.send_primitive_async",
+                AsyncMock(side_effect=batch),
+            ) as batch_request,
+        ):
+            microsoft_entra_sync.send(self.provider.pk).get_result()
+            batch_request.assert_called_once()
+            user_create.assert_not_called()
+            for user in users:
+                self.assertEqual(
+                    MicrosoftEntraProviderUser.objects.get(
+                        provider=self.provider, user=user
+                    ).microsoft_id,
+                    microsoft_ids[str(user.pk)],
+                )
+            self.assertFalse(Event.objects.filter(action=EventAction.SYSTEM_EXCEPTION).exists())
+
     def test_connect_manual(self):
         """test manual user connection"""
         uid = generate_id()
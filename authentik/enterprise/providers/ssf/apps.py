@@ -1,7 +1,15 @@
 """SSF app config"""
 
+from prometheus_client import Counter
+
 from authentik.enterprise.apps import EnterpriseConfig
 
+COUNTER_SSF_EVENTS_DELIVERED = Counter(
+    "authentik_providers_ssf_events_delivered",
+    "SSF events pushed to receivers, and whether they were sent, failed or denied by policies",
+    ["tenant", "result"],
+)
+
 
 class AuthentikEnterpriseProviderSSF(EnterpriseConfig):
     """authentik enterprise ssf app config"""
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_providers_ssf", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="streamevent",
+            name="status",
+            field=models.TextField(
+                choices=[
+                    ("pending_new", "Pending New"),
+                    ("pending_failed", "Pending Failed"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                ]
+            ),
+        ),
+    ]
@@ -40,6 +40,7 @@ class SSFEventStatus(models.TextChoices):
 
     PENDING_NEW = "pending_new"
     PENDING_FAILED = "pending_failed"
+    SENDING = "sending"
     SENT = "sent"
 
 
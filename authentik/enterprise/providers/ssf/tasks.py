@@ -1,14 +1,20 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any
 from uuid import UUID
 
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
 from django.http import HttpRequest
 from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
 from dramatiq.actor import actor
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
 from structlog.stdlib import get_logger
 
-from authentik.core.models import User
+from authentik.core.models import Application, User
+from authentik.enterprise.providers.ssf.apps import COUNTER_SSF_EVENTS_DELIVERED
 from authentik.enterprise.providers.ssf.models import (
     DeliveryMethods,
     EventTypes,
@@ -16,13 +22,23 @@ from authentik.enterprise.providers.ssf.models import (
     Stream,
     StreamEvent,
 )
+from authentik.lib.config import CONFIG
 from authentik.lib.utils.http import get_http_session
 from authentik.lib.utils.time import timedelta_from_string
 from authentik.policies.engine import PolicyEngine
 from authentik.tasks.middleware import CurrentTask
+from authentik.tasks.models import Task
 
-session = get_http_session()
 LOGGER = get_logger()
+CACHE_KEY_STREAM_DELIVERY_PENDING = "goauthentik.io/providers/ssf/delivery_pending/%s"
+# Upper limit for the delay between delivery attempts of failed events
+RETRY_BACKOFF_MAX_SECONDS = 3600
+
+session = get_http_session()
+# Keep enough idle connections per endpoint for all concurrent deliveries
+_adapter = HTTPAdapter(pool_maxsize=CONFIG.get_int("providers.ssf.delivery.concurrency", 8))
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
 
 
 def send_ssf_events(
@@ -47,69 +63,243 @@ def send_ssf_events(
     ssf_events_dispatch.send(events_data)
 
 
-@actor(description=_("Dispatch SSF events."))
-def ssf_events_dispatch(events_data: dict[str, dict[str, Any]]):
+class AccessEvaluator:
+    """Check if the user an event is about has access to the stream's application.
+
+    Results are memoized per user and application, so a batch of events for the
+    same users only evaluates policies once per user."""
+
+    def __init__(self):
+        self._users: dict[str, User | None] = {}
+        self._results: dict[tuple[str, int], bool] = {}
+
+    def passing(self, stream: Stream, payload: dict) -> bool:
+        """Check if event is related to user and if so, check
+        if the user has access to the application"""
+        sub_id = payload.get("sub_id", {})
+        email = sub_id.get("user", {}).get("email", None)
+        if not email:
+            return True
+        if email not in self._users:
+            self._users[email] = User.objects.filter(email=email).first()
+        user = self._users[email]
+        if not user:
+            return True
+        application: Application = stream.provider.backchannel_application
+        key = (email, application.pk)
+        if key not in self._results:
+            engine = PolicyEngine(application, user)
+            engine.use_cache = False
+            engine.build()
+            self._results[key] = engine.passing
+        return self._results[key]
+
+
+def _create_events(events_data: dict[str, dict[str, Any]]) -> list[Stream]:
+    """Create stream events, and return the streams events need to be delivered to"""
+    streams = {
+        str(stream.pk): stream
+        for stream in Stream.objects.filter(pk__in=list(events_data.keys())).select_related(
+            "provider", "provider__backchannel_application"
+        )
+    }
+    access = AccessEvaluator()
+    events = []
+    push_streams = {}
     for stream_uuid, event_data in events_data.items():
-        stream = Stream.objects.filter(pk=stream_uuid).first()
+        stream = streams.get(str(stream_uuid))
         if not stream:
             continue
-        send_ssf_event.send_with_options(args=(stream_uuid, event_data), rel_obj=stream.provider)
-
-
-def _check_app_access(stream: Stream, event_data: dict) -> bool:
-    """Check if event is related to user and if so, check
-    if the user has access to the application"""
-    # `event_data` is a dict version of a StreamEvent
-    sub_id = event_data.get("payload", {}).get("sub_id", {})
-    email = sub_id.get("user", {}).get("email", None)
-    if not email:
-        return True
-    user = User.objects.filter(email=email).first()
-    if not user:
-        return True
-    engine = PolicyEngine(stream.provider.backchannel_application, user)
-    engine.use_cache = False
-    engine.build()
-    return engine.passing
+        if stream.delivery_method != DeliveryMethods.RISC_PUSH:
+            # Access of pushed events is checked when they're delivered
+            if not access.passing(stream, event_data.get("payload", {})):
+                continue
+        else:
+            push_streams[str(stream.pk)] = stream
+        events.append(StreamEvent(**event_data))
+    StreamEvent.objects.bulk_create(events)
+    return list(push_streams.values())
+
+
+def _schedule_delivery(stream: Stream):
+    """Deliver the stream's pending events after `providers.ssf.delivery.debounce_seconds`,
+    unless a delivery is already scheduled, which will pick up the events"""
+    debounce = float(CONFIG.get("providers.ssf.delivery.debounce_seconds", 1))
+    if debounce > 0 and not cache.add(
+        CACHE_KEY_STREAM_DELIVERY_PENDING % stream.pk.hex,
+        True,
+        # Expire the key eventually, in case the task is never processed
+        timeout=debounce + 300,
+    ):
+        return
+    ssf_stream_deliver.send_with_options(
+        args=(str(stream.pk),),
+        delay=int(debounce * 1000),
+        rel_obj=stream.provider,
+        uid=str(stream.pk),
+    )
+
+
+@actor(description=_("Dispatch SSF events."))
+def ssf_events_dispatch(events_data: dict[str, dict[str, Any]]):
+    for stream in _create_events(events_data):
+        _schedule_delivery(stream)
 
 
 @actor(description=_("Send an SSF event."))
 def send_ssf_event(stream_uuid: UUID, event_data: dict[str, Any]):
+    """Superseded by `ssf_events_dispatch` and `ssf_stream_deliver`, kept to process
+    messages queued before upgrading"""
+    for stream in _create_events({str(stream_uuid): event_data}):
+        _schedule_delivery(stream)
+
+
+def _claim_events(stream: Stream, event_uuids: list[str] | None = None) -> list[StreamEvent]:
+    """Get the oldest new events of the stream, or the failed events `event_uuids`, and
+    mark them as being sent, so that concurrent deliveries don't pick them up. Events are
+    only marked as sent once the receiver accepted them. Events claimed by a delivery
+    which didn't finish within the task time limit (for example because the worker
+    was stopped) are claimed again by the next delivery."""
+    if event_uuids is not None:
+        query = Q(pk__in=event_uuids, status=SSFEventStatus.PENDING_FAILED)
+        batch_size = None
+    else:
+        claim_expired = now() - timedelta_from_string(CONFIG.get("worker.task_default_time_limit"))
+        query = Q(status=SSFEventStatus.PENDING_NEW) | Q(
+            status=SSFEventStatus.SENDING, last_updated__lt=claim_expired
+        )
+        batch_size = CONFIG.get_int("providers.ssf.delivery.batch_size", 100)
+    with transaction.atomic():
+        events = list(
+            StreamEvent.objects.select_for_update(skip_locked=True)
+            .filter(query, stream=stream)
+            .order_by("created")[:batch_size]
+        )
+        StreamEvent.objects.filter(pk__in=[event.pk for event in events]).update(
+            status=SSFEventStatus.SENDING, last_updated=now()
+        )
+    for event in events:
+        event.status = SSFEventStatus.SENDING
+    return events
+
+
+def _post(url: str, data: str):
+    response = session.post(
+        url,
+        data=data,
+        headers={"Content-Type": "application/secevent+jwt", "Accept": "application/json"},
+    )
+    response.raise_for_status()
+
+
+def _deliver(
+    task: Task, stream: Stream, events: list[StreamEvent]
+) -> tuple[list[StreamEvent], list[StreamEvent]]:
+    """POST all events to the stream's endpoint with up to
+    `providers.ssf.delivery.concurrency` concurrent requests, returns the sent
+    and the failed events"""
+    sent, failed = [], []
+    if not events:
+        return sent, failed
+    concurrency = CONFIG.get_int("providers.ssf.delivery.concurrency", 8)
+    # Sign on this thread, as the signing key is loaded from the database
+    payloads = [(event, stream.encode(event.payload)) for event in events]
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(events)))) as executor:
+        futures = {
+            executor.submit(_post, stream.endpoint_url, data): event for event, data in payloads
+        }
+        for future in as_completed(futures):
+            event = futures[future]
+            try:
+                future.result()
+                sent.append(event)
+            except RequestException as exc:
+                LOGGER.warning("Failed to send SSF event", exc=exc, event=event.pk)
+                attrs = {}
+                if exc.response is not None:
+                    attrs["response"] = {
+                        "content": exc.response.text,
+                        "status": exc.response.status_code,
+                    }
+                task.warning(exc)
+                task.warning("Failed to send request", event=str(event.pk), **attrs)
+                failed.append(event)
+    if sent:
+        StreamEvent.objects.filter(pk__in=[event.pk for event in sent]).update(
+            status=SSFEventStatus.SENT, last_updated=now()
+        )
+    if failed:
+        # Re-up the expiry of the stream events
+        StreamEvent.objects.filter(pk__in=[event.pk for event in failed]).update(
+            status=SSFEventStatus.PENDING_FAILED,
+            expires=now() + timedelta_from_string(stream.provider.event_retention),
+            last_updated=now(),
+        )
+    for result, delivered in [("sent", sent), ("failed", failed)]:
+        COUNTER_SSF_EVENTS_DELIVERED.labels(
+            tenant=connection.schema_name,
+            result=result,
+        ).inc(len(delivered))
+    return sent, failed
+
+
+def _schedule_retry(stream: Stream, failed: list[StreamEvent], attempt: int):
+    """Retry failed events with exponential backoff, up to
+    `providers.ssf.delivery.max_retries` times"""
+    if not failed or attempt >= CONFIG.get_int("providers.ssf.delivery.max_retries", 5):
+        return
+    backoff = min(
+        CONFIG.get_int("providers.ssf.delivery.retry_backoff_seconds", 10) * 2**attempt,
+        RETRY_BACKOFF_MAX_SECONDS,
+    )
+    ssf_stream_deliver.send_with_options(
+        args=(str(stream.pk),),
+        kwargs={
+            "event_uuids": [str(event.pk) for event in failed],
+            "attempt": attempt + 1,
+        },
+        delay=backoff * 1000,
+        rel_obj=stream.provider,
+        uid=str(stream.pk),
+    )
+
+
+@actor(description=_("Deliver SSF events of a stream."))
+def ssf_stream_deliver(stream_uuid: str, event_uuids: list[str] | None = None, attempt: int = 0):
+    """Deliver all new events of a stream in batches, or retry delivery of
+    the failed events `event_uuids`"""
     self = CurrentTask.get_task()
 
-    stream = Stream.objects.filter(pk=stream_uuid).first()
+    stream = (
+        Stream.objects.filter(pk=stream_uuid)
+        .select_related("provider", "provider__backchannel_application")
+        .first()
+    )
     if not stream:
         return
-    if not _check_app_access(stream, event_data):
-        return
-    event = StreamEvent.objects.create(**event_data)
-    self.set_uid(event.pk)
-    if event.status == SSFEventStatus.SENT:
-        return
-    if stream.delivery_method != DeliveryMethods.RISC_PUSH:
-        return
-
-    try:
-        response = session.post(
-            event.stream.endpoint_url,
-            data=event.stream.encode(event.payload),
-            headers={"Content-Type": "application/secevent+jwt", "Accept": "application/json"},
-        )
-        response.raise_for_status()
-        event.status = SSFEventStatus.SENT
-        event.save()
+    if event_uuids is not None:
+        events = _claim_events(stream, event_uuids)
+        sent, failed = _deliver(self, stream, events)
+        self.info(f"Retried {len(events)} events, {len(sent)} sent", attempt=attempt)
+        _schedule_retry(stream, failed, attempt)
         return
-    except RequestException as exc:
-        LOGGER.warning("Failed to send SSF event", exc=exc)
-        attrs = {}
-        if exc.response:
-            attrs["response"] = {
-                "content": exc.response.text,
-                "status": exc.response.status_code,
-            }
-        self.warning(exc)
-        self.warning("Failed to send request", **attrs)
-        # Re-up the expiry of the stream event
-        event.expires = now() + timedelta_from_string(event.stream.provider.event_retention)
-        event.status = SSFEventStatus.PENDING_FAILED
-        event.save()
+    # Allow further deliveries to be scheduled, as events created from now on
+    # might not be picked up by this delivery
+    cache.delete(CACHE_KEY_STREAM_DELIVERY_PENDING % stream.pk.hex)
+    access = AccessEvaluator()
+    total_sent, total_failed = 0, 0
+    while events := _claim_events(stream):
+        allowed, denied = [], []
+        for event in events:
+            (allowed if access.passing(stream, event.payload) else denied).append(event)
+        if denied:
+            StreamEvent.objects.filter(pk__in=[event.pk for event in denied]).delete()
+            COUNTER_SSF_EVENTS_DELIVERED.labels(
+                tenant=connection.schema_name,
+                result="denied",
+            ).inc(len(denied))
+        sent, failed = _deliver(self, stream, allowed)
+        _schedule_retry(stream, failed, attempt)
+        total_sent += len(sent)
+        total_failed += len(failed)
+    self.info(f"Sent {total_sent} events, {total_failed} failed")
@@ -1,6 +1,10 @@
+from datetime import timedelta
+from unittest.mock import patch
 from uuid import uuid4
 
 from django.urls import reverse
+from django.utils.timezone import now
+from requests_mock import Mocker
 from rest_framework.test import APITestCase
 
 from authentik.core.models import Application, Group
@@ -15,7 +19,9 @@ from authentik.enterprise.providers.ssf.models import (
     Stream,
     StreamEvent,
 )
+from authentik.enterprise.providers.ssf.tasks import ssf_stream_deliver
 from authentik.lib.generators import generate_id
+from authentik.policies.engine import PolicyEngine
 from authentik.policies.models import PolicyBinding
 from authentik.stages.authenticator_webauthn.models import WebAuthnDevice
 
@@ -166,3 +172,70 @@ class TestSignals(APITestCase):
             stream=stream, type=EventTypes.CAEP_CREDENTIAL_CHANGE
         ).first()
         self.assertIsNone(event)
+
+    def test_delivery_batch(self):
+        """Test pending events of a stream being delivered together, with a single
+        access check per user"""
+        user = create_test_user()
+        stream = Stream.objects.filter(provider=self.provider).first()
+        StreamEvent.objects.bulk_create(
+            [
+                StreamEvent(
+                    **stream.prepare_event_payload(
+                        EventTypes.CAEP_CREDENTIAL_CHANGE,
+                        {"change_type": "update"},
+                        sub_id={
+                            "format": "complex",
+                            "user": {"format": "email", "email": user.email},
+                        },
+                    )
+                )
+                for _ in range(3)
+            ]
+        )
+        with (
+            Mocker() as mocker,
+            patch(
+                "authentik.enterprise.providers.ssf.tasks.PolicyEngine", wraps=PolicyEngine
+            ) as engine,
+        ):
+            mocker.post(stream.endpoint_url, status_code=202)
+            ssf_stream_deliver.send(str(stream.pk))
+            self.assertEqual(mocker.call_count, 3)
+            self.assertEqual(engine.call_count, 1)
+            for request in mocker.request_history:
+                self.assertEqual(request.headers["Content-Type"], "application/secevent+jwt")
+        self.assertEqual(
+            StreamEvent.objects.filter(
+                stream=stream, type=EventTypes.CAEP_CREDENTIAL_CHANGE, status=SSFEventStatus.SENT
+            ).count(),
+            3,
+        )
+
+    def test_delivery_reclaim(self):
+        """Test events claimed by a delivery that didn't finish being delivered again"""
+        stream = Stream.objects.filter(provider=self.provider).first()
+        stale, claimed = StreamEvent.objects.bulk_create(
+            [
+                StreamEvent(
+                    **stream.prepare_event_payload(
+                        EventTypes.CAEP_CREDENTIAL_CHANGE, {"change_type": "update"}
+                    )
+                )
+                for _ in range(2)
+            ]
+        )
+        StreamEvent.objects.filter(pk=stale.pk).update(
+            status=SSFEventStatus.SENDING, last_updated=now() - timedelta(days=1)
+        )
+        StreamEvent.objects.filter(pk=claimed.pk).update(
+            status=SSFEventStatus.SENDING, last_updated=now()
+        )
+        with Mocker() as mocker:
+            mocker.post(stream.endpoint_url, status_code=202)
+            ssf_stream_deliver.send(str(stream.pk))
+            self.assertEqual(mocker.call_count, 1)
+        stale.refresh_from_db()
+        claimed.refresh_from_db()
+        self.assertEqual(stale.status, SSFEventStatus.SENT)
+        self.assertEqual(claimed.status, SSFEventStatus.SENDING)
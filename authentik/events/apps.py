@@ -1,6 +1,6 @@
 """authentik events app"""
 
-from prometheus_client import Gauge, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 from authentik.blueprints.apps import ManagedAppConfig
 from authentik.lib.config import CONFIG, ENV_PREFIX
@@ -25,6 +25,19 @@ SYSTEM_TASK_STATUS = Gauge(
     ["tenant", "task_name", "task_uid", "status"],
 )
 
+GAUGE_EVENTS_BUFFER_SIZE = Gauge(
+    "authentik_events_buffer_size",
+    "Events queued in-process waiting to be written",
+)
+HIST_EVENTS_BUFFER_FLUSH = Histogram(
+    "authentik_events_buffer_flush_seconds",
+    "Duration of writing a batch of buffered events",
+)
+COUNTER_EVENTS_BUFFER_OVERFLOW = Counter(
+    "authentik_events_buffer_overflow",
+    "Events written synchronously as the event buffer was full",
+)
+
 
 class AuthentikEventsConfig(ManagedAppConfig):
     """authentik events app"""
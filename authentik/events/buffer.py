@@ -0,0 +1,220 @@
+"""Buffered, batched event writer"""
+
+from atexit import register
+from queue import Empty, Full, Queue
+from threading import Lock, Thread
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from django.db import DatabaseError, close_old_connections, connection
+from django_tenants.utils import schema_context
+from structlog.stdlib import get_logger
+
+from authentik.events.apps import (
+    COUNTER_EVENTS_BUFFER_OVERFLOW,
+    GAUGE_EVENTS_BUFFER_SIZE,
+    HIST_EVENTS_BUFFER_FLUSH,
+)
+from authentik.lib.config import CONFIG
+
+if TYPE_CHECKING:
+    from authentik.events.models import Event
+
+LOGGER = get_logger()
+# Seconds the actions notification rules match are cached for, rule changes made in other
+# processes apply to this process after at most this long
+NOTIFICATION_ACTIONS_TIMEOUT = 10
+
+
+def notification_actions() -> set[str] | None:
+    """Actions of events that may trigger a notification rule, or `None` when events of any
+    action may trigger a notification rule"""
+    from authentik.events.models import NotificationRule
+    from authentik.policies.event_matcher.models import EventMatcherPolicy
+    from authentik.policies.models import PolicyBinding
+
+    policy_pks = set()
+    for binding in PolicyBinding.objects.filter(
+        target__in=NotificationRule.objects.values_list("pbm_uuid", flat=True),
+        enabled=True,
+    ).only("policy", "negate"):
+        # Group and user bindings, and negated bindings, can match events of any action
+        if not binding.policy_id or binding.negate:
+            return None
+        policy_pks.add(binding.policy_id)
+    matched = dict(EventMatcherPolicy.objects.filter(pk__in=policy_pks).values_list("pk", "action"))
+    actions = set()
+    for policy_pk in policy_pks:
+        # Policies other than event matchers, and event matchers without an action,
+        # can match events of any action
+        if not matched.get(policy_pk):
+            return None
+        actions.add(matched[policy_pk])
+    return actions
+
+
+def write_events(events: list["Event"]):
+    """Insert `events` with a single query, and dispatch notification rules for them
+    (which would otherwise happen in `post_save`)"""
+    from authentik.events.models import Event
+    from authentik.events.tasks import event_trigger_dispatch
+
+    if not events:
+        return
+    try:
+        events = Event.objects.bulk_create(events)
+    except DatabaseError as exc:
+        LOGGER.warning("Failed to bulk insert events, saving individually", exc=exc)
+        for event in events:
+            try:
+                event.save()
+            except DatabaseError as inner_exc:
+                LOGGER.warning("Failed to save event", exc=inner_exc, event=event)
+        # `post_save` already dispatched notification rules
+        return
+    for event in events:
+        LOGGER.info(
+            "Created Event",
+            action=event.action,
+            context=event.context,
+            client_ip=event.client_ip,
+            user=event.user,
+        )
+        event_trigger_dispatch.send(event.event_uuid)
+
+
+class BufferedEventWriter:
+    """Queue events in-process and insert them in batches from a background thread.
+
+    Disabled by default (`events.buffer.enabled`), in which case events are saved directly.
+    Events with an action in `immediate_actions`, and events which may trigger a notification
+    rule, are always saved directly, so that they aren't lost when the process exits before
+    they're inserted. All events are saved directly when the queue is full. `post_save` is
+    not sent for buffered events, notification rules are instead dispatched for each event
+    once its batch has been inserted."""
+
+    def __init__(self):
+        self.enabled = CONFIG.get_bool("events.buffer.enabled", False)
+        self.batch_size = CONFIG.get_int("events.buffer.batch_size", 500)
+        self.flush_interval = float(CONFIG.get("events.buffer.flush_interval", 1.0))
+        self._queue: Queue[tuple[str, Event]] = Queue(
+            maxsize=CONFIG.get_int("events.buffer.max_size", 10_000)
+        )
+        self._thread: Thread | None = None
+        self._lock = Lock()
+        self._flush_lock = Lock()
+        self._notification_actions: dict[str, tuple[float, set[str] | None]] = {}
+
+    @property
+    def immediate_actions(self) -> set[str]:
+        """Actions which are rare and commonly used by notification rules, and are
+        therefore never buffered"""
+        from authentik.events.models import EventAction
+
+        return {
+            EventAction.CONFIGURATION_ERROR,
+            EventAction.POLICY_EXCEPTION,
+            EventAction.PROPERTY_MAPPING_EXCEPTION,
+            EventAction.SYSTEM_EXCEPTION,
+            EventAction.SYSTEM_TASK_EXCEPTION,
+            EventAction.SUSPICIOUS_REQUEST,
+            EventAction.UPDATE_AVAILABLE,
+        }
+
+    def may_notify(self, action: str) -> bool:
+        """Check if events with `action` may trigger a notification rule of the current
+        tenant"""
+        schema_name = connection.schema_name
+        with self._lock:
+            entry = self._notification_actions.get(schema_name)
+        if not entry or entry[0] <= monotonic():
+            entry = (monotonic() + NOTIFICATION_ACTIONS_TIMEOUT, notification_actions())
+            with self._lock:
+                self._notification_actions[schema_name] = entry
+        return entry[1] is None or action in entry[1]
+
+    def invalidate_notification_actions(self):
+        """Remove the cached notification rule actions of the current tenant"""
+        with self._lock:
+            self._notification_actions.pop(connection.schema_name, None)
+
+    def write(self, event: "Event"):
+        """Save or enqueue `event`"""
+        if (
+            not self.enabled
+            or event.action in self.immediate_actions
+            or self.may_notify(event.action)
+        ):
+            event.save()
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((connection.schema_name, event))
+        except Full:
+            # Backpressure: write the event in the calling thread
+            COUNTER_EVENTS_BUFFER_OVERFLOW.inc()
+            event.save()
+            return
+        GAUGE_EVENTS_BUFFER_SIZE.set(self._queue.qsize())
+
+    def write_many(self, events: list["Event"]):
+        """Save or enqueue multiple events, when the writer is disabled events are
+        inserted in a single batch"""
+        if not self.enabled:
+            write_events(events)
+            return
+        for event in events:
+            self.write(event)
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = Thread(target=self._run, name="authentik-event-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self.flush(block=True)
+
+    def _take(self, block: bool) -> list[tuple[str, "Event"]]:
+        batch = []
+        deadline = monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def flush(self, block=False):
+        """Insert all queued events. When `block` is set, wait up to the flush interval
+        for events to batch together"""
+        with self._flush_lock:
+            batch = self._take(block)
+            GAUGE_EVENTS_BUFFER_SIZE.set(self._queue.qsize())
+            if not batch:
+                return
+            by_schema: dict[str, list[Event]] = {}
+            for schema_name, event in batch:
+                by_schema.setdefault(schema_name, []).append(event)
+            with HIST_EVENTS_BUFFER_FLUSH.time():
+                for schema_name, events in by_schema.items():
+                    with schema_context(schema_name):
+                        write_events(events)
+            close_old_connections()
+
+
+EVENT_WRITER = BufferedEventWriter()
+
+
+@register
+def _flush_on_exit():
+    while not EVENT_WRITER._queue.empty():
+        EVENT_WRITER.flush()
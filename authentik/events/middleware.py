@@ -17,6 +17,7 @@ from structlog.stdlib import BoundLogger, get_logger
 
 from authentik.blueprints.v1.importer import excluded_models
 from authentik.core.models import Group, User
+from authentik.events.buffer import EVENT_WRITER
 from authentik.events.models import Event, EventAction, Notification
 from authentik.events.utils import model_to_dict
 from authentik.lib.models import InternallyManagedMixin
@@ -37,6 +38,7 @@ IGNORED_MODELS = tuple(
 _CTX_OVERWRITE_USER = ContextVar[User | None]("authentik_events_log_overwrite_user", default=None)
 _CTX_IGNORE = ContextVar[bool]("authentik_events_log_ignore", default=False)
 _CTX_REQUEST = ContextVar[HttpRequest | None]("authentik_events_log_request", default=None)
+_CTX_BUFFER = ContextVar["AuditBuffer | None"]("authentik_events_log_buffer", default=None)
 
 
 def should_log_model(model: Model) -> bool:
@@ -92,6 +94,41 @@ class EventNewThread(Thread):
         Event.new(self.action, **self.kwargs).from_http(self.request, user=self.user)
 
 
+class AuditBuffer:
+    """Collect audit events of a request, to write them in a single batch once
+    the response has been computed. Repeated updates of the same object by the same user
+    are collapsed into the first event of that object."""
+
+    events: list[Event]
+
+    def __init__(self):
+        self.events = []
+        self._by_object: dict[tuple, Event] = {}
+
+    def add(self, event: Event, object_key: tuple | None = None, collapse: bool = False):
+        """Add `event`, if `collapse` is set and there's already an event for `object_key`,
+        the existing event is updated instead"""
+        existing = self._by_object.get(object_key) if object_key else None
+        if collapse and existing:
+            existing.context["model"] = event.context["model"]
+            if "diff" in event.context:
+                diff = existing.context.setdefault("diff", {})
+                for key, change in event.context["diff"].items():
+                    if key in diff:
+                        diff[key]["new_value"] = change["new_value"]
+                    else:
+                        diff[key] = change
+            return
+        self.events.append(event)
+        if object_key:
+            self._by_object[object_key] = event
+
+    def flush(self):
+        """Write all collected events"""
+        events, self.events, self._by_object = self.events, [], {}
+        EVENT_WRITER.write_many(events)
+
+
 class AuditMiddleware:
     """Register handlers for duration of request-response that log creation/update/deletion
     of models"""
@@ -151,15 +188,36 @@ class AuditMiddleware:
         m2m_changed.disconnect(dispatch_uid=request.request_id)
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
+        buffer = AuditBuffer()
         _CTX_REQUEST.set(request)
+        _CTX_BUFFER.set(buffer)
         self.connect(request)
 
         response = self.get_response(request)
 
         self.disconnect(request)
+        _CTX_BUFFER.set(None)
         _CTX_REQUEST.set(None)
+        buffer.flush()
         return response
 
+    def record(
+        self,
+        request: HttpRequest,
+        action: str,
+        user: User,
+        object_key: tuple | None = None,
+        collapse: bool = False,
+        **kwargs,
+    ):
+        """Add an audit event to the current request's buffer"""
+        event = Event.new(action, **kwargs).with_http(request, user=user)
+        buffer = _CTX_BUFFER.get()
+        if buffer is None:  # pragma: no cover
+            EVENT_WRITER.write(event)
+            return
+        buffer.add(event, object_key, collapse)
+
     def process_exception(self, request: HttpRequest, exception: Exception):
         """Disconnect handlers in case of exception"""
         self.disconnect(request)
@@ -204,9 +262,15 @@ class AuditMiddleware:
         user = self.get_user(request)
 
         action = EventAction.MODEL_CREATED if created else EventAction.MODEL_UPDATED
-        thread = EventNewThread(action, request, user=user, model=model_to_dict(instance))
-        thread.kwargs.update(thread_kwargs or {})
-        thread.run()
+        self.record(
+            request,
+            action,
+            user,
+            object_key=(instance._meta.label, str(instance.pk), user.pk),
+            collapse=not created,
+            model=model_to_dict(instance),
+            **(thread_kwargs or {}),
+        )
 
     def pre_delete_handler(self, request: HttpRequest, sender, instance: Model, **_):
         """Signal handler for all object's pre_delete"""
@@ -219,12 +283,12 @@ class AuditMiddleware:
             return
         user = self.get_user(request)
 
-        EventNewThread(
-            EventAction.MODEL_DELETED,
+        self.record(
             request,
-            user=user,
+            EventAction.MODEL_DELETED,
+            user,
             model=model_to_dict(instance),
-        ).run()
+        )
 
     def m2m_changed_handler(
         self,
@@ -247,10 +311,10 @@ class AuditMiddleware:
             return
         user = self.get_user(request)
 
-        EventNewThread(
-            EventAction.MODEL_UPDATED,
+        self.record(
             request,
-            user=user,
+            EventAction.MODEL_UPDATED,
+            user,
             model=model_to_dict(instance),
             **thread_kwargs,
-        ).run()
+        )
@@ -3,8 +3,8 @@
 from collections.abc import Generator
 from datetime import timedelta
 from difflib import get_close_matches
-from functools import lru_cache
-from inspect import currentframe
+from functools import cache, lru_cache
+from sys import _getframe
 from typing import Any
 from uuid import uuid4
 
@@ -28,6 +28,7 @@ from authentik.core.middleware import (
     SESSION_KEY_IMPERSONATE_USER,
 )
 from authentik.core.models import ExpiringModel, Group, PropertyMapping, User
+from authentik.events.buffer import EVENT_WRITER
 from authentik.events.context_processors.base import get_context_processors
 from authentik.events.utils import (
     cleanse_dict,
@@ -76,6 +77,17 @@ def django_app_names() -> list[str]:
     return [x.name for x in apps.app_configs.values()]
 
 
+@cache
+def django_app_for_module(module: str) -> str:
+    """Attempt to match a module to the django app it belongs to, if we can't find a match,
+    keep the module name. Cached as the number of modules creating events is small."""
+    django_apps: list[str] = get_close_matches(module, django_app_names(), n=1)
+    # Also ensure that closest django app has the correct prefix
+    if len(django_apps) > 0 and django_apps[0].startswith(module):
+        return django_apps[0]
+    return module
+
+
 class NotificationTransportError(SentryIgnoredException):
     """Error raised when a notification fails to be delivered"""
 
@@ -134,7 +146,8 @@ class Event(SerializerModel, ExpiringModel):
     app = models.TextField()
     context = models.JSONField(default=dict, blank=True)
     client_ip = models.GenericIPAddressField(null=True)
-    created = models.DateTimeField(auto_now_add=True)
+    # Set when the event is created, not when it's saved, as events can be written in batches
+    created = models.DateTimeField(default=now, editable=False, blank=True)
     brand = models.JSONField(default=default_brand, blank=True)
 
     # Shadow the expires attribute from ExpiringModel to override the default duration
@@ -156,15 +169,7 @@ class Event(SerializerModel, ExpiringModel):
         if not isinstance(action, EventAction):
             action = EventAction.CUSTOM_PREFIX + action
         if not app:
-            current = currentframe()
-            parent = current.f_back
-            app = parent.f_globals["__name__"]
-            # Attempt to match the calling module to the django app it belongs to
-            # if we can't find a match, keep the module name
-            django_apps: list[str] = get_close_matches(app, django_app_names(), n=1)
-            # Also ensure that closest django app has the correct prefix
-            if len(django_apps) > 0 and django_apps[0].startswith(app):
-                app = django_apps[0]
+            app = django_app_for_module(_getframe(1).f_globals["__name__"])
         cleaned_kwargs = cleanse_dict(sanitize_dict(kwargs))
         event = Event(action=action, app=app, context=cleaned_kwargs)
         return event
@@ -183,7 +188,14 @@ class Event(SerializerModel, ExpiringModel):
 
     def from_http(self, request: HttpRequest, user: User | None = None) -> "Event":
         """Add data from a Django-HttpRequest, allowing the creation of
-        Events independently from requests.
+        Events independently from requests, and save the event.
+        `user` arguments optionally overrides user from requests."""
+        self.with_http(request, user)
+        EVENT_WRITER.write(self)
+        return self
+
+    def with_http(self, request: HttpRequest, user: User | None = None) -> "Event":
+        """Add data from a Django-HttpRequest without saving the event.
         `user` arguments optionally overrides user from requests."""
         if request:
             from authentik.flows.views.executor import QS_QUERY
@@ -203,7 +215,10 @@ class Event(SerializerModel, ExpiringModel):
                 self.context["http_request"]["args"] = cleanse_dict(QueryDict(wrapped))
         if hasattr(request, "brand"):
             brand: Brand = request.brand
-            self.brand = sanitize_dict(model_to_dict(brand))
+            # The brand is the same for all events of a request
+            if not hasattr(brand, "_event_dict"):
+                brand._event_dict = sanitize_dict(model_to_dict(brand))
+            self.brand = brand._event_dict
         if hasattr(request, "user"):
             self.user = get_user(request.user)
         if user:
@@ -239,7 +254,6 @@ class Event(SerializerModel, ExpiringModel):
         # If there's no app set, we get it from the requests too
         if not self.app:
             self.app = Event._get_app_from_request(request)
-        self.save()
         return self
 
     def save(self, *args, **kwargs):
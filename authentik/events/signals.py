@@ -5,14 +5,15 @@ from typing import Any
 
 from django.conf import settings
 from django.contrib.auth.signals import user_logged_in, user_logged_out
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.http import HttpRequest
 from rest_framework.request import Request
 
 from authentik.core.models import AuthenticatedSession, User
 from authentik.core.signals import login_failed, password_changed
-from authentik.events.models import Event, EventAction
+from authentik.events.buffer import EVENT_WRITER
+from authentik.events.models import Event, EventAction, NotificationRule
 from authentik.flows.models import Stage
 from authentik.flows.planner import (
     PLAN_CONTEXT_DEVICE,
@@ -21,6 +22,8 @@ from authentik.flows.planner import (
     FlowPlan,
 )
 from authentik.flows.views.executor import SESSION_KEY_PLAN
+from authentik.policies.event_matcher.models import EventMatcherPolicy
+from authentik.policies.models import PolicyBinding
 from authentik.stages.invitation.models import Invitation
 from authentik.stages.invitation.signals import invitation_used
 from authentik.stages.password.stage import PLAN_CONTEXT_METHOD, PLAN_CONTEXT_METHOD_ARGS
@@ -124,6 +127,17 @@ def event_post_save_notification(sender, instance: Event, **_):
     event_trigger_dispatch.send(instance.event_uuid)
 
 
+@receiver(post_save, sender=NotificationRule)
+@receiver(post_delete, sender=NotificationRule)
+@receiver(post_save, sender=PolicyBinding)
+@receiver(post_delete, sender=PolicyBinding)
+@receiver(post_save, sender=EventMatcherPolicy)
+@receiver(post_delete, sender=EventMatcherPolicy)
+def event_writer_invalidate_notification_actions(sender, **_):
+    """Re-check which events may trigger notification rules when rules change"""
+    EVENT_WRITER.invalidate_notification_actions()
+
+
 @receiver(pre_delete, sender=User)
 def event_user_pre_delete_cleanup(sender, instance: User, **_):
     """If gdpr_compliance is enabled, remove all the user's events"""
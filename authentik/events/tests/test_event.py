@@ -1,5 +1,6 @@
 """event tests"""
 
+from unittest.mock import MagicMock, patch
 from urllib.parse import urlencode
 
 from django.contrib.contenttypes.models import ContentType
@@ -10,11 +11,19 @@ from guardian.shortcuts import get_anonymous_user
 from authentik.brands.models import Brand
 from authentik.core.models import Group, User
 from authentik.core.tests.utils import create_test_user
-from authentik.events.models import Event
+from authentik.events.buffer import BufferedEventWriter
+from authentik.events.models import (
+    Event,
+    EventAction,
+    NotificationRule,
+    django_app_for_module,
+)
 from authentik.flows.planner import PLAN_CONTEXT_PENDING_USER, FlowPlan
 from authentik.flows.views.executor import QS_QUERY, SESSION_KEY_PLAN
 from authentik.lib.generators import generate_id
 from authentik.policies.dummy.models import DummyPolicy
+from authentik.policies.event_matcher.models import EventMatcherPolicy
+from authentik.policies.models import PolicyBinding
 
 
 class TestEvents(TestCase):
@@ -207,3 +216,55 @@ class TestEvents(TestCase):
                 "username": user.username,
             },
         )
+
+    def test_app_for_module(self):
+        """Test matching modules to django apps"""
+        self.assertEqual(django_app_for_module("authentik.core"), "authentik.core")
+        self.assertEqual(django_app_for_module("foo.bar"), "foo.bar")
+        self.assertEqual(Event.new("unittest").app, "authentik.events.tests.test_event")
+
+    def test_buffered_writer(self):
+        """Test buffered event writer"""
+        writer = BufferedEventWriter()
+        writer.enabled = True
+        dispatch = MagicMock()
+        with (
+            patch.object(writer, "_ensure_thread"),
+            patch("authentik.events.tasks.event_trigger_dispatch.send", dispatch),
+        ):
+            event = Event.new("unittest")
+            writer.write(event)
+            self.assertFalse(Event.objects.filter(pk=event.pk).exists())
+            writer.flush()
+        self.assertTrue(Event.objects.filter(pk=event.pk).exists())
+        dispatch.assert_called_once_with(event.event_uuid)
+
+    def test_buffered_writer_notification_rule(self):
+        """Test buffered event writer with an action that may trigger a notification rule"""
+        rule = NotificationRule.objects.create(name=generate_id())
+        policy = EventMatcherPolicy.objects.create(
+            name=generate_id(), action=EventAction.LOGIN_FAILED
+        )
+        PolicyBinding.objects.create(target=rule, policy=policy, order=0)
+        writer = BufferedEventWriter()
+        writer.enabled = True
+        self.assertTrue(writer.may_notify(EventAction.LOGIN_FAILED))
+        self.assertFalse(writer.may_notify(EventAction.LOGIN))
+        with patch.object(writer, "_ensure_thread"):
+            event = Event.new(EventAction.LOGIN_FAILED)
+            writer.write(event)
+        self.assertTrue(Event.objects.filter(pk=event.pk).exists())
+        # A matcher without an action matches events of all actions
+        policy.action = None
+        policy.save()
+        writer.invalidate_notification_actions()
+        self.assertTrue(writer.may_notify(EventAction.LOGIN))
+
+    def test_buffered_writer_immediate(self):
+        """Test buffered event writer with an action that is never buffered"""
+        writer = BufferedEventWriter()
+        writer.enabled = True
+        with patch.object(writer, "_ensure_thread"):
+            event = Event.new(EventAction.CONFIGURATION_ERROR)
+            writer.write(event)
+        self.assertTrue(Event.objects.filter(pk=event.pk).exists())
@@ -5,8 +5,9 @@ from rest_framework.test import APITestCase
 
 from authentik.core.models import Application, Token, TokenIntents
 from authentik.core.tests.utils import create_test_admin_user
-from authentik.events.middleware import audit_ignore, audit_overwrite_user
+from authentik.events.middleware import AuditBuffer, audit_ignore, audit_overwrite_user
 from authentik.events.models import Event, EventAction
+from authentik.events.utils import model_to_dict
 from authentik.lib.generators import generate_id
 
 
@@ -114,3 +115,48 @@ class TestEventsMiddleware(APITestCase):
                 "username": self.user.username,
             },
         )
+
+    def test_buffer_collapse(self):
+        """Test repeated updates to the same object are collapsed"""
+        buffer = AuditBuffer()
+        app = Application.objects.create(name=generate_id(), slug=generate_id())
+        key = (app._meta.label, str(app.pk), self.user.pk)
+        buffer.add(
+            Event.new(
+                EventAction.MODEL_CREATED,
+                model=model_to_dict(app),
+                diff={"name": {"previous_value": None, "new_value": "foo"}},
+            ),
+            key,
+        )
+        app.name = generate_id()
+        buffer.add(
+            Event.new(
+                EventAction.MODEL_UPDATED,
+                model=model_to_dict(app),
+                diff={"name": {"previous_value": "foo", "new_value": app.name}},
+            ),
+            key,
+            collapse=True,
+        )
+        buffer.add(Event.new(EventAction.MODEL_DELETED, model=model_to_dict(app)))
+        self.assertEqual(len(buffer.events), 2)
+        buffer.flush()
+        created = Event.objects.get(action=EventAction.MODEL_CREATED)
+        self.assertEqual(created.context["model"]["name"], app.name)
+        self.assertEqual(
+            created.context["diff"], {"name": {"previous_value": None, "new_value": app.name}}
+        )
+        self.assertTrue(Event.objects.filter(action=EventAction.MODEL_DELETED).exists())
+        self.assertFalse(Event.objects.filter(action=EventAction.MODEL_UPDATED).exists())
+
+    def test_buffer_created(self):
+        """Test buffered events keep the time they were recorded at"""
+        buffer = AuditBuffer()
+        app = Application.objects.create(name=generate_id(), slug=generate_id())
+        buffer.add(Event.new(EventAction.MODEL_CREATED, model=model_to_dict(app)))
+        Event.new(EventAction.LOGIN).save()
+        buffer.flush()
+        created = Event.objects.get(action=EventAction.MODEL_CREATED)
+        login = Event.objects.get(action=EventAction.LOGIN)
+        self.assertLess(created.created, login.created)
@@ -1,9 +1,10 @@
 """Avatar utils"""
 
 from base64 import b64encode
+from collections.abc import Iterable
 from functools import cache as funccache
 from hashlib import md5, sha256
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 from urllib.parse import urlencode, urlparse
 
 from django.core.cache import cache
@@ -23,6 +24,7 @@ if TYPE_CHECKING:
 GRAVATAR_URL = "https://www.gravatar.com"
 DEFAULT_AVATAR = static("dist/assets/images/user_default.png")
 AVATAR_STATUS_TTL_SECONDS = 60 * 60 * 8  # 8 Hours
+AVATAR_CHECK_PENDING_TTL_SECONDS = 60
 
 SVG_XML_NS = "http://www.w3.org/2000/svg"
 SVG_NS_MAP = {None: SVG_XML_NS}
@@ -51,11 +53,7 @@ def avatar_mode_attribute(user: "User", mode: str) -> str | None:
 def avatar_mode_gravatar(user: "User", mode: str) -> str | None:
     """Gravatar avatars"""
 
-    mail_hash = sha256(user.email.lower().encode("utf-8")).hexdigest()  # nosec
-    parameters = {"size": "158", "rating": "g", "default": "404"}
-    gravatar_url = f"{GRAVATAR_URL}/avatar/{mail_hash}?{urlencode(parameters)}"
-
-    return avatar_mode_url(user, gravatar_url)
+    return avatar_mode_url(user, _avatar_url_mode(user, mode))
 
 
 def generate_colors(text: str) -> tuple[str, str]:
@@ -155,8 +153,9 @@ def avatar_mode_generated(user: "User", mode: str) -> str | None:
     return f"data:image/svg+xml;base64,{b64encode(svg.encode('utf-8')).decode('utf-8')}"
 
 
-def avatar_mode_url(user: "User", mode: str) -> str | None:
-    """Format url"""
+def avatar_url_cache_keys(user: "User", mode: str) -> tuple[str, str, str]:
+    """Format avatar URL `mode` for `user`, and get the cache keys for the availability
+    of the URL's hostname and the status of the URL itself"""
     mail_hash = md5(user.email.lower().encode("utf-8"), usedforsecurity=False).hexdigest()  # nosec
 
     formatted_url = mode % {
@@ -166,58 +165,146 @@ def avatar_mode_url(user: "User", mode: str) -> str | None:
     }
 
     hostname = urlparse(formatted_url).hostname
-    cache_key_hostname_available = f"goauthentik.io/lib/avatars/{hostname}/available"
-
-    if not cache.get(cache_key_hostname_available, True):
-        return None
-
-    cache_key_image_url = f"goauthentik.io/lib/avatars/{hostname}/{mail_hash}"
+    return (
+        formatted_url,
+        f"goauthentik.io/lib/avatars/{hostname}/available",
+        f"goauthentik.io/lib/avatars/{hostname}/{mail_hash}",
+    )
 
-    if cache.has_key(cache_key_image_url):
-        cache.touch(cache_key_image_url)
-        return cache.get(cache_key_image_url)
 
+def check_avatar_url(
+    url: str, cache_key_hostname_available: str, cache_key_image_url: str
+) -> tuple[str | None, dict[str, Any]]:
+    """Check if `url` is an image, returns the avatar (if any) and the cache
+    entries which should be set for the result"""
     try:
-        res = get_http_session().head(formatted_url, timeout=5, allow_redirects=True)
+        res = get_http_session().head(url, timeout=5, allow_redirects=True)
 
         if res.status_code == HttpResponseNotFound.status_code:
-            cache.set(cache_key_image_url, None, timeout=AVATAR_STATUS_TTL_SECONDS)
-            return None
+            return None, {cache_key_image_url: None}
         if not res.headers.get("Content-Type", "").startswith("image/"):
-            cache.set(cache_key_image_url, None, timeout=AVATAR_STATUS_TTL_SECONDS)
-            return None
+            return None, {cache_key_image_url: None}
         res.raise_for_status()
     except (Timeout, ConnectionError, HTTPError):
-        cache.set(cache_key_hostname_available, False, timeout=AVATAR_STATUS_TTL_SECONDS)
-        return None
+        return None, {cache_key_hostname_available: False}
     except RequestException:
-        return formatted_url
+        return url, {}
+    return url, {cache_key_image_url: url}
 
-    cache.set(cache_key_image_url, formatted_url, timeout=AVATAR_STATUS_TTL_SECONDS)
-    return formatted_url
 
+def avatar_mode_url(user: "User", mode: str) -> str | None:
+    """Format url"""
+    formatted_url, cache_key_hostname_available, cache_key_image_url = avatar_url_cache_keys(
+        user, mode
+    )
 
-def get_avatar(user: "User", request: HttpRequest | None = None) -> str:
-    """Get avatar with configured mode"""
+    cached = cache.get_many([cache_key_hostname_available, cache_key_image_url])
+    if not cached.get(cache_key_hostname_available, True):
+        return None
+    if cache_key_image_url in cached:
+        return cached[cache_key_image_url]
+
+    avatar, entries = check_avatar_url(
+        formatted_url, cache_key_hostname_available, cache_key_image_url
+    )
+    cache.set_many(entries, timeout=AVATAR_STATUS_TTL_SECONDS)
+    return avatar
+
+
+def _avatar_url_mode(user: "User", mode: str) -> str | None:
+    """Get the URL format of URL-based avatar modes, which need to be checked"""
+    if mode == "gravatar":
+        mail_hash = sha256(user.email.lower().encode("utf-8")).hexdigest()  # nosec
+        parameters = {"size": "158", "rating": "g", "default": "404"}
+        return f"{GRAVATAR_URL}/avatar/{mail_hash}?{urlencode(parameters)}"
+    if "://" in mode:
+        return mode
+    return None
+
+
+def _avatar_for_mode(user: "User", mode: str) -> str | None:
     mode_map = {
         "none": avatar_mode_none,
         "initials": avatar_mode_generated,
         "gravatar": avatar_mode_gravatar,
     }
+    if mode in mode_map:
+        return mode_map[mode](user, mode)
+    if mode.startswith("attributes."):
+        return avatar_mode_attribute(user, mode)
+    if "://" in mode:
+        return avatar_mode_url(user, mode)
+    return None
+
+
+def _avatar_modes(request: HttpRequest | None) -> str:
     tenant = None
     if request:
         tenant = request.tenant
     else:
         tenant = get_current_tenant()
-    modes: str = tenant.avatars
+    return tenant.avatars
+
+
+def get_avatar(user: "User", request: HttpRequest | None = None) -> str:
+    """Get avatar with configured mode"""
+    modes = _avatar_modes(request)
     for mode in modes.split(","):
-        avatar = None
-        if mode in mode_map:
-            avatar = mode_map[mode](user, mode)
-        elif mode.startswith("attributes."):
-            avatar = avatar_mode_attribute(user, mode)
-        elif "://" in mode:
-            avatar = avatar_mode_url(user, mode)
+        avatar = _avatar_for_mode(user, mode)
         if avatar:
             return avatar
     return avatar_mode_none(user, modes)
+
+
+def get_avatars(users: Iterable["User"], request: HttpRequest | None = None) -> dict[Any, str]:
+    """Get avatars for multiple users, keyed by the user's primary key.
+
+    The status of all URL-based avatars is fetched with a single cache lookup. URLs which
+    haven't been checked yet are checked in the background, and the next configured
+    mode is used until the result is available."""
+    from authentik.core.tasks import check_avatar_urls
+
+    modes = _avatar_modes(request)
+    users = list(users)
+    lookups: dict[tuple[Any, str], tuple[str, str, str]] = {}
+    for user in users:
+        for mode in modes.split(","):
+            if url_mode := _avatar_url_mode(user, mode):
+                lookups[(user.pk, mode)] = avatar_url_cache_keys(user, url_mode)
+    cache_keys = []
+    for _, cache_key_hostname_available, cache_key_image_url in lookups.values():
+        cache_keys.extend(
+            [
+                cache_key_hostname_available,
+                cache_key_image_url,
+                f"{cache_key_image_url}/pending",
+            ]
+        )
+    cached = cache.get_many(cache_keys) if cache_keys else {}
+
+    avatars = {}
+    pending: dict[str, tuple[str, str, str]] = {}
+    for user in users:
+        avatar = None
+        for mode in modes.split(","):
+            if (user.pk, mode) not in lookups:
+                avatar = _avatar_for_mode(user, mode)
+            else:
+                lookup = lookups[(user.pk, mode)]
+                _, cache_key_hostname_available, cache_key_image_url = lookup
+                if not cached.get(cache_key_hostname_available, True):
+                    continue
+                if cache_key_image_url in cached:
+                    avatar = cached[cache_key_image_url]
+                elif f"{cache_key_image_url}/pending" not in cached:
+                    pending[cache_key_image_url] = lookup
+            if avatar:
+                break
+        avatars[user.pk] = avatar or avatar_mode_none(user, modes)
+    if pending:
+        cache.set_many(
+            {f"{cache_key_image_url}/pending": True for cache_key_image_url in pending},
+            timeout=AVATAR_CHECK_PENDING_TTL_SECONDS,
+        )
+        check_avatar_urls.send(list(pending.values()))
+    return avatars
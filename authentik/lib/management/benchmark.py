@@ -0,0 +1,44 @@
+"""authentik benchmark command utils"""
+
+from django.db import transaction
+
+from authentik import authentik_version
+from authentik.tenants.management import TenantCommand
+
+UNIT_SCALE = {
+    "ms": 1000,
+    "us": 1000 * 1000,
+}
+
+
+class BenchmarkCommand(TenantCommand):
+    """Base command for benchmarks on a tenant. Objects created by the benchmark are
+    removed afterwards, and results are written with `output`."""
+
+    # Name of the benchmarked operations, for the rate written by `output`
+    operation = "Operations"
+    # Unit of the durations written by `output`, one of `UNIT_SCALE`
+    unit = "ms"
+
+    def handle_per_tenant(self, *args, **options):
+        self.stdout.write(f"Version: {authentik_version()}")
+        with transaction.atomic():
+            try:
+                self.handle_benchmark(**options)
+            finally:
+                transaction.set_rollback(True)
+
+    def handle_benchmark(self, **options):
+        """The actual benchmark."""
+        raise NotImplementedError(
+            "subclasses of BenchmarkCommand must provide a handle_benchmark() method"
+        )
+
+    def output(self, name: str, durations: list[float]):
+        """Write the rate, and the average and maximum of `durations` (in seconds)"""
+        total = sum(durations)
+        scale = UNIT_SCALE[self.unit]
+        self.stdout.write(f"{name}:")
+        self.stdout.write(f"\t{self.operation}/s: {len(durations) / total:.1f}")
+        self.stdout.write(f"\tAvg: {total / len(durations) * scale:.2f}{self.unit}")
+        self.stdout.write(f"\tMax: {max(durations) * scale:.2f}{self.unit}")
@@ -133,8 +133,8 @@ class OutgoingSyncConnectionCreateMixin:
         super().perform_create(serializer)
         try:
             instance = serializer.instance
-            client = instance.provider.client_for_model(instance.__class__)
-            client.update_single_attribute(instance)
+            with instance.provider.client_for_model(instance.__class__) as client:
+                client.update_single_attribute(instance)
             instance.save()
         except NotImplementedError:
             pass
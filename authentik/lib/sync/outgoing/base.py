@@ -1,7 +1,8 @@
 """Basic outgoing sync Client"""
 
+from collections.abc import Generator
 from enum import StrEnum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Self
 
 from deepmerge import always_merger
 from django.db import DatabaseError
@@ -9,11 +10,16 @@ from structlog.stdlib import get_logger
 
 from authentik.core.expression.exceptions import (
     PropertyMappingExpressionException,
+    SkipObjectException,
 )
 from authentik.events.models import Event, EventAction
 from authentik.lib.expression.exceptions import ControlFlowException
 from authentik.lib.sync.mapper import PropertyMappingManager
-from authentik.lib.sync.outgoing.exceptions import NotFoundSyncException, StopSync
+from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
+    NotFoundSyncException,
+    StopSync,
+)
 
 if TYPE_CHECKING:
     from django.db.models import Model
@@ -46,6 +52,8 @@ class BaseOutgoingSyncClient[
     mapper: PropertyMappingManager
 
     can_discover = False
+    # Objects are written in batches, using `batch_request`, `batch_send` and `batch_result`
+    can_batch = False
 
     def __init__(self, provider: TProvider):
         self.logger = get_logger().bind(provider=provider.name)
@@ -82,6 +90,112 @@ class BaseOutgoingSyncClient[
                 connection.delete()
         return None, False
 
+    def write_many(
+        self, objs: list[TModel]
+    ) -> Generator[tuple[TModel, BaseSyncException | SkipObjectException | None]]:
+        """Write multiple objects to destination, yielding each object with the sync exception
+        it raised (if any). Objects are sent in batches when the client supports it (see
+        `can_batch`), otherwise self.write is called for each object. Objects are written
+        lazily, so the caller can stop writing by not consuming the rest of the generator."""
+        if not self.can_batch or self.provider.dry_run or len(objs) <= 1:
+            yield from self._write_each(objs)
+            return
+        yield from self._write_batch(objs)
+
+    def _write_each(
+        self, objs: list[TModel]
+    ) -> Generator[tuple[TModel, BaseSyncException | SkipObjectException | None]]:
+        for obj in objs:
+            try:
+                self.write(obj)
+            except (BaseSyncException, SkipObjectException) as exc:
+                yield obj, exc
+                continue
+            yield obj, None
+
+    def _write_batch(
+        self, objs: list[TModel]
+    ) -> Generator[tuple[TModel, BaseSyncException | SkipObjectException | None]]:
+        connections = {
+            getattr(connection, f"{self.connection_type_query}_id"): connection
+            for connection in self.connection_type.objects.filter(
+                provider=self.provider, **{f"{self.connection_type_query}__in": objs}
+            )
+        }
+        requests = {}
+        pending: dict[str, tuple[TModel, TConnection | None]] = {}
+        for obj in objs:
+            connection = connections.get(obj.pk)
+            try:
+                request = self.batch_request(obj, connection)
+            except (BaseSyncException, SkipObjectException) as exc:
+                yield obj, exc
+                continue
+            if request is None:
+                yield from self._write_each([obj])
+                continue
+            requests[str(obj.pk)] = request
+            pending[str(obj.pk)] = (obj, connection)
+        if not requests:
+            return
+        try:
+            results = self.batch_send(requests)
+        except BaseSyncException as exc:
+            for obj, _ in pending.values():
+                yield obj, exc
+            return
+        if results is None:
+            yield from self._write_each([obj for obj, _ in pending.values()])
+            return
+        for request_id, (obj, connection) in pending.items():
+            try:
+                written = self.batch_result(
+                    obj, connection, requests[request_id], results.get(request_id)
+                )
+            except (BaseSyncException, SkipObjectException) as exc:
+                yield obj, exc
+                continue
+            except DatabaseError as exc:
+                # Same as `write`, the connection is re-created by the next sync
+                self.logger.warning("Failed to write object", obj=obj, exc=exc)
+                if connection:
+                    connection.delete()
+                yield obj, None
+                continue
+            if written is None:
+                # Objects which are missing in or already exist in the remote system
+                # are handled by `write`
+                yield from self._write_each([obj])
+                continue
+            yield obj, None
+
+    def batch_request(self, obj: TModel, connection: TConnection | None) -> Any | None:
+        """Build the request to create (when `connection` is None) or update `obj` as part of
+        a batch, or return None to write `obj` individually"""
+        raise NotImplementedError()
+
+    def batch_send(self, requests: dict[str, Any]) -> dict[str, Any] | None:
+        """Send the batched `requests` and return the result of each request by its ID, or
+        return None to write all objects individually"""
+        raise NotImplementedError()
+
+    def batch_result(
+        self, obj: TModel, connection: TConnection | None, request: Any, result: Any | None
+    ) -> TConnection | None:
+        """Save the connection of `obj` from the `result` of its batched `request` and return
+        it, or return None to write `obj` individually. Sync exceptions raised are reported
+        for `obj`."""
+        raise NotImplementedError()
+
+    def close(self):
+        """Release any resources (connections, etc) held by this client"""
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
     def delete(self, obj: TModel):
         """Delete object from destination"""
         raise NotImplementedError()
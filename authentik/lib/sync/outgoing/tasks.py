@@ -9,7 +9,7 @@ from structlog.stdlib import BoundLogger, get_logger
 from authentik.core.expression.exceptions import SkipObjectException
 from authentik.core.models import Group, User
 from authentik.events.utils import sanitize_item
-from authentik.lib.sync.outgoing.base import Direction
+from authentik.lib.sync.outgoing.base import BaseOutgoingSyncClient, Direction
 from authentik.lib.sync.outgoing.exceptions import (
     BadRequestSyncException,
     DryRunRejected,
@@ -144,19 +144,24 @@ class SyncTasks:
             provider.get_object_qs(_object_type).filter(**filter),
             provider.sync_page_size,
         )
-        if client.can_discover:
-            self.logger.debug("starting discover")
-            client.discover()
-        self.logger.debug("starting sync for page", page=page)
-        task.info(f"Syncing page {page} or {_object_type._meta.verbose_name_plural}")
-        for obj in paginator.page(page).object_list:
-            obj: Model
-            try:
-                client.write(obj)
-            except SkipObjectException:
+        try:
+            if client.can_discover:
+                self.logger.debug("starting discover")
+                client.discover()
+            self.logger.debug("starting sync for page", page=page)
+            task.info(f"Syncing page {page} or {_object_type._meta.verbose_name_plural}")
+            self._write_page(task, client, list(paginator.page(page).object_list))
+        finally:
+            client.close()
+
+    def _write_page(self, task: Task, client: BaseOutgoingSyncClient, objects: list[Model]):
+        for obj, exc in client.write_many(objects):
+            if exc is None:
+                continue
+            if isinstance(exc, SkipObjectException):
                 self.logger.debug("skipping object due to SkipObject", obj=obj)
                 continue
-            except DryRunRejected as exc:
+            if isinstance(exc, DryRunRejected):
                 task.info(
                     "Dropping mutating request due to dry run",
                     obj=sanitize_item(obj),
@@ -164,7 +169,7 @@ class SyncTasks:
                     url=exc.url,
                     body=exc.body,
                 )
-            except BadRequestSyncException as exc:
+            elif isinstance(exc, BadRequestSyncException):
                 self.logger.warning("failed to sync object", exc=exc, obj=obj)
                 task.warning(
                     f"Failed to sync {str(obj)} due to error: {str(exc)}",
@@ -172,20 +177,22 @@ class SyncTasks:
                     obj=sanitize_item(obj),
                     exception=exception_to_dict(exc),
                 )
-            except TransientSyncException as exc:
+            elif isinstance(exc, TransientSyncException):
                 self.logger.warning("failed to sync object", exc=exc, user=obj)
                 task.warning(
                     f"Failed to sync {str(obj)} due to transient error: {str(exc)}",
                     obj=sanitize_item(obj),
                     exception=exception_to_dict(exc),
                 )
-            except StopSync as exc:
+            elif isinstance(exc, StopSync):
                 self.logger.warning("Stopping sync", exc=exc)
                 task.warning(
                     f"Stopping sync due to error: {exc.detail()}",
                     obj=sanitize_item(obj),
                 )
                 break
+            else:
+                raise exc
 
     def sync_signal_direct_dispatch(
         self,
@@ -227,7 +234,6 @@ class SyncTasks:
             task.warning("No provider found. Is it assigned to an application?")
             return
         operation = Direction(raw_op)
-        client = provider.client_for_model(instance.__class__)
         # Check if the object is allowed within the provider's restrictions
         queryset = provider.get_object_qs(instance.__class__)
         if not queryset:
@@ -238,6 +244,7 @@ class SyncTasks:
         if not queryset.filter(pk=instance.pk).exists():
             return
 
+        client = provider.client_for_model(instance.__class__)
         try:
             if operation == Direction.add:
                 client.write(instance)
@@ -251,6 +258,8 @@ class SyncTasks:
             self.logger.info("Rejected dry-run event", exc=exc)
         except StopSync as exc:
             self.logger.warning("Stopping sync", exc=exc, provider_pk=provider.pk)
+        finally:
+            client.close()
 
     def sync_signal_m2m_dispatch(
         self,
@@ -324,3 +333,5 @@ class SyncTasks:
             self.logger.info("Rejected dry-run event", exc=exc)
         except StopSync as exc:
             self.logger.warning("Stopping sync", exc=exc, provider_pk=provider.pk)
+        finally:
+            client.close()
@@ -0,0 +1,97 @@
+"""authentik PostgreSQL notification utilities"""
+
+from threading import Lock, Thread
+from time import sleep
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connection, connections
+from psycopg import Error as PsycopgError
+from psycopg import sql
+from structlog.stdlib import get_logger
+
+LOGGER = get_logger()
+# Timeout in seconds of a single wait for notifications, after which the listen connection
+# is checked
+LISTEN_TIMEOUT = 30
+# Delay in seconds before reconnecting after the listen connection failed
+LISTEN_RECONNECT_DELAY = 5
+
+
+class NotifyListener:
+    """Per-process state which is invalidated in all processes with PostgreSQL's NOTIFY.
+
+    Each process listens for notifications on `channel` with a dedicated connection in a
+    background thread, calling `notified` with the payload of each notification. Whenever
+    notifications might have been missed (when the connection is established or lost, or
+    in a forked process), `reset` is called. State should only be used while `listening`."""
+
+    channel: str
+    thread_name: str
+
+    def __init__(self):
+        self._lock = Lock()
+        self._thread: Thread | None = None
+        self._listening = False
+
+    @property
+    def enabled(self) -> bool:
+        # Tests run in transactions which are rolled back, without signals being sent
+        return not settings.TEST
+
+    @property
+    def listening(self) -> bool:
+        """Check if notifications are received, starting the listener if required"""
+        if not self.enabled:
+            return False
+        self._ensure_thread()
+        return self._listening
+
+    def notified(self, payload: str):
+        """Called with the payload of each notification"""
+        raise NotImplementedError()
+
+    def reset(self):
+        """Called with the lock held when notifications might have been missed"""
+        raise NotImplementedError()
+
+    def send(self, payload: str):
+        """Send a notification to all processes, once the current transaction is
+        committed"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, payload])
+
+    def _ensure_thread(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            # State loaded by a parent process is not invalidated anymore
+            self._listening = False
+            self.reset()
+            self._thread = Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            conn = None
+            try:
+                conn = connections.create_connection(DEFAULT_DB_ALIAS)
+                conn.set_autocommit(True)
+                with conn.cursor() as cursor:
+                    cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                with self._lock:
+                    self.reset()
+                    self._listening = True
+                while True:
+                    for notify in conn.connection.notifies(timeout=LISTEN_TIMEOUT):
+                        self.notified(notify.payload)
+            except (DatabaseError, PsycopgError) as exc:
+                LOGGER.warning("Failed to listen for notifications", channel=self.channel, exc=exc)
+            finally:
+                with self._lock:
+                    self._listening = False
+                    self.reset()
+                if conn:
+                    conn.close()
+            sleep(LISTEN_RECONNECT_DELAY)
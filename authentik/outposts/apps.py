@@ -1,6 +1,6 @@
 """authentik outposts app config"""
 
-from prometheus_client import Gauge
+from prometheus_client import Counter, Gauge
 from structlog.stdlib import get_logger
 
 from authentik.blueprints.apps import ManagedAppConfig
@@ -20,6 +20,11 @@ GAUGE_OUTPOSTS_LAST_UPDATE = Gauge(
     "Last update from any outpost",
     ["tenant", "outpost", "uid", "version"],
 )
+COUNTER_OUTPOSTS_UPDATES = Counter(
+    "authentik_outposts_updates",
+    "Outpost updates requested, and whether they were sent or coalesced with a pending update",
+    ["tenant", "outpost", "result"],
+)
 MANAGED_OUTPOST = "goauthentik.io/outposts/embedded"
 MANAGED_OUTPOST_NAME = "authentik Embedded Outpost"
 
@@ -19,6 +19,7 @@ from structlog.stdlib import BoundLogger, get_logger
 
 from authentik.outposts.apps import GAUGE_OUTPOSTS_CONNECTED, GAUGE_OUTPOSTS_LAST_UPDATE
 from authentik.outposts.models import OUTPOST_HELLO_INTERVAL, Outpost, OutpostState
+from authentik.outposts.scheduler import OUTPOST_SCHEDULER
 
 
 def build_outpost_group(outpost_pk: str | UUID) -> str:
@@ -65,6 +66,7 @@ class OutpostConsumer(JsonWebsocketConsumer):
     logger: BoundLogger
 
     instance_uid: str | None = None
+    state: OutpostState | None = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -111,6 +113,7 @@ class OutpostConsumer(JsonWebsocketConsumer):
                     self.channel_name,
                 )
         if self.outpost and self.instance_uid:
+            OUTPOST_SCHEDULER.remove(self.outpost, self.instance_uid)
             GAUGE_OUTPOSTS_CONNECTED.labels(
                 tenant=connection.schema_name,
                 outpost=self.outpost.name,
@@ -123,7 +126,11 @@ class OutpostConsumer(JsonWebsocketConsumer):
         if not self.outpost:
             raise DenyConnection()
 
-        state = OutpostState.for_instance_uid(self.outpost, self.instance_uid)
+        # Only this connection reports the state of this instance, so it's loaded once
+        # and kept for the lifetime of the connection
+        if not self.state:
+            self.state = OutpostState.for_instance_uid(self.outpost, self.instance_uid)
+        state = self.state
         state.last_seen = datetime.now()
         state.hostname = msg.args.pop("hostname", "")
 
@@ -144,6 +151,8 @@ class OutpostConsumer(JsonWebsocketConsumer):
             version=state.version or "",
         ).set_to_current_time()
         state.save(timeout=OUTPOST_HELLO_INTERVAL * 1.5)
+        if msg.instruction == WebsocketMessageInstruction.HELLO:
+            OUTPOST_SCHEDULER.heartbeat(self.outpost, state)
 
         response = WebsocketMessage(instruction=WebsocketMessageInstruction.ACK)
         self.send_json(asdict(response))
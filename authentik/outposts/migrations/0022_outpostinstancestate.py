@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-19 12:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentik_outposts", "0021_alter_outpost_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutpostInstanceState",
+            fields=[
+                ("expires", models.DateTimeField(default=None, null=True)),
+                ("expiring", models.BooleanField(default=True)),
+                ("uuid", models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False)),
+                ("uid", models.TextField()),
+                ("state", models.JSONField(default=dict)),
+                (
+                    "outpost",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="authentik_outposts.outpost",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Outpost Instance State",
+                "verbose_name_plural": "Outpost Instance States",
+                "indexes": [
+                    models.Index(fields=["expires"], name="authentik_o_expires_514292_idx"),
+                    models.Index(fields=["expiring"], name="authentik_o_expirin_3707ff_idx"),
+                    models.Index(
+                        fields=["expiring", "expires"], name="authentik_o_expirin_fe82d7_idx"
+                    ),
+                ],
+                "unique_together": {("outpost", "uid")},
+            },
+        ),
+    ]
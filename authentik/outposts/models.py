@@ -1,8 +1,8 @@
 """Outpost models"""
 
 from collections.abc import Iterable
-from dataclasses import asdict, dataclass, field
-from datetime import datetime
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timedelta
 from typing import Any
 from uuid import uuid4
 
@@ -10,8 +10,12 @@ from dacite.core import from_dict
 from django.contrib.auth.models import Permission
 from django.core.cache import cache
 from django.db import IntegrityError, models, transaction
+from django.db.models import Q
 from django.db.models.base import Model
+from django.utils.timezone import now
 from django.utils.translation import gettext_lazy as _
+from guardian.ctypes import get_content_type
+from guardian.models import RoleModelPermission, RoleObjectPermission
 from model_utils.managers import InheritanceManager
 from packaging.version import Version, parse
 from rest_framework.serializers import Serializer
@@ -22,6 +26,7 @@ from authentik.blueprints.models import ManagedModel
 from authentik.brands.models import Brand
 from authentik.core.models import (
     USER_PATH_SYSTEM_PREFIX,
+    ExpiringModel,
     Provider,
     Token,
     TokenIntents,
@@ -31,7 +36,7 @@ from authentik.core.models import (
 from authentik.crypto.models import CertificateKeyPair
 from authentik.events.models import Event, EventAction
 from authentik.lib.config import CONFIG
-from authentik.lib.models import InheritanceForeignKey, SerializerModel
+from authentik.lib.models import InheritanceForeignKey, InternallyManagedMixin, SerializerModel
 from authentik.lib.sentry import SentryIgnoredException
 from authentik.lib.utils.time import fqdn_rand
 from authentik.outposts.controllers.k8s.utils import get_namespace
@@ -298,11 +303,6 @@ class Outpost(ScheduledModel, SerializerModel, ManagedModel):
         """Dump config into json"""
         self._config = asdict(value)
 
-    @property
-    def state_cache_prefix(self) -> str:
-        """Key by which the outposts status is saved"""
-        return f"goauthentik.io/outposts/state/{self.uuid.hex}"
-
     @property
     def state(self) -> list["OutpostState"]:
         """Get outpost's health status"""
@@ -328,31 +328,65 @@ class Outpost(ScheduledModel, SerializerModel, ManagedModel):
             ),
         ]
 
+    def get_required_permissions(
+        self,
+    ) -> tuple[set[tuple[int, int]], set[tuple[int, int, str]]]:
+        """Resolve the objects returned by `get_required_objects` to the global permissions
+        (as tuple of permission and content type ID) and object permissions (as tuple of
+        permission ID, content type ID and object primary key) the service-account needs.
+
+        Raises `Permission.DoesNotExist` when a permission cannot be found."""
+        global_perms: set[tuple[str, str]] = set()
+        object_perms: set[tuple[int, str, str]] = set()
+        for model_or_perm in self.get_required_objects():
+            if isinstance(model_or_perm, models.Model):
+                codename = f"view_{model_or_perm._meta.model_name}"
+                obj = model_or_perm
+            elif isinstance(model_or_perm, tuple):
+                perm, obj = model_or_perm
+                codename = perm.split(".", 1)[-1]
+            else:
+                app_label, codename = model_or_perm.split(".", 1)
+                global_perms.add((app_label, codename))
+                continue
+            object_perms.add((get_content_type(obj).pk, codename, str(obj.pk)))
+
+        query = Q()
+        for app_label, codename in global_perms:
+            query |= Q(content_type__app_label=app_label, codename=codename)
+        for content_type_id, codename, _pk in object_perms:
+            query |= Q(content_type_id=content_type_id, codename=codename)
+        by_app_label: dict[tuple[str, str], tuple[int, int]] = {}
+        by_content_type: dict[tuple[int, str], int] = {}
+        if query:
+            for perm_id, codename, content_type_id, app_label in Permission.objects.filter(
+                query
+            ).values_list("pk", "codename", "content_type_id", "content_type__app_label"):
+                by_app_label[(app_label, codename)] = (perm_id, content_type_id)
+                by_content_type[(content_type_id, codename)] = perm_id
+
+        required_global = set()
+        for app_label, codename in global_perms:
+            if (app_label, codename) not in by_app_label:
+                raise Permission.DoesNotExist(f"Permission {app_label}.{codename} not found")
+            required_global.add(by_app_label[(app_label, codename)])
+        required_object = set()
+        for content_type_id, codename, object_pk in object_perms:
+            if (content_type_id, codename) not in by_content_type:
+                raise Permission.DoesNotExist(f"Permission {codename} not found")
+            required_object.add(
+                (by_content_type[(content_type_id, codename)], content_type_id, object_pk)
+            )
+        return required_global, required_object
+
     def build_user_permissions(self, user: User):
         """Create per-object and global permissions for outpost service-account"""
-        # To ensure the user only has the correct permissions, we delete all of them and re-add
-        # the ones the user needs
+        # To ensure the user only has the correct permissions, we compare the permissions
+        # the user needs with the ones currently assigned, and only apply the difference
         try:
-            with transaction.atomic():
-                user.remove_all_perms_from_managed_role()
-                for model_or_perm in self.get_required_objects():
-                    if isinstance(model_or_perm, models.Model):
-                        code_name = (
-                            f"{model_or_perm._meta.app_label}.view_{model_or_perm._meta.model_name}"
-                        )
-                        user.assign_perms_to_managed_role(code_name, model_or_perm)
-                    elif isinstance(model_or_perm, tuple):
-                        perm, obj = model_or_perm
-                        user.assign_perms_to_managed_role(perm, obj)
-                    else:
-                        user.assign_perms_to_managed_role(model_or_perm)
+            required_global, required_object = self.get_required_permissions()
         except (Permission.DoesNotExist, AttributeError) as exc:
-            LOGGER.warning(
-                "permission doesn't exist",
-                code_name=code_name,
-                user=user,
-                model=model_or_perm,
-            )
+            LOGGER.warning("permission doesn't exist", user=user, exc=exc)
             Event.new(
                 action=EventAction.SYSTEM_EXCEPTION,
                 message=(
@@ -361,8 +395,57 @@ class Outpost(ScheduledModel, SerializerModel, ManagedModel):
                     "https://docs.goauthentik.io/troubleshooting/missing_permission"
                 ),
             ).with_exception(exc).set_user(user).save()
+            return
+        role = user.get_managed_role(create=True)
+        current_global = {
+            (perm_id, content_type_id): pk
+            for pk, perm_id, content_type_id in RoleModelPermission.objects.filter(
+                role=role
+            ).values_list("pk", "permission_id", "content_type_id")
+        }
+        current_object = {
+            (perm_id, content_type_id, object_pk): pk
+            for pk, perm_id, content_type_id, object_pk in RoleObjectPermission.objects.filter(
+                role=role
+            ).values_list("pk", "permission_id", "content_type_id", "object_pk")
+        }
+        add_global = required_global - current_global.keys()
+        add_object = required_object - current_object.keys()
+        remove_global = [pk for key, pk in current_global.items() if key not in required_global]
+        remove_object = [pk for key, pk in current_object.items() if key not in required_object]
+        if not any([add_global, add_object, remove_global, remove_object]):
+            LOGGER.debug("Service account's permissions are up-to-date", user=user)
+            return
+        with transaction.atomic():
+            if remove_global:
+                RoleModelPermission.objects.filter(pk__in=remove_global).delete()
+            if remove_object:
+                RoleObjectPermission.objects.filter(pk__in=remove_object).delete()
+            RoleModelPermission.objects.bulk_create(
+                [
+                    RoleModelPermission(
+                        role=role, permission_id=perm_id, content_type_id=content_type_id
+                    )
+                    for perm_id, content_type_id in add_global
+                ],
+                ignore_conflicts=True,
+            )
+            RoleObjectPermission.objects.bulk_create(
+                [
+                    RoleObjectPermission(
+                        role=role,
+                        permission_id=perm_id,
+                        content_type_id=content_type_id,
+                        object_pk=object_pk,
+                    )
+                    for perm_id, content_type_id, object_pk in add_object
+                ],
+                ignore_conflicts=True,
+            )
         LOGGER.debug(
             "Updated service account's permissions",
+            added=len(add_global) + len(add_object),
+            removed=len(remove_global) + len(remove_object),
             obj_perms=user.get_all_obj_perms_on_managed_role(),
             perms=user.get_all_model_perms_on_managed_role(),
         )
@@ -479,38 +562,89 @@ class OutpostState:
             return False
         return parse(self.version) != OUR_VERSION
 
+    @staticmethod
+    def from_instance(instance: "OutpostInstanceState", outpost: Outpost) -> "OutpostState":
+        """Load state from the stored state of an outpost instance"""
+        data = {**instance.state, "uid": instance.uid}
+        if data.get("last_seen"):
+            data["last_seen"] = datetime.fromisoformat(data["last_seen"])
+        state = from_dict(OutpostState, data)
+        state._outpost = outpost
+        return state
+
+    @staticmethod
+    def for_outposts(outposts: Iterable[Outpost]) -> dict[str, list["OutpostState"]]:
+        """Get all states for multiple outposts with a single query, keyed by
+        the outpost's primary key"""
+        outposts = {str(outpost.pk): outpost for outpost in outposts}
+        states = {pk: [] for pk in outposts}
+        for instance in OutpostInstanceState.objects.filter(
+            outpost__in=outposts.keys(), expires__gt=now()
+        ).order_by("uid"):
+            outpost = outposts[str(instance.outpost_id)]
+            states[str(outpost.pk)].append(OutpostState.from_instance(instance, outpost))
+        return states
+
     @staticmethod
     def for_outpost(outpost: Outpost) -> list["OutpostState"]:
         """Get all states for an outpost"""
-        keys = cache.keys(f"{outpost.state_cache_prefix}/*")
-        if not keys:
-            return []
-        states = []
-        for key in keys:
-            instance_uid = key.replace(f"{outpost.state_cache_prefix}/", "")
-            states.append(OutpostState.for_instance_uid(outpost, instance_uid))
-        return states
+        return OutpostState.for_outposts([outpost])[str(outpost.pk)]
 
     @staticmethod
     def for_instance_uid(outpost: Outpost, uid: str) -> "OutpostState":
         """Get state for a single instance"""
-        key = f"{outpost.state_cache_prefix}/{uid}"
-        default_data = {"uid": uid}
-        data = cache.get(key, default_data)
-        if isinstance(data, str):
-            cache.delete(key)
-            data = default_data
-        state = from_dict(OutpostState, data)
-
-        state._outpost = outpost
-        return state
+        instance = OutpostInstanceState.objects.filter(
+            outpost=outpost, uid=uid, expires__gt=now()
+        ).first()
+        if not instance:
+            state = OutpostState(uid=uid)
+            state._outpost = outpost
+            return state
+        return OutpostState.from_instance(instance, outpost)
 
     def save(self, timeout=OUTPOST_HELLO_INTERVAL):
-        """Save current state to cache"""
-        full_key = f"{self._outpost.state_cache_prefix}/{self.uid}"
-        return cache.set(full_key, asdict(self), timeout=timeout)
+        """Save current state, which expires after `timeout` seconds"""
+        data = {
+            _field.name: getattr(self, _field.name)
+            for _field in fields(self)
+            # The expected version is always our own version
+            if _field.name not in ["uid", "version_should", "_outpost"]
+        }
+        if self.last_seen:
+            data["last_seen"] = self.last_seen.isoformat()
+        # Single query upsert, as this is called for every hello of every outpost instance
+        OutpostInstanceState.objects.bulk_create(
+            [
+                OutpostInstanceState(
+                    outpost=self._outpost,
+                    uid=self.uid,
+                    state=data,
+                    expires=now() + timedelta(seconds=timeout),
+                )
+            ],
+            update_conflicts=True,
+            unique_fields=["outpost", "uid"],
+            update_fields=["state", "expires"],
+        )
 
     def delete(self):
-        """Manually delete from cache, used on channel disconnect"""
-        full_key = f"{self._outpost.state_cache_prefix}/{self.uid}"
-        cache.delete(full_key)
+        """Manually delete state, used on channel disconnect"""
+        OutpostInstanceState.objects.filter(outpost=self._outpost, uid=self.uid).delete()
+
+
+class OutpostInstanceState(InternallyManagedMixin, ExpiringModel):
+    """State last reported by a single instance of an outpost"""
+
+    uuid = models.UUIDField(default=uuid4, primary_key=True)
+    outpost = models.ForeignKey(Outpost, on_delete=models.CASCADE)
+    uid = models.TextField()
+    state = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name = _("Outpost Instance State")
+        verbose_name_plural = _("Outpost Instance States")
+        unique_together = (("outpost", "uid"),)
+        indexes = ExpiringModel.Meta.indexes
+
+    def __str__(self) -> str:
+        return f"Outpost Instance State {self.outpost_id}/{self.uid}"
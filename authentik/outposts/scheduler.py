@@ -0,0 +1,162 @@
+"""Least-connections scheduling of outpost instances"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from heapq import heapify, heappop, heappush, heapreplace
+from threading import Lock
+from time import monotonic
+
+from django.db import connection
+
+from authentik.outposts.models import OUTPOST_HELLO_INTERVAL, Outpost, OutpostState
+
+# Seconds after which the instances of an outpost are loaded again, to include instances
+# which report their state to other processes
+REFRESH_INTERVAL = OUTPOST_HELLO_INTERVAL / 2
+
+
+@dataclass(slots=True)
+class InstanceLoad:
+    """Connections of a single outpost instance"""
+
+    uid: str
+    # Connections the instance reported with its last heartbeat
+    active: int
+    # Connections assigned to the instance since its last heartbeat
+    reserved: int = 0
+    last_seen: datetime | None = None
+
+    @property
+    def load(self) -> int:
+        return self.active + self.reserved
+
+
+class OutpostInstances:
+    """Instances of a single outpost in a heap ordered by their load. Entries of the heap
+    are not updated in place, outdated entries are skipped when they reach the top."""
+
+    def __init__(self):
+        self.instances: dict[str, InstanceLoad] = {}
+        self.heap: list[tuple[int, str]] = []
+        self.refreshed = monotonic()
+
+    def update(self, uid: str, active: int, last_seen: datetime | None):
+        """Update the connection count an instance reported. Reservations are only reset
+        by a newer heartbeat, as the reported count includes the connections assigned
+        before it"""
+        instance = self.instances.get(uid)
+        if not instance:
+            instance = self.instances[uid] = InstanceLoad(uid, active, last_seen=last_seen)
+        elif last_seen is None or instance.last_seen != last_seen:
+            instance.active = active
+            instance.reserved = 0
+            instance.last_seen = last_seen
+        heappush(self.heap, (instance.load, uid))
+        if len(self.heap) > 2 * len(self.instances) + 16:  # noqa: PLR2004
+            self.compact()
+
+    def retain(self, uids: Iterable[str]):
+        """Remove all instances not in `uids`"""
+        uids = set(uids)
+        for uid in set(self.instances.keys()) - uids:
+            self.instances.pop(uid, None)
+
+    def remove(self, uid: str):
+        self.instances.pop(uid, None)
+
+    def compact(self):
+        self.heap = [(instance.load, uid) for uid, instance in self.instances.items()]
+        heapify(self.heap)
+
+    def acquire(self) -> str | None:
+        """Get the instance with the fewest connections, and reserve a connection on it"""
+        while self.heap:
+            load, uid = self.heap[0]
+            instance = self.instances.get(uid)
+            if not instance or instance.load != load:
+                heappop(self.heap)
+                continue
+            instance.reserved += 1
+            heapreplace(self.heap, (instance.load, uid))
+            return uid
+        return None
+
+
+class OutpostScheduler:
+    """Assign connections to the outpost instance with the fewest connections, per process.
+
+    Instances are loaded from the stored outpost states when an outpost is first used and
+    every `REFRESH_INTERVAL` seconds after that. Heartbeats of instances connected to this
+    process update the connection counts in between, and connections assigned to an
+    instance are counted until the instance reports its connections again."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._outposts: dict[tuple[str, str], OutpostInstances] = {}
+
+    @staticmethod
+    def key(outpost_pk) -> tuple[str, str]:
+        return (connection.schema_name, str(outpost_pk))
+
+    def refresh(self, outposts: list[Outpost]):
+        """Load instances of all `outposts` which haven't been loaded recently"""
+        with self._lock:
+            stale = [
+                outpost
+                for outpost in outposts
+                if (instances := self._outposts.get(OutpostScheduler.key(outpost.pk))) is None
+                or monotonic() - instances.refreshed > REFRESH_INTERVAL
+            ]
+        if not stale:
+            return
+        all_states = OutpostState.for_outposts(stale)
+        with self._lock:
+            for outpost in stale:
+                key = OutpostScheduler.key(outpost.pk)
+                instances = self._outposts.setdefault(key, OutpostInstances())
+                states = all_states[str(outpost.pk)]
+                instances.retain(state.uid for state in states)
+                for state in states:
+                    instances.update(
+                        state.uid,
+                        int(state.args.get("active_connections", 0)),
+                        state.last_seen,
+                    )
+                instances.refreshed = monotonic()
+
+    def acquire(self, outpost: Outpost) -> str | None:
+        """Get the uid of the instance of `outpost` a new connection should be assigned to"""
+        self.refresh([outpost])
+        with self._lock:
+            instances = self._outposts.get(OutpostScheduler.key(outpost.pk))
+            if not instances:
+                return None
+            return instances.acquire()
+
+    def heartbeat(self, outpost: Outpost, state: OutpostState):
+        """Update the connections of an instance from its heartbeat, only for outposts which
+        connections have been assigned for"""
+        with self._lock:
+            instances = self._outposts.get(OutpostScheduler.key(outpost.pk))
+            if not instances:
+                return
+            instances.update(
+                state.uid,
+                int(state.args.get("active_connections", 0)),
+                state.last_seen,
+            )
+
+    def remove(self, outpost: Outpost, uid: str):
+        """Remove an instance which disconnected"""
+        with self._lock:
+            instances = self._outposts.get(OutpostScheduler.key(outpost.pk))
+            if instances:
+                instances.remove(uid)
+
+    def clear(self):
+        with self._lock:
+            self._outposts.clear()
+
+
+OUTPOST_SCHEDULER = OutpostScheduler()
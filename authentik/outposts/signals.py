@@ -12,9 +12,9 @@ from authentik.outposts.models import Outpost, OutpostModel, OutpostServiceConne
 from authentik.outposts.tasks import (
     CACHE_KEY_OUTPOST_DOWN,
     outpost_controller,
-    outpost_send_update,
     outpost_session_end,
 )
+from authentik.outposts.updates import OUTPOST_UPDATES
 
 LOGGER = get_logger()
 
@@ -57,11 +57,7 @@ def outpost_m2m_changed(sender, instance: Outpost | Provider, action: str, **_):
             rel_obj=instance.service_connection,
             uid=instance.name,
         )
-        outpost_send_update.send_with_options(
-            args=(instance.pk,),
-            rel_obj=instance,
-            uid=instance.name,
-        )
+        OUTPOST_UPDATES.mark(instance)
     elif isinstance(instance, OutpostModel):
         for outpost in instance.outpost_set.all():
             outpost_controller.send_with_options(
@@ -69,11 +65,7 @@ def outpost_m2m_changed(sender, instance: Outpost | Provider, action: str, **_):
                 rel_obj=instance.service_connection,
                 uid=instance.name,
             )
-            outpost_send_update.send_with_options(
-                args=(outpost.pk,),
-                rel_obj=outpost,
-                uid=outpost.name,
-            )
+            OUTPOST_UPDATES.mark(outpost)
 
 
 @receiver(post_save, sender=Outpost)
@@ -86,11 +78,7 @@ def outpost_post_save(sender, instance: Outpost, created: bool, **_):
         rel_obj=instance.service_connection,
         uid=instance.name,
     )
-    outpost_send_update.send_with_options(
-        args=(instance.pk,),
-        rel_obj=instance,
-        uid=instance.name,
-    )
+    OUTPOST_UPDATES.mark(instance)
 
 
 def outpost_related_post_save(sender, instance: OutpostServiceConnection | OutpostModel, **_):
@@ -103,12 +91,7 @@ def outpost_related_post_save(sender, instance: OutpostServiceConnection | Outpo
                 provider=instance.name if hasattr(instance, "name") else str(instance),
             )
             outpost.build_user_permissions(outpost.user)
-        LOGGER.debug("Sending update to outpost", outpost=outpost.name, trigger="provider_change")
-        outpost_send_update.send_with_options(
-            args=(outpost.pk,),
-            rel_obj=outpost,
-            uid=outpost.name,
-        )
+        OUTPOST_UPDATES.mark(outpost)
 
 
 post_save.connect(outpost_related_post_save, sender=OutpostServiceConnection, weak=False)
@@ -137,11 +120,7 @@ def outpost_reverse_related_post_save(sender, instance: CertificateKeyPair | Bra
         for reverse in getattr(instance, field_name).all():
             if isinstance(reverse, OutpostModel):
                 for outpost in reverse.outpost_set.all():
-                    outpost_send_update.send_with_options(
-                        args=(outpost.pk,),
-                        rel_obj=outpost,
-                        uid=outpost.name,
-                    )
+                    OUTPOST_UPDATES.mark(outpost)
 
 
 post_save.connect(outpost_reverse_related_post_save, sender=Brand, weak=False)
@@ -43,6 +43,7 @@ from authentik.tasks.middleware import CurrentTask
 
 LOGGER = get_logger()
 CACHE_KEY_OUTPOST_DOWN = "goauthentik.io/outposts/teardown/%s"
+CACHE_KEY_OUTPOST_UPDATE_PENDING = "goauthentik.io/outposts/update_pending/%s"
 
 
 def hash_session_key(session_key: str) -> str:
@@ -152,6 +153,9 @@ def outpost_send_update(pk: Any):
     outpost = Outpost.objects.filter(pk=pk).first()
     if not outpost:
         return
+    # Allow further updates to be queued, as changes made from now on
+    # might not be picked up by this update
+    cache.delete(CACHE_KEY_OUTPOST_UPDATE_PENDING % outpost.pk.hex)
     # Ensure token again, because this function is called when anything related to an
     # OutpostModel is saved, so we can be sure permissions are right
     _ = outpost.token
@@ -1,11 +1,13 @@
 """outpost tests"""
 
+from datetime import datetime
+
 from django.apps import apps
 from django.contrib.auth.management import create_permissions
 from django.test import TestCase
 
 from authentik.core.tests.utils import create_test_cert, create_test_flow
-from authentik.outposts.models import Outpost, OutpostType
+from authentik.outposts.models import Outpost, OutpostState, OutpostType
 from authentik.providers.proxy.models import ProxyProvider
 
 
@@ -63,3 +65,71 @@ class OutpostTests(TestCase):
         permissions = outpost.user.get_all_obj_perms_on_managed_role()
         self.assertEqual(len(permissions), 1)
         self.assertEqual(permissions[0].object_pk, str(outpost.pk))
+
+    def test_service_account_permissions_diff(self):
+        """Test that only changed permissions are applied"""
+        provider: ProxyProvider = ProxyProvider.objects.create(
+            name="test",
+            internal_host="http://localhost",
+            external_host="http://localhost",
+            authorization_flow=create_test_flow(),
+        )
+        outpost: Outpost = Outpost.objects.create(
+            name="test",
+            type=OutpostType.PROXY,
+        )
+        outpost.providers.add(provider)
+        user = outpost.user
+        before = set(user.get_all_obj_perms_on_managed_role().values_list("pk", flat=True))
+        self.assertEqual(len(before), 2)
+
+        # Nothing changed, existing permissions are kept as-is
+        outpost.build_user_permissions(user)
+        after = set(user.get_all_obj_perms_on_managed_role().values_list("pk", flat=True))
+        self.assertEqual(before, after)
+
+        # Permissions which aren't required anymore are removed
+        user.assign_perms_to_managed_role("authentik_core.view_user")
+        user.assign_perms_to_managed_role("authentik_core.view_user", user)
+        outpost.build_user_permissions(user)
+        self.assertFalse(
+            user.get_all_model_perms_on_managed_role()
+            .filter(permission__codename="view_user")
+            .exists()
+        )
+        after = set(user.get_all_obj_perms_on_managed_role().values_list("pk", flat=True))
+        self.assertEqual(before, after)
+
+    def test_state(self):
+        """Test saving and loading outpost instance state"""
+        outpost: Outpost = Outpost.objects.create(
+            name="test",
+            type=OutpostType.PROXY,
+        )
+        other: Outpost = Outpost.objects.create(
+            name="other",
+            type=OutpostType.PROXY,
+        )
+        self.assertEqual(outpost.state, [])
+        state = OutpostState.for_instance_uid(outpost, "foo")
+        state.last_seen = datetime.now()
+        state.version = "2025.10.0"
+        state.args["active_connections"] = 3
+        state.save()
+        # Saving again updates the existing state
+        state.save()
+        # Expired states are ignored
+        expired = OutpostState.for_instance_uid(outpost, "bar")
+        expired.save(timeout=-1)
+
+        states = OutpostState.for_outposts([outpost, other])
+        self.assertEqual(states[str(other.pk)], [])
+        self.assertEqual(len(states[str(outpost.pk)]), 1)
+        loaded = states[str(outpost.pk)][0]
+        self.assertEqual(loaded.uid, "foo")
+        self.assertEqual(loaded.version, "2025.10.0")
+        self.assertEqual(loaded.last_seen, state.last_seen)
+        self.assertEqual(loaded.args, {"active_connections": 3})
+
+        loaded.delete()
+        self.assertEqual(outpost.state, [])
@@ -0,0 +1,48 @@
+"""Test outpost instance scheduler"""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from authentik.outposts.models import Outpost, OutpostState, OutpostType
+from authentik.outposts.scheduler import OutpostScheduler
+
+
+class TestOutpostScheduler(TestCase):
+    """Test outpost instance scheduler"""
+
+    def setUp(self):
+        self.outpost = Outpost.objects.create(name="test", type=OutpostType.RAC)
+        self.last_seen = now()
+        for uid, connections in [("a", 2), ("b", 0), ("c", 1)]:
+            state = OutpostState.for_instance_uid(self.outpost, uid)
+            state.last_seen = self.last_seen
+            state.args["active_connections"] = connections
+            state.save()
+
+    def test_least_connections(self):
+        """Test connections are assigned to the instance with the fewest connections,
+        including connections assigned since the last heartbeat"""
+        scheduler = OutpostScheduler()
+        assigned = [scheduler.acquire(self.outpost) for _ in range(6)]
+        self.assertEqual(assigned, ["b", "b", "c", "a", "b", "c"])
+
+    def test_heartbeat(self):
+        """Test heartbeats reset reservations and removed instances aren't assigned"""
+        scheduler = OutpostScheduler()
+        self.assertEqual(scheduler.acquire(self.outpost), "b")
+        self.assertEqual(scheduler.acquire(self.outpost), "b")
+        # Heartbeat with the same connection count doesn't include the reservations
+        state = OutpostState.for_instance_uid(self.outpost, "b")
+        state.last_seen = self.last_seen + timedelta(seconds=10)
+        state.args["active_connections"] = 0
+        scheduler.heartbeat(self.outpost, state)
+        self.assertEqual(scheduler.acquire(self.outpost), "b")
+        scheduler.remove(self.outpost, "b")
+        self.assertEqual(scheduler.acquire(self.outpost), "c")
+
+    def test_no_instances(self):
+        """Test outpost without instances"""
+        other = Outpost.objects.create(name="other", type=OutpostType.RAC)
+        self.assertIsNone(OutpostScheduler().acquire(other))
@@ -0,0 +1,59 @@
+"""Outpost update coalescing tests"""
+
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+
+from authentik.outposts.models import Outpost, OutpostType
+from authentik.outposts.tasks import CACHE_KEY_OUTPOST_UPDATE_PENDING
+from authentik.outposts.updates import OutpostUpdateCoalescer
+
+
+class TestOutpostUpdates(TestCase):
+    """Outpost update coalescing tests"""
+
+    def setUp(self) -> None:
+        self.outpost = Outpost.objects.create(name="test", type=OutpostType.PROXY)
+        cache.delete(CACHE_KEY_OUTPOST_UPDATE_PENDING % self.outpost.pk.hex)
+
+    def tearDown(self) -> None:
+        cache.delete(CACHE_KEY_OUTPOST_UPDATE_PENDING % self.outpost.pk.hex)
+
+    def test_coalesce_transaction(self):
+        """Test multiple updates in a transaction are sent once on commit"""
+        coalescer = OutpostUpdateCoalescer()
+        send = MagicMock()
+        with patch("authentik.outposts.updates.outpost_send_update.send_with_options", send):
+            with self.captureOnCommitCallbacks(execute=True):
+                coalescer.mark(self.outpost)
+                coalescer.mark(self.outpost)
+                send.assert_not_called()
+            send.assert_called_once()
+            self.assertEqual(send.call_args.kwargs["args"], (self.outpost.pk,))
+
+    def test_coalesce_rollback(self):
+        """Test updates marked in a rolled back transaction don't suppress later updates"""
+        coalescer = OutpostUpdateCoalescer()
+        send = MagicMock()
+        with patch("authentik.outposts.updates.outpost_send_update.send_with_options", send):
+            with self.assertRaises(DatabaseError), transaction.atomic():
+                coalescer.mark(self.outpost)
+                raise DatabaseError()
+            with self.captureOnCommitCallbacks(execute=True):
+                coalescer.mark(self.outpost)
+            send.assert_called_once()
+
+    def test_debounce(self):
+        """Test updates are dropped while an update is pending"""
+        coalescer = OutpostUpdateCoalescer()
+        send = MagicMock()
+        with patch("authentik.outposts.updates.outpost_send_update.send_with_options", send):
+            coalescer.send(self.outpost)
+            coalescer.send(self.outpost)
+            send.assert_called_once()
+            # Once the update task started, updates are sent again
+            cache.delete(CACHE_KEY_OUTPOST_UPDATE_PENDING % self.outpost.pk.hex)
+            coalescer.send(self.outpost)
+            self.assertEqual(send.call_count, 2)
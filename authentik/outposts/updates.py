@@ -0,0 +1,104 @@
+"""Coalesced outpost updates"""
+
+from threading import local
+from weakref import ref
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from structlog.stdlib import get_logger
+
+from authentik.lib.config import CONFIG
+from authentik.outposts.apps import COUNTER_OUTPOSTS_UPDATES
+from authentik.outposts.models import Outpost
+from authentik.outposts.tasks import CACHE_KEY_OUTPOST_UPDATE_PENDING, outpost_send_update
+
+LOGGER = get_logger()
+
+
+class _PendingUpdates:
+    """Outposts marked for an update within a single transaction, sent on commit.
+
+    Only the transaction's commit callbacks hold a reference to this object, so it's
+    released once the callbacks ran or were discarded due to a rollback."""
+
+    def __init__(self, coalescer: "OutpostUpdateCoalescer"):
+        self.coalescer = coalescer
+        self.outposts: dict[str, Outpost] = {}
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        outposts, self.outposts = self.outposts, {}
+        for outpost in outposts.values():
+            self.coalescer.send(outpost)
+
+
+class OutpostUpdateCoalescer:
+    """Collect outposts which need to be updated and send a single update per outpost.
+
+    Outposts marked within a transaction are collected and updated once when the
+    transaction is committed. Additionally, updates are debounced across processes:
+    the update is sent with a delay of `outposts.update_debounce_seconds`, and further
+    updates for the same outpost until the update task starts are dropped, as the
+    pending update will pick up their changes."""
+
+    def __init__(self):
+        self._local = local()
+
+    @property
+    def debounce(self) -> float:
+        return float(CONFIG.get("outposts.update_debounce_seconds", 2))
+
+    def _current(self) -> _PendingUpdates:
+        """Get the pending updates of the current transaction, or create them when there
+        are none or the transaction they belonged to was committed or rolled back"""
+        pending_ref: ref[_PendingUpdates] | None = getattr(self._local, "pending", None)
+        pending = pending_ref() if pending_ref else None
+        if pending and not pending.done:
+            return pending
+        pending = _PendingUpdates(self)
+        self._local.pending = ref(pending)
+        transaction.on_commit(pending)
+        return pending
+
+    def mark(self, outpost: Outpost):
+        """Mark `outpost` as requiring an update"""
+        if not connection.in_atomic_block:
+            self.send(outpost)
+            return
+        pending = self._current()
+        if str(outpost.pk) in pending.outposts:
+            self._count(outpost, "coalesced")
+            return
+        pending.outposts[str(outpost.pk)] = outpost
+
+    def send(self, outpost: Outpost):
+        """Send an update to `outpost`, unless an update is already pending"""
+        debounce = self.debounce
+        if debounce > 0 and not cache.add(
+            CACHE_KEY_OUTPOST_UPDATE_PENDING % outpost.pk.hex,
+            True,
+            # Expire the key eventually, in case the task is never processed
+            timeout=debounce + 300,
+        ):
+            LOGGER.debug("Outpost update already pending", outpost=outpost.name)
+            self._count(outpost, "coalesced")
+            return
+        LOGGER.debug("Sending update to outpost", outpost=outpost.name)
+        outpost_send_update.send_with_options(
+            args=(outpost.pk,),
+            delay=int(debounce * 1000),
+            rel_obj=outpost,
+            uid=outpost.name,
+        )
+        self._count(outpost, "sent")
+
+    def _count(self, outpost: Outpost, result: str):
+        COUNTER_OUTPOSTS_UPDATES.labels(
+            tenant=connection.schema_name,
+            outpost=outpost.name,
+            result=result,
+        ).inc()
+
+
+OUTPOST_UPDATES = OutpostUpdateCoalescer()
@@ -0,0 +1,83 @@
+"""Process-wide cache of the scope mappings used to build claims"""
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from cachetools import TTLCache
+from django.db import connection
+
+from authentik.lib.config import CONFIG
+
+if TYPE_CHECKING:
+    from authentik.providers.oauth2.models import OAuth2Provider, ScopeMapping
+
+
+@dataclass(slots=True)
+class ClaimPipeline:
+    """Scope mappings of a provider for a set of scopes, in the order they're evaluated in,
+    and the origins of the provider's redirect URIs"""
+
+    mappings: list["ScopeMapping"]
+    allowed_origins: list[str]
+
+
+class ClaimPipelineCache:
+    """Cache claim pipelines per provider and set of scopes, per process.
+
+    Expressions of the mappings are compiled once per process (see
+    `authentik.core.expression.evaluator.COMPILED_EXPRESSIONS`), so evaluating a cached
+    pipeline doesn't require any queries besides what the expressions themselves query.
+    Entries expire after `providers.oauth2.claims_cache.timeout_seconds`, and all entries
+    of a tenant are dropped when a scope mapping or a provider is changed."""
+
+    def __init__(self):
+        self.timeout = CONFIG.get_int("providers.oauth2.claims_cache.timeout_seconds", 60)
+        self._lock = Lock()
+        self._entries: TTLCache[tuple[str, int, frozenset[str]], ClaimPipeline] = TTLCache(
+            maxsize=CONFIG.get_int("providers.oauth2.claims_cache.max_size", 1024),
+            ttl=max(self.timeout, 1),
+        )
+
+    @staticmethod
+    def build(provider: "OAuth2Provider", scopes: frozenset[str]) -> ClaimPipeline:
+        from authentik.providers.oauth2.models import ScopeMapping
+
+        return ClaimPipeline(
+            mappings=list(
+                ScopeMapping.objects.filter(provider=provider, scope_name__in=scopes).order_by(
+                    "scope_name"
+                )
+            ),
+            allowed_origins=[uri.url for uri in provider.redirect_uris],
+        )
+
+    def get(self, provider: "OAuth2Provider", scopes: list[str]) -> ClaimPipeline:
+        """Get the claim pipeline of `provider` for `scopes`"""
+        scopes = frozenset(scopes)
+        if self.timeout <= 0:
+            return ClaimPipelineCache.build(provider, scopes)
+        key = (connection.schema_name, provider.pk, scopes)
+        with self._lock:
+            pipeline = self._entries.get(key)
+        if pipeline:
+            return pipeline
+        pipeline = ClaimPipelineCache.build(provider, scopes)
+        with self._lock:
+            self._entries[key] = pipeline
+        return pipeline
+
+    def invalidate(self):
+        """Remove all cached pipelines of the current tenant"""
+        schema_name = connection.schema_name
+        with self._lock:
+            for key in [key for key in self._entries.keys() if key[0] == schema_name]:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all cached pipelines"""
+        with self._lock:
+            self._entries.clear()
+
+
+CLAIM_PIPELINES = ClaimPipelineCache()
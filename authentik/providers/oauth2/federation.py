@@ -0,0 +1,104 @@
+"""Process-wide cache of JWT federation source keys"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from django.db import connection
+from jwt import PyJWK, PyJWTError
+from structlog.stdlib import get_logger
+
+from authentik.lib.config import CONFIG
+
+if TYPE_CHECKING:
+    from authentik.providers.oauth2.models import OAuth2Provider
+    from authentik.sources.oauth.models import OAuthSource
+
+LOGGER = get_logger()
+
+
+@dataclass(slots=True)
+class FederationKey:
+    """Parsed public key of a JWT federation source"""
+
+    source: "OAuthSource"
+    key: Any
+    # Algorithm set in the JWK, if any
+    algorithm: str | None
+
+
+class FederationKeyCache:
+    """Cache the parsed keys of a provider's JWT federation sources by Key ID, per process.
+
+    Entries expire after `providers.oauth2.federation_keys.timeout_seconds`, and Key IDs
+    none of the sources have a key for are cached for
+    `providers.oauth2.federation_keys.negative_timeout_seconds`. All entries of a tenant
+    are dropped when a source is saved or deleted, or when a provider's federation sources
+    are changed. At most `providers.oauth2.federation_keys.max_size` entries are kept,
+    evicting the least recently used entry."""
+
+    def __init__(self):
+        self.timeout = CONFIG.get_int("providers.oauth2.federation_keys.timeout_seconds", 60)
+        self.negative_timeout = CONFIG.get_int(
+            "providers.oauth2.federation_keys.negative_timeout_seconds", 10
+        )
+        self.max_size = CONFIG.get_int("providers.oauth2.federation_keys.max_size", 1024)
+        self._lock = Lock()
+        self._entries: OrderedDict[tuple[str, int, str], tuple[float, list[FederationKey]]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def load(provider: "OAuth2Provider", kid: str) -> list[FederationKey]:
+        """Get the keys with Key ID `kid` (or without a Key ID) of all federation sources
+        of `provider` that have a key with Key ID `kid`"""
+        keys = []
+        for source in provider.jwt_federation_sources.filter(
+            oidc_jwks__keys__contains=[{"kid": kid}]
+        ):
+            for jwk in source.oidc_jwks.get("keys", []):
+                if jwk.get("kid") and jwk.get("kid") != kid:
+                    continue
+                try:
+                    parsed_key = PyJWK.from_dict(jwk).key
+                except (PyJWTError, ValueError, TypeError, AttributeError) as exc:
+                    LOGGER.warning("failed to parse JWK", exc=exc, source=source.slug, kid=kid)
+                    continue
+                keys.append(FederationKey(source, parsed_key, jwk.get("alg")))
+        return keys
+
+    def get(self, provider: "OAuth2Provider", kid: str) -> list[FederationKey]:
+        """Get the keys of `provider`'s federation sources for Key ID `kid`"""
+        if self.timeout <= 0:
+            return FederationKeyCache.load(provider, kid)
+        key = (connection.schema_name, provider.pk, kid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > monotonic():
+                self._entries.move_to_end(key)
+                return entry[1]
+        keys = FederationKeyCache.load(provider, kid)
+        timeout = self.timeout if keys else self.negative_timeout
+        with self._lock:
+            self._entries[key] = (monotonic() + timeout, keys)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return keys
+
+    def invalidate(self):
+        """Remove all cached keys of the current tenant"""
+        schema_name = connection.schema_name
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == schema_name]:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all cached keys"""
+        with self._lock:
+            self._entries.clear()
+
+
+FEDERATION_KEY_CACHE = FederationKeyCache()
@@ -0,0 +1,110 @@
+"""Benchmark the OAuth2 token endpoint with JWTs of federation sources"""
+
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from django.test import Client
+from django.urls import reverse
+
+from authentik.core.models import Application
+from authentik.core.tests.utils import create_test_cert, create_test_flow
+from authentik.lib.generators import generate_id
+from authentik.lib.management.benchmark import BenchmarkCommand
+from authentik.providers.oauth2.constants import GRANT_TYPE_CLIENT_CREDENTIALS
+from authentik.providers.oauth2.federation import FEDERATION_KEY_CACHE
+from authentik.providers.oauth2.models import OAuth2Provider
+from authentik.providers.oauth2.views.jwks import JWKSView
+from authentik.sources.oauth.models import OAuthSource
+
+
+class Command(BenchmarkCommand):
+    """Benchmark client_credentials requests authenticated with a JWT of a federation source,
+    with and without the federation key cache. All objects created are removed afterwards."""
+
+    operation = "Requests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n",
+            "--requests",
+            default=1000,
+            type=int,
+            help="How many token requests should be sent per run.",
+        )
+        parser.add_argument(
+            "--sources",
+            default=5,
+            type=int,
+            help="How many federation sources the provider should have.",
+        )
+
+    def create_objects(self, source_count: int) -> tuple[OAuth2Provider, str]:
+        """Create a provider with federation sources, and a JWT signed by the last source"""
+        provider = OAuth2Provider.objects.create(
+            name=generate_id(),
+            authorization_flow=create_test_flow(),
+            signing_key=create_test_cert(),
+        )
+        Application.objects.create(name=generate_id(), slug=generate_id(), provider=provider)
+        helper_provider = None
+        for _ in range(max(source_count, 1)):
+            helper_provider = OAuth2Provider.objects.create(
+                name=generate_id(),
+                authorization_flow=create_test_flow(),
+                signing_key=create_test_cert(),
+            )
+            source = OAuthSource.objects.create(
+                name=generate_id(),
+                slug=generate_id(),
+                provider_type="openidconnect",
+                consumer_key=generate_id(),
+                consumer_secret=generate_id(),
+                oidc_jwks={
+                    "keys": [JWKSView().get_jwk_for_key(helper_provider.signing_key, "sig")],
+                },
+            )
+            provider.jwt_federation_sources.add(source)
+        token = helper_provider.encode(
+            {
+                "sub": "benchmark",
+                "exp": datetime.now() + timedelta(hours=2),
+            }
+        )
+        return provider, token
+
+    def benchmark(self, provider: OAuth2Provider, token: str, count: int) -> list[float]:
+        """Send `count` token requests, returning the duration of each request"""
+        client = Client()
+        url = reverse("authentik_providers_oauth2:token")
+        durations = []
+        for _ in range(count):
+            start = perf_counter()
+            response = client.post(
+                url,
+                {
+                    "grant_type": GRANT_TYPE_CLIENT_CREDENTIALS,
+                    "client_id": provider.client_id,
+                    "client_assertion_type": (
+                        "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
+                    ),
+                    "client_assertion": token,
+                },
+            )
+            durations.append(perf_counter() - start)
+            if response.status_code != 200:  # noqa: PLR2004
+                raise ValueError(f"Token request failed: {response.content.decode()}")
+        return durations
+
+    def handle_benchmark(self, **options):
+        count = options["requests"]
+        timeout = FEDERATION_KEY_CACHE.timeout
+        provider, token = self.create_objects(options["sources"])
+        try:
+            FEDERATION_KEY_CACHE.timeout = 0
+            self.output("Without federation key cache", self.benchmark(provider, token, count))
+            FEDERATION_KEY_CACHE.timeout = max(timeout, 60)
+            FEDERATION_KEY_CACHE.invalidate()
+            self.output("With federation key cache", self.benchmark(provider, token, count))
+        finally:
+            FEDERATION_KEY_CACHE.timeout = timeout
+            FEDERATION_KEY_CACHE.invalidate()
@@ -27,7 +27,6 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 from jwcrypto.common import json_encode
 from jwcrypto.jwe import JWE
-from jwcrypto.jwk import JWK
 from jwt import encode
 from rest_framework.serializers import Serializer
 from structlog.stdlib import get_logger
@@ -40,6 +39,7 @@ from authentik.core.models import (
     Provider,
     User,
 )
+from authentik.crypto.cache import get_certificate_jwk
 from authentik.crypto.models import CertificateKeyPair
 from authentik.lib.generators import generate_code_fixed_length, generate_id, generate_key
 from authentik.lib.models import DomainlessURLValidator, InternallyManagedMixin, SerializerModel
@@ -399,7 +399,7 @@ class OAuth2Provider(WebfingerProvider, Provider):
 
     def encrypt(self, raw: str) -> str:
         """Encrypt JWT"""
-        key = JWK.from_pem(self.encryption_key.certificate_data.encode())
+        key = get_certificate_jwk(self.encryption_key)
         jwe = JWE(
             raw,
             json_encode(
@@ -461,6 +461,16 @@ class BaseGrantModel(models.Model):
     def scope(self, value):
         self._scope = " ".join(value)
 
+    def _get_decoded_id_token(self) -> "IDToken | None":
+        """ID Token decoded by the token cache, as long as the raw ID token is unchanged"""
+        decoded = self.__dict__.get("_id_token_decoded")
+        if decoded and decoded[0] == getattr(self, "_id_token", None):
+            return decoded[1]
+        return None
+
+    def _set_decoded_id_token(self, id_token: "IDToken"):
+        self.__dict__["_id_token_decoded"] = (getattr(self, "_id_token", None), id_token)
+
 
 class AuthorizationCode(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseGrantModel):
     """OAuth2 Authorization Code"""
@@ -518,6 +528,8 @@ class AccessToken(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseGr
         """Load ID Token from json"""
         from authentik.providers.oauth2.id_token import IDToken
 
+        if decoded := self._get_decoded_id_token():
+            return decoded
         raw_token = json.loads(self._id_token)
         return from_dict(IDToken, raw_token)
 
@@ -571,6 +583,8 @@ class RefreshToken(InternallyManagedMixin, SerializerModel, ExpiringModel, BaseG
         """Load ID Token from json"""
         from authentik.providers.oauth2.id_token import IDToken
 
+        if decoded := self._get_decoded_id_token():
+            return decoded
         raw_token = json.loads(self._id_token)
         return from_dict(IDToken, raw_token)
 
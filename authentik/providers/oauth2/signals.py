@@ -1,21 +1,31 @@
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
-from django.db.models.signals import post_save, pre_delete
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from structlog.stdlib import get_logger
 
-from authentik.core.models import AuthenticatedSession, User
+from authentik.core.models import Application, AuthenticatedSession, Provider, User
+from authentik.crypto.models import CertificateKeyPair
 from authentik.flows.models import in_memory_stage
+from authentik.lib.generators import generate_id
 from authentik.outposts.tasks import hash_session_key
 from authentik.providers.iframe_logout import IframeLogoutStageView
+from authentik.providers.oauth2.claims import CLAIM_PIPELINES
 from authentik.providers.oauth2.constants import PLAN_CONTEXT_OIDC_LOGOUT_IFRAME_SESSIONS
+from authentik.providers.oauth2.federation import FEDERATION_KEY_CACHE
 from authentik.providers.oauth2.models import (
     AccessToken,
     DeviceToken,
     OAuth2LogoutMethod,
+    OAuth2Provider,
     RefreshToken,
+    ScopeMapping,
 )
 from authentik.providers.oauth2.tasks import backchannel_logout_notification_dispatch
+from authentik.providers.oauth2.token_cache import TOKEN_CACHE
+from authentik.providers.oauth2.views.jwks import CACHE_KEY_JWKS_VERSION
+from authentik.sources.oauth.models import OAuthSource
 from authentik.stages.user_logout.models import UserLogoutStage
 from authentik.stages.user_logout.stage import flow_pre_user_logout
 
@@ -142,3 +152,61 @@ def user_deactivated(sender, instance: User, **_):
     AccessToken.objects.filter(user=instance).delete()
     RefreshToken.objects.filter(user=instance).delete()
     DeviceToken.objects.filter(user=instance).delete()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def federation_source_invalidate_cache(sender, instance, **_):
+    """Remove cached keys of JWT federation sources when a source changes, including
+    sources saved through one of the proxy models"""
+    if not isinstance(instance, OAuthSource):
+        return
+    FEDERATION_KEY_CACHE.invalidate()
+
+
+@receiver(m2m_changed, sender=OAuth2Provider.jwt_federation_sources.through)
+def federation_sources_invalidate_cache(sender, **_):
+    """Remove cached keys of JWT federation sources when a provider's sources change"""
+    FEDERATION_KEY_CACHE.invalidate()
+
+
+@receiver(post_save, sender=AccessToken)
+@receiver(post_delete, sender=AccessToken)
+@receiver(post_save, sender=RefreshToken)
+@receiver(post_delete, sender=RefreshToken)
+def token_invalidate_cache(
+    sender, instance: AccessToken | RefreshToken, created: bool = False, **_
+):
+    """Remove cached token when it's revoked or deleted"""
+    # New tokens can't be cached yet
+    if created:
+        return
+    TOKEN_CACHE.invalidate_token(instance)
+
+
+@receiver(post_save, sender=OAuth2Provider)
+@receiver(post_delete, sender=OAuth2Provider)
+def provider_invalidate_caches(sender, **_):
+    """Remove cached tokens, which hold a copy of their provider, and cached claim pipelines,
+    which hold the provider's redirect URIs"""
+    TOKEN_CACHE.invalidate()
+    CLAIM_PIPELINES.invalidate()
+
+
+@receiver(post_save, sender=ScopeMapping)
+@receiver(post_delete, sender=ScopeMapping)
+@receiver(m2m_changed, sender=Provider.property_mappings.through)
+def scope_mapping_invalidate_claims_cache(sender, **_):
+    """Remove cached claim pipelines when scope mappings or their assignment change"""
+    CLAIM_PIPELINES.invalidate()
+
+
+@receiver(post_save, sender=OAuth2Provider)
+@receiver(post_delete, sender=OAuth2Provider)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+@receiver(post_save, sender=CertificateKeyPair)
+@receiver(post_delete, sender=CertificateKeyPair)
+def jwks_invalidate_cache(sender, **_):
+    """Invalidate cached JWKS documents when a provider, its application or its keys change"""
+    cache.set(CACHE_KEY_JWKS_VERSION, generate_id(), None)
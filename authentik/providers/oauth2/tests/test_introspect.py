@@ -3,6 +3,7 @@
 import json
 from base64 import b64encode
 from dataclasses import asdict
+from datetime import timedelta
 
 from django.urls import reverse
 from django.utils import timezone
@@ -105,6 +106,41 @@ class TesOAuth2Introspection(OAuthTestCase):
             },
         )
 
+    def test_introspect_access_cached(self):
+        """Test introspect (cached token, invalidated when revoked)"""
+        token: AccessToken = AccessToken.objects.create(
+            provider=self.provider,
+            user=self.user,
+            token=generate_id(),
+            auth_time=timezone.now(),
+            expires=timezone.now() + timedelta(hours=1),
+            _scope="openid user profile",
+            _id_token=json.dumps(
+                asdict(
+                    IDToken("foo", "bar"),
+                )
+            ),
+        )
+
+        def introspect():
+            res = self.client.post(
+                reverse("authentik_providers_oauth2:token-introspection"),
+                HTTP_AUTHORIZATION=f"Basic {self.auth}",
+                data={"token": token.token},
+            )
+            self.assertEqual(res.status_code, 200)
+            return json.loads(res.content.decode())
+
+        self.assertEqual(introspect()["scope"], "openid user profile")
+        # Bypass signals, so the token stays cached
+        AccessToken.objects.filter(pk=token.pk).update(_scope="openid")
+        self.assertEqual(introspect()["scope"], "openid user profile")
+        token.revoked = True
+        token.save()
+        body = introspect()
+        self.assertFalse(body["active"])
+        self.assertEqual(body["scope"], "openid user profile")
+
     def test_introspect_invalid_token(self):
         """Test introspect (invalid token)"""
         res = self.client.post(
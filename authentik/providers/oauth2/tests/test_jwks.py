@@ -2,6 +2,7 @@
 
 import base64
 import json
+from unittest.mock import patch
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.x509 import load_der_x509_certificate
@@ -15,6 +16,7 @@ from authentik.crypto.models import CertificateKeyPair
 from authentik.lib.generators import generate_id
 from authentik.providers.oauth2.models import OAuth2Provider, RedirectURI, RedirectURIMatchingMode
 from authentik.providers.oauth2.tests.utils import OAuthTestCase
+from authentik.providers.oauth2.views.jwks import JWKSView
 
 TEST_CORDS_CERT = """
 -----BEGIN CERTIFICATE-----
@@ -132,3 +134,30 @@ class TestJWKS(OAuthTestCase):
         body = json.loads(response.content.decode())
         self.assertEqual(len(body["keys"]), 1)
         PyJWKSet.from_dict(body)
+
+    def test_cache(self):
+        """Test JWKS caching and revalidation"""
+        provider = OAuth2Provider.objects.create(
+            name="test",
+            client_id="test",
+            authorization_flow=create_test_flow(),
+            redirect_uris=[RedirectURI(RedirectURIMatchingMode.STRICT, "http://local.invalid")],
+            signing_key=create_test_cert(),
+        )
+        app = Application.objects.create(name="test", slug="test", provider=provider)
+        url = reverse("authentik_providers_oauth2:jwks", kwargs={"application_slug": app.slug})
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("max-age", response["Cache-Control"])
+        with patch.object(JWKSView, "get_keys") as get_keys:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            get_keys.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        # Changing the provider's keys invalidates the cached document
+        provider.encryption_key = create_test_cert()
+        provider.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(json.loads(response.content.decode())["keys"]), 2)
@@ -2,6 +2,7 @@
 
 from datetime import datetime, timedelta
 from json import loads
+from unittest.mock import patch
 
 from django.test import RequestFactory
 from django.urls import reverse
@@ -19,6 +20,7 @@ from authentik.providers.oauth2.constants import (
     SCOPE_OPENID_PROFILE,
     TOKEN_TYPE,
 )
+from authentik.providers.oauth2.federation import FederationKeyCache
 from authentik.providers.oauth2.models import (
     OAuth2Provider,
     RedirectURI,
@@ -233,3 +235,40 @@ class TestTokenClientCredentialsJWTSource(OAuthTestCase):
             jwt["given_name"], "Autogenerated user from application test (client credentials JWT)"
         )
         self.assertEqual(jwt["preferred_username"], "test-foo")
+
+    def test_federation_key_cache(self):
+        """test cached source keys being invalidated when the source's JWKS change"""
+        token = self.helper_provider.encode(
+            {
+                "sub": "foo",
+                "exp": datetime.now() + timedelta(hours=2),
+            }
+        )
+        jwks = self.source.oidc_jwks
+        self.source.oidc_jwks = {"keys": []}
+        self.source.save()
+
+        def request():
+            return self.client.post(
+                reverse("authentik_providers_oauth2:token"),
+                {
+                    "grant_type": GRANT_TYPE_CLIENT_CREDENTIALS,
+                    "scope": f"{SCOPE_OPENID} {SCOPE_OPENID_EMAIL} {SCOPE_OPENID_PROFILE}",
+                    "client_id": self.provider.client_id,
+                    "client_assertion_type": (
+                        "urn:ietf:params:oauth:client-assertion-type:jwt-bearer"
+                    ),
+                    "client_assertion": token,
+                },
+            )
+
+        # Unknown Key ID, which is cached
+        self.assertEqual(request().status_code, 400)
+        self.source.oidc_jwks = jwks
+        self.source.save()
+        self.assertEqual(request().status_code, 200)
+        with patch.object(FederationKeyCache, "load", wraps=FederationKeyCache.load) as load:
+            self.assertEqual(request().status_code, 200)
+            load.assert_not_called()
+        self.provider.jwt_federation_sources.clear()
+        self.assertEqual(request().status_code, 400)
@@ -2,6 +2,7 @@
 
 import json
 from dataclasses import asdict
+from unittest.mock import patch
 
 from django.urls import reverse
 from django.utils import timezone
@@ -11,6 +12,7 @@ from authentik.core.models import Application
 from authentik.core.tests.utils import create_test_admin_user, create_test_cert, create_test_flow
 from authentik.events.models import Event, EventAction
 from authentik.lib.generators import generate_id
+from authentik.providers.oauth2.claims import ClaimPipelineCache
 from authentik.providers.oauth2.id_token import IDToken
 from authentik.providers.oauth2.models import (
     AccessToken,
@@ -72,6 +74,31 @@ class TestUserinfo(OAuthTestCase):
         )
         self.assertEqual(res.status_code, 200)
 
+    def test_userinfo_cached_pipeline(self):
+        """test user info with a cached claim pipeline, refreshed when mappings change"""
+
+        def userinfo():
+            res = self.client.get(
+                reverse("authentik_providers_oauth2:userinfo"),
+                HTTP_AUTHORIZATION=f"Bearer {self.token.token}",
+            )
+            self.assertEqual(res.status_code, 200)
+            return json.loads(res.content.decode())
+
+        with patch.object(ClaimPipelineCache, "build", wraps=ClaimPipelineCache.build) as build:
+            self.assertNotIn("foo", userinfo())
+            self.assertNotIn("foo", userinfo())
+            self.assertEqual(build.call_count, 1)
+            scope = ScopeMapping.objects.create(
+                name=generate_id(), scope_name="profile", expression="return {'foo': 'bar'}"
+            )
+            self.provider.property_mappings.add(scope)
+            self.assertEqual(userinfo()["foo"], "bar")
+            scope.expression = "return {'foo': 'baz'}"
+            scope.save()
+            self.assertEqual(userinfo()["foo"], "baz")
+            self.assertEqual(build.call_count, 3)
+
     def test_userinfo_invalid_scope(self):
         """test user info with a broken scope"""
         scope = ScopeMapping.objects.create(name="test", scope_name="openid", expression="q")
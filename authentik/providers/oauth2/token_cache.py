@@ -0,0 +1,186 @@
+"""Process-wide cache of access and refresh tokens used by resource servers"""
+
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from hashlib import sha256
+from time import monotonic
+from typing import TYPE_CHECKING, TypeVar
+
+from django.db import connection
+from django.utils.timezone import now
+from structlog.stdlib import get_logger
+
+from authentik.lib.config import CONFIG
+from authentik.lib.utils.notify import NotifyListener
+
+if TYPE_CHECKING:
+    from authentik.providers.oauth2.id_token import IDToken
+    from authentik.providers.oauth2.models import AccessToken, OAuth2Provider, RefreshToken
+
+LOGGER = get_logger()
+T = TypeVar("T", "AccessToken", "RefreshToken")
+# Channel token changes are sent to, with the key of the token or the schema name of the
+# tenant as payload
+TOKENS_CHANNEL = "authentik_oauth2_tokens"
+
+
+@dataclass(slots=True)
+class CachedToken:
+    """Field values of a token, with its provider and decoded ID Token"""
+
+    model: type["AccessToken | RefreshToken"]
+    db: str
+    field_names: list[str]
+    values: tuple
+    provider: "OAuth2Provider"
+    id_token: "IDToken | None"
+    valid_until: float
+
+    def build(self) -> "AccessToken | RefreshToken":
+        """Create a new instance of the token, so that changes to the token by a request
+        don't affect other requests"""
+        token = self.model.from_db(self.db, self.field_names, self.values)
+        token.provider = self.provider
+        if self.id_token:
+            token._set_decoded_id_token(deepcopy(self.id_token))
+        return token
+
+
+class TokenCache(NotifyListener):
+    """Cache access and refresh tokens looked up by resource servers (userinfo, introspection,
+    etc), per process, keyed by a hash of the token.
+
+    Entries expire after `providers.oauth2.token_cache.timeout_seconds` or when the token
+    expires, whichever is sooner. Entries of a token are dropped in all processes when the
+    token is saved (for example when it's revoked) or deleted, and all entries of a tenant
+    are dropped when a provider is saved or deleted, using PostgreSQL's NOTIFY. Entries are
+    only used while notifications are received. At most
+    `providers.oauth2.token_cache.max_size` entries are kept, evicting the least recently
+    used entry."""
+
+    channel = TOKENS_CHANNEL
+    thread_name = "authentik-token-cache-listener"
+
+    def __init__(self):
+        super().__init__()
+        self.timeout = CONFIG.get_int("providers.oauth2.token_cache.timeout_seconds", 10)
+        self.max_size = CONFIG.get_int("providers.oauth2.token_cache.max_size", 10_000)
+        self._entries: OrderedDict[tuple[str, str, str], CachedToken] = OrderedDict()
+        # Incremented on every invalidation, so that tokens loaded before an invalidation
+        # are not cached after it
+        self._generation = 0
+
+    @staticmethod
+    def key(model: type[T], raw_token: str) -> tuple[str, str, str]:
+        return (
+            connection.schema_name,
+            model._meta.label,
+            sha256(raw_token.encode()).hexdigest(),
+        )
+
+    def get(
+        self, model: type[T], raw_token: str | None, provider: "OAuth2Provider | None" = None
+    ) -> T | None:
+        """Get token of `model` with the value `raw_token`, optionally only if it belongs
+        to `provider`"""
+        if not raw_token:
+            return None
+        key = TokenCache.key(model, raw_token)
+        generation = self._generation
+        use_cache = self.timeout > 0 and self.listening
+        if use_cache:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry.valid_until <= monotonic():
+                    self._entries.pop(key, None)
+                    entry = None
+                if entry:
+                    self._entries.move_to_end(key)
+            if entry and (not provider or entry.provider.pk == provider.pk):
+                return entry.build()
+        tokens = model.objects.filter(token=raw_token).select_related("provider")
+        if provider:
+            tokens = tokens.filter(provider=provider)
+        token = tokens.first()
+        if token and use_cache:
+            self._set(key, token, generation)
+        return token
+
+    def _set(self, key: tuple[str, str, str], token: T, generation: int):
+        timeout = self.timeout
+        if token.expiring and token.expires:
+            timeout = min(timeout, (token.expires - now()).total_seconds())
+        if timeout <= 0:
+            return
+        try:
+            id_token = token.id_token
+        except (ValueError, TypeError) as exc:
+            LOGGER.debug("Failed to decode ID Token", exc=exc)
+            id_token = None
+        field_names = [field.attname for field in token._meta.concrete_fields]
+        entry = CachedToken(
+            model=type(token),
+            db=token._state.db,
+            field_names=field_names,
+            values=tuple(getattr(token, name) for name in field_names),
+            provider=token.provider,
+            id_token=id_token,
+            valid_until=monotonic() + timeout,
+        )
+        with self._lock:
+            if not self._listening or generation != self._generation:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_token(self, token: "AccessToken | RefreshToken"):
+        """Remove the cached entry of `token` in all processes"""
+        if not token.token:
+            return
+        key = TokenCache.key(type(token), token.token)
+        self._remove(key)
+        self._broadcast(" ".join(key))
+
+    def invalidate(self):
+        """Remove all cached tokens of the current tenant in all processes"""
+        self._remove_tenant(connection.schema_name)
+        self._broadcast(connection.schema_name)
+
+    def clear(self):
+        """Remove all cached tokens"""
+        with self._lock:
+            self.reset()
+
+    def reset(self):
+        self._generation += 1
+        self._entries.clear()
+
+    def notified(self, payload: str):
+        # Either the key of a token or the schema name of a tenant
+        key = tuple(payload.split(" "))
+        if len(key) == 3:  # noqa: PLR2004
+            self._remove(key)
+        else:
+            self._remove_tenant(payload)
+
+    def _broadcast(self, payload: str):
+        # Other processes only cache tokens when the cache is enabled
+        if self.timeout > 0 and self.enabled:
+            self.send(payload)
+
+    def _remove(self, key: tuple[str, str, str]):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def _remove_tenant(self, schema_name: str):
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if key[0] == schema_name]:
+                self._entries.pop(key, None)
+
+
+TOKEN_CACHE = TokenCache()
@@ -20,6 +20,7 @@ from authentik.lib.utils.time import timedelta_from_string
 from authentik.providers.oauth2.errors import BearerTokenError
 from authentik.providers.oauth2.id_token import hash_session_key
 from authentik.providers.oauth2.models import AccessToken, OAuth2Provider
+from authentik.providers.oauth2.token_cache import TOKEN_CACHE
 
 LOGGER = get_logger()
 
@@ -148,7 +149,7 @@ def protected_resource_view(scopes: list[str]):
                     LOGGER.debug("No token passed")
                     raise BearerTokenError("invalid_token")
 
-                token = AccessToken.objects.filter(token=access_token).first()
+                token = TOKEN_CACHE.get(AccessToken, access_token)
                 if not token:
                     LOGGER.debug("Token does not exist", access_token=access_token)
                     raise BearerTokenError("invalid_token")
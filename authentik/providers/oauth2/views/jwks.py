@@ -2,6 +2,8 @@
 
 from base64 import b64encode, urlsafe_b64encode
 from collections.abc import Generator
+from hashlib import sha256
+from json import dumps
 from typing import Literal
 
 from cryptography.hazmat.primitives import hashes
@@ -14,14 +16,23 @@ from cryptography.hazmat.primitives.asymmetric.ec import (
 )
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
 from cryptography.hazmat.primitives.serialization import Encoding
-from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.views import View
 from jwt.utils import base64url_encode
 
 from authentik.core.models import Application
 from authentik.crypto.models import CertificateKeyPair
+from authentik.lib.config import CONFIG
 from authentik.providers.oauth2.models import JWTAlgorithms, OAuth2Provider
 
+CACHE_KEY_JWKS = "goauthentik.io/providers/oauth2/jwks/%s"
+# Changed when a provider, application or keypair of the tenant changes, cached documents
+# of another version are not used
+CACHE_KEY_JWKS_VERSION = "goauthentik.io/providers/oauth2/jwks_version"
+
 # See https://notes.salrahman.com/generate-es256-es384-es512-private-keys/
 # and _CURVE_TYPES in the same file as the below curve files
 ec_crv_map = {
@@ -135,15 +146,41 @@ class JWKSView(View):
         if encryption_key := provider.encryption_key:
             yield JWKSView.get_jwk_for_key(encryption_key, "enc")
 
-    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
-        """Show JWK Key data for Provider"""
+    def get_document(self) -> tuple[str, str]:
+        """Get the serialized JWKS document and its ETag, cached per application for
+        `providers.oauth2.jwks.timeout_seconds`"""
+        timeout = CONFIG.get_int("providers.oauth2.jwks.timeout_seconds", 300)
+        cache_key = CACHE_KEY_JWKS % self.kwargs["application_slug"]
+        version = None
+        if timeout > 0:
+            cached = cache.get_many([cache_key, CACHE_KEY_JWKS_VERSION])
+            version = cached.get(CACHE_KEY_JWKS_VERSION)
+            entry = cached.get(cache_key)
+            if entry is not None and entry[0] == version:
+                return entry[1], entry[2]
         response_data = {}
         for jwk in self.get_keys():
             if jwk:
                 response_data.setdefault("keys", [])
                 response_data["keys"].append(jwk)
+        body = dumps(response_data, cls=DjangoJSONEncoder)
+        etag = f'"{sha256(body.encode()).hexdigest()}"'
+        if timeout > 0:
+            cache.set(cache_key, (version, body, etag), timeout)
+        return body, etag
 
-        response = JsonResponse(response_data)
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """Show JWK Key data for Provider"""
+        body, etag = self.get_document()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(body, content_type="application/json")
+        response["ETag"] = etag
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=CONFIG.get_int("providers.oauth2.jwks.max_age_seconds", 60),
+        )
         response["Access-Control-Allow-Origin"] = "*"
 
         return response
@@ -15,7 +15,7 @@ from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from guardian.shortcuts import get_anonymous_user
-from jwt import PyJWK, PyJWT, PyJWTError, decode
+from jwt import PyJWT, PyJWTError, decode
 from sentry_sdk import start_span
 from structlog.stdlib import get_logger
 
@@ -50,6 +50,7 @@ from authentik.providers.oauth2.constants import (
     TOKEN_TYPE,
 )
 from authentik.providers.oauth2.errors import DeviceCodeError, TokenError, UserAuthError
+from authentik.providers.oauth2.federation import FEDERATION_KEY_CACHE
 from authentik.providers.oauth2.id_token import IDToken
 from authentik.providers.oauth2.models import (
     AccessToken,
@@ -380,35 +381,28 @@ class TokenParams:
             raise TokenError("invalid_grant") from None
         expected_kid = decode_unvalidated["header"].get("kid")
         fallback_alg = decode_unvalidated["header"].get("alg")
-        token = source = None
         if not expected_kid or not fallback_alg:
             return None, None
-        for source in self.provider.jwt_federation_sources.filter(
-            oidc_jwks__keys__contains=[{"kid": expected_kid}]
-        ):
-            LOGGER.debug("verifying JWT with source", source=source.slug)
-            keys = source.oidc_jwks.get("keys", [])
-            for key in keys:
-                if key.get("kid") and key.get("kid") != expected_kid:
-                    continue
-                LOGGER.debug("verifying JWT with key", source=source.slug, key=key.get("kid"))
-                try:
-                    parsed_key = PyJWK.from_dict(key).key
-                    token = decode(
-                        assertion,
-                        parsed_key,
-                        algorithms=[key.get("alg")] if "alg" in key else [fallback_alg],
-                        options={
-                            "verify_aud": False,
-                        },
-                    )
-                # AttributeError is raised when the configured JWK is a private key
-                # and not a public key
-                except (PyJWTError, ValueError, TypeError, AttributeError) as exc:
-                    LOGGER.warning("failed to verify JWT", exc=exc, source=source.slug)
-        if token:
+        for federation_key in FEDERATION_KEY_CACHE.get(self.provider, expected_kid):
+            source = federation_key.source
+            LOGGER.debug("verifying JWT with source", source=source.slug, key=expected_kid)
+            try:
+                token = decode(
+                    assertion,
+                    federation_key.key,
+                    algorithms=[federation_key.algorithm or fallback_alg],
+                    options={
+                        "verify_aud": False,
+                    },
+                )
+            # AttributeError is raised when the configured JWK is a private key
+            # and not a public key
+            except (PyJWTError, ValueError, TypeError, AttributeError) as exc:
+                LOGGER.warning("failed to verify JWT", exc=exc, source=source.slug)
+                continue
             LOGGER.info("successfully verified JWT with source", source=source.slug)
-        return token, source
+            return token, source
+        return None, None
 
     def __validate_jwt_from_provider(
         self, assertion: str
@@ -14,6 +14,7 @@ from structlog.stdlib import get_logger
 from authentik.core.expression.exceptions import PropertyMappingExpressionException
 from authentik.events.models import Event, EventAction
 from authentik.flows.challenge import PermissionDict
+from authentik.providers.oauth2.claims import CLAIM_PIPELINES
 from authentik.providers.oauth2.constants import (
     SCOPE_GITHUB_ORG_READ,
     SCOPE_GITHUB_USER,
@@ -68,11 +69,8 @@ class UserInfoView(View):
         """Get a dictionary of claims from scopes that the token
         requires and are assigned to the provider."""
 
-        scopes_from_client = token.scope
         final_claims = {}
-        for scope in ScopeMapping.objects.filter(
-            provider=provider, scope_name__in=scopes_from_client
-        ).order_by("scope_name"):
+        for scope in CLAIM_PIPELINES.get(provider, token.scope).mappings:
             scope: ScopeMapping
             value = None
             try:
@@ -108,7 +106,9 @@ class UserInfoView(View):
         response = super().dispatch(request, *args, **kwargs)
         allowed_origins = []
         if self.token:
-            allowed_origins = [x.url for x in self.token.provider.redirect_uris]
+            allowed_origins = CLAIM_PIPELINES.get(
+                self.token.provider, self.token.scope
+            ).allowed_origins
         cors_allow(self.request, response, *allowed_origins)
         return response
 
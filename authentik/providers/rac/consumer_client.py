@@ -1,18 +1,21 @@
 """RAC Client consumer"""
 
+from asyncio import CancelledError, Task, create_task, sleep
 from hashlib import sha256
 
 from asgiref.sync import async_to_sync
 from channels.db import database_sync_to_async
-from channels.exceptions import ChannelFull, DenyConnection
-from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.exceptions import DenyConnection
 from django.db import connection
 from django.http.request import QueryDict
+from django.utils.timezone import now
 from structlog.stdlib import BoundLogger, get_logger
 
 from authentik.outposts.consumer import build_outpost_group_instance
-from authentik.outposts.models import Outpost, OutpostState, OutpostType
+from authentik.outposts.models import Outpost, OutpostType
+from authentik.outposts.scheduler import OUTPOST_SCHEDULER
 from authentik.providers.rac.models import ConnectionToken, RACProvider
+from authentik.providers.rac.relay import RELAY, RelayConsumer
 
 
 def build_rac_client_group() -> str:
@@ -45,34 +48,52 @@ def build_rac_client_group_token(token: str) -> str:
 # Step 1: Client connects to this websocket endpoint
 # Step 2: We prepare all the connection args for Guac
 # Step 3: Send a websocket message to a single outpost that has this provider assigned
-#         (Currently sending to all of them)
-#         (Should probably do different load balancing algorithms)
+#         (Sent to the instance with the fewest connections of each outpost,
+#         see `authentik.outposts.scheduler`)
 # Step 4: Outpost creates a websocket connection back to authentik
 #         with /ws/outpost_rac/<our_channel_id>/
-# Step 5: This consumer transfers data between the two channels
+# Step 5: This consumer transfers data between the two channels, directly if the outpost
+#         connected to the same process (see `authentik.providers.rac.relay`)
 
 
-class RACClientConsumer(AsyncWebsocketConsumer):
+class RACClientConsumer(RelayConsumer):
     """RAC client consumer the browser connects to"""
 
-    dest_channel_id: str = ""
     provider: RACProvider
     token: ConnectionToken
     logger: BoundLogger
+    expiry_task: Task | None = None
 
     async def connect(self):
         self.logger = get_logger()
         await self.accept("guacamole")
+        RELAY.register(self)
         await self.channel_layer.group_add(build_rac_client_group(), self.channel_name)
         await self.channel_layer.group_add(
             build_rac_client_group_session(self.scope["session"].session_key),
             self.channel_name,
         )
         await self.init_outpost_connection()
+        if self.token.expiring and self.token.expires:
+            # Check token expiry once instead of for every frame
+            self.expiry_task = create_task(self.expire())
+
+    async def expire(self):
+        """Disconnect once the token expires"""
+        try:
+            await sleep(max((self.token.expires - now()).total_seconds(), 0))
+        except CancelledError:
+            return
+        await self.event_disconnect({"reason": "token_expiry"})
 
     async def disconnect(self, code):
         self.logger.debug("Disconnecting")
-        if self.dest_channel_id:
+        if self.expiry_task:
+            self.expiry_task.cancel()
+        if self.relay_peer:
+            # Tell the outpost we're disconnecting
+            await self.relay_peer.event_disconnect({})
+        elif self.dest_channel_id:
             # Tell the outpost we're disconnecting
             await self.channel_layer.send(
                 self.dest_channel_id,
@@ -112,23 +133,23 @@ class RACClientConsumer(AsyncWebsocketConsumer):
             if not value:
                 continue
             msg[key] = str(value)
-        outposts = Outpost.objects.filter(
-            type=OutpostType.RAC,
-            providers__in=[self.provider],
+        outposts = list(
+            Outpost.objects.filter(
+                type=OutpostType.RAC,
+                providers__in=[self.provider],
+            )
         )
-        if not outposts.exists():
+        if not outposts:
             self.logger.warning("Provider has no outpost")
             raise DenyConnection()
+        OUTPOST_SCHEDULER.refresh(outposts)
         for outpost in outposts:
-            # Sort all states for the outpost by connection count
-            states = sorted(
-                OutpostState.for_outpost(outpost),
-                key=lambda state: int(state.args.get("active_connections", 0)),
-            )
-            if len(states) < 1:
+            # Instance of the outpost with the fewest connections
+            uid = OUTPOST_SCHEDULER.acquire(outpost)
+            if not uid:
                 continue
-            self.logger.debug("Sending out connection broadcast")
-            group = build_outpost_group_instance(outpost.pk, states[0].uid)
+            self.logger.debug("Sending out connection broadcast", instance=uid)
+            group = build_outpost_group_instance(outpost.pk, uid)
             async_to_sync(self.channel_layer.group_send)(group, msg)
         if self.provider and self.provider.delete_token_on_disconnect:
             self.logger.info("Deleting connection token to prevent reconnect", token=self.token)
@@ -139,20 +160,7 @@ class RACClientConsumer(AsyncWebsocketConsumer):
         which is the channel talking to guacd"""
         if self.dest_channel_id == "":
             return
-        if self.token.is_expired:
-            await self.event_disconnect({"reason": "token_expiry"})
-            return
-        try:
-            await self.channel_layer.send(
-                self.dest_channel_id,
-                {
-                    "type": "event.send",
-                    "text_data": text_data,
-                    "bytes_data": bytes_data,
-                },
-            )
-        except ChannelFull:
-            pass
+        await self.relay(text_data=text_data, bytes_data=bytes_data)
 
     async def event_outpost_connected(self, event: dict):
         """Handle event broadcasted from outpost consumer, and check if they
@@ -170,6 +178,14 @@ class RACClientConsumer(AsyncWebsocketConsumer):
                 },
             )
             return
+        await self.outpost_connected(outpost_channel)
+
+    async def relay_paired(self, peer: RelayConsumer):
+        """Outpost connected to the same process and paired itself with us"""
+        self.logger.debug("Paired with outpost consumer")
+        await self.outpost_connected(peer.channel_name)
+
+    async def outpost_connected(self, outpost_channel: str):
         self.logger.debug("Connected to a single outpost instance")
         self.dest_channel_id = outpost_channel
         # Since we have a specific outpost channel now, we can remove
@@ -179,9 +195,6 @@ class RACClientConsumer(AsyncWebsocketConsumer):
     async def event_send(self, event: dict):
         """Handler called by outpost websocket that sends data to this specific
         client connection"""
-        if self.token.is_expired:
-            await self.event_disconnect({"reason": "token_expiry"})
-            return
         await self.send(text_data=event.get("text_data"), bytes_data=event.get("bytes_data"))
 
     async def event_disconnect(self, event: dict):
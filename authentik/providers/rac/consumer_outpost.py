@@ -1,19 +1,18 @@
 """RAC consumer"""
 
-from channels.exceptions import ChannelFull
-from channels.generic.websocket import AsyncWebsocketConsumer
-
 from authentik.providers.rac.consumer_client import build_rac_client_group
+from authentik.providers.rac.relay import RELAY, RelayConsumer
 
 
-class RACOutpostConsumer(AsyncWebsocketConsumer):
+class RACOutpostConsumer(RelayConsumer):
     """Consumer the outpost connects to, to send specific data back to a client connection"""
 
-    dest_channel_id: str
-
     async def connect(self):
         self.dest_channel_id = self.scope["url_route"]["kwargs"]["channel"]
         await self.accept()
+        # The client connection is handled by this process, no need to broadcast
+        if await RELAY.pair(self, self.dest_channel_id):
+            return
         await self.channel_layer.group_send(
             build_rac_client_group(),
             {
@@ -26,17 +25,7 @@ class RACOutpostConsumer(AsyncWebsocketConsumer):
     async def receive(self, text_data=None, bytes_data=None):
         """Mirror data received from guacd running in the outpost
         to the dest_channel_id which is the channel talking to the browser"""
-        try:
-            await self.channel_layer.send(
-                self.dest_channel_id,
-                {
-                    "type": "event.send",
-                    "text_data": text_data,
-                    "bytes_data": bytes_data,
-                },
-            )
-        except ChannelFull:
-            pass
+        await self.relay(text_data=text_data, bytes_data=bytes_data)
 
     async def event_send(self, event: dict):
         """Handler called by client websocket that sends data to this specific
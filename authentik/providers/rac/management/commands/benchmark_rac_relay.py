@@ -0,0 +1,85 @@
+"""Benchmark relaying RAC frames"""
+
+from asyncio import run
+from time import perf_counter
+
+from channels.layers import get_channel_layer
+
+from authentik.lib.generators import generate_id
+from authentik.lib.management.benchmark import BenchmarkCommand
+from authentik.providers.rac.relay import RELAY, RelayConsumer
+
+
+class Command(BenchmarkCommand):
+    """Benchmark relaying frames from the outpost to the client consumer, through the channel
+    layer and directly between paired consumers."""
+
+    operation = "Frames"
+    unit = "us"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n",
+            "--frames",
+            default=10000,
+            type=int,
+            help="How many frames should be relayed per run.",
+        )
+        parser.add_argument(
+            "--size",
+            default=1024,
+            type=int,
+            help="Size of each frame in bytes.",
+        )
+
+    def consumer(self) -> RelayConsumer:
+        """Create a consumer which discards the frames sent to its websocket"""
+
+        async def base_send(message: dict):
+            pass
+
+        consumer = RelayConsumer()
+        consumer.channel_name = generate_id()
+        consumer.base_send = base_send
+        return consumer
+
+    async def channel_layer(self, frames: list[bytes]) -> list[float]:
+        """Relay all `frames` through the channel layer, returning the duration of each
+        frame"""
+        layer = get_channel_layer()
+        client = self.consumer()
+        outpost = self.consumer()
+        outpost.channel_layer = layer
+        outpost.dest_channel_id = await layer.new_channel()
+        durations = []
+        for frame in frames:
+            start = perf_counter()
+            await outpost.relay(bytes_data=frame)
+            event = await layer.receive(outpost.dest_channel_id)
+            await client.send(bytes_data=event["bytes_data"])
+            durations.append(perf_counter() - start)
+        return durations
+
+    async def direct(self, frames: list[bytes]) -> list[float]:
+        """Relay all `frames` directly between paired consumers, returning the duration of
+        each frame"""
+        client = self.consumer()
+        outpost = self.consumer()
+        RELAY.register(client)
+        try:
+            await RELAY.pair(outpost, client.channel_name)
+            durations = []
+            for frame in frames:
+                start = perf_counter()
+                await outpost.relay(bytes_data=frame)
+                durations.append(perf_counter() - start)
+        finally:
+            RELAY.unregister(client)
+        return durations
+
+    def handle_benchmark(self, **options):
+        count = max(options["frames"], 1)
+        frames = [generate_id(options["size"]).encode() for _ in range(min(count, 100))]
+        frames = [frames[idx % len(frames)] for idx in range(count)]
+        self.output("Channel layer", run(self.channel_layer(frames)))
+        self.output("Direct", run(self.direct(frames)))
@@ -0,0 +1,108 @@
+"""Direct relay between RAC consumers running in the same process"""
+
+from asyncio import AbstractEventLoop, get_running_loop
+from threading import Lock
+from weakref import WeakValueDictionary
+
+from channels.exceptions import ChannelFull
+from channels.generic.websocket import AsyncWebsocketConsumer
+
+
+class RelayConsumer(AsyncWebsocketConsumer):
+    """Consumer which relays frames to the consumer of `dest_channel_id`. When paired with
+    that consumer, frames are sent to its websocket directly, otherwise they're sent through
+    the channel layer."""
+
+    dest_channel_id: str = ""
+    relay_peer: "RelayConsumer | None" = None
+    relay_loop: AbstractEventLoop | None = None
+
+    async def relay(self, text_data=None, bytes_data=None):
+        """Send a frame to the consumer of `dest_channel_id`"""
+        if self.relay_peer:
+            await self.relay_peer.send(text_data=text_data, bytes_data=bytes_data)
+            return
+        try:
+            await self.channel_layer.send(
+                self.dest_channel_id,
+                {
+                    "type": "event.send",
+                    "text_data": text_data,
+                    "bytes_data": bytes_data,
+                },
+            )
+        except ChannelFull:
+            pass
+
+    async def relay_paired(self, peer: "RelayConsumer"):
+        """Called when `peer` paired itself with this consumer"""
+        self.dest_channel_id = peer.channel_name
+
+    async def close(self, code=None, reason=None):
+        RELAY.unregister(self)
+        await super().close(code, reason)
+
+    async def websocket_disconnect(self, message):
+        try:
+            await super().websocket_disconnect(message)
+        finally:
+            RELAY.unregister(self)
+
+
+class Relay:
+    """Registry of RAC consumers by channel name, per process.
+
+    When the outpost connects back to authentik for a client connection handled by the same
+    process, both consumers are paired and frames are passed to the other consumer's
+    websocket directly, instead of being stored in and read back from the channel layer.
+    Consumers on different processes keep relaying frames through the channel layer."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._consumers: WeakValueDictionary[str, RelayConsumer] = WeakValueDictionary()
+
+    def register(self, consumer: RelayConsumer):
+        """Allow other consumers to pair with `consumer`"""
+        consumer.relay_loop = get_running_loop()
+        with self._lock:
+            self._consumers[consumer.channel_name] = consumer
+
+    def unregister(self, consumer: RelayConsumer):
+        """Remove and unpair `consumer`, after which its peer relays frames through the
+        channel layer"""
+        with self._lock:
+            if self._consumers.get(consumer.channel_name) is consumer:
+                del self._consumers[consumer.channel_name]
+        peer = consumer.relay_peer
+        consumer.relay_peer = None
+        if peer and peer.relay_peer is consumer:
+            peer.relay_peer = None
+
+    async def pair(self, consumer: RelayConsumer, channel_name: str) -> bool:
+        """Pair `consumer` with the consumer of `channel_name`, if that consumer is registered
+        and runs on the same event loop. Must be called before `consumer` relays any frames,
+        so that relayed frames can't overtake frames sent through the channel layer.
+
+        When the consumer of `channel_name` is already relaying to another consumer,
+        `consumer` is told to disconnect. Returns if the consumer of `channel_name` was
+        found, in which case it doesn't need to be notified through the channel layer."""
+        with self._lock:
+            peer = self._consumers.get(channel_name)
+        if not peer or peer.relay_loop is not get_running_loop():
+            return False
+        if peer.relay_peer or peer.dest_channel_id:
+            # The peer already selected another consumer
+            await consumer.channel_layer.send(consumer.channel_name, {"type": "event.disconnect"})
+            return True
+        consumer.relay_loop = peer.relay_loop
+        consumer.relay_peer = peer
+        peer.relay_peer = consumer
+        await peer.relay_paired(consumer)
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._consumers)
+
+
+RELAY = Relay()
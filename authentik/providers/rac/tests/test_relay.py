@@ -0,0 +1,67 @@
+"""Test RAC relay"""
+
+from channels.layers import InMemoryChannelLayer
+from django.test import TestCase
+
+from authentik.lib.generators import generate_id
+from authentik.providers.rac.relay import RELAY, RelayConsumer
+
+
+class TestRelay(TestCase):
+    """Test RAC relay"""
+
+    def consumer(self) -> tuple[RelayConsumer, list[dict]]:
+        """Create a consumer which records the messages sent to its websocket"""
+        sent = []
+
+        async def base_send(message: dict):
+            sent.append(message)
+
+        consumer = RelayConsumer()
+        consumer.channel_name = generate_id()
+        consumer.base_send = base_send
+        return consumer, sent
+
+    async def test_pair(self):
+        """Test frames are relayed directly to the paired consumer"""
+        client, client_sent = self.consumer()
+        outpost, outpost_sent = self.consumer()
+        RELAY.register(client)
+        self.assertTrue(await RELAY.pair(outpost, client.channel_name))
+        self.assertEqual(client.dest_channel_id, outpost.channel_name)
+        await outpost.relay(bytes_data=b"foo")
+        await client.relay(text_data="bar")
+        self.assertEqual(client_sent, [{"type": "websocket.send", "bytes": b"foo"}])
+        self.assertEqual(outpost_sent, [{"type": "websocket.send", "text": "bar"}])
+        # A client is only paired with a single outpost connection
+        other, _ = self.consumer()
+        other.channel_layer = InMemoryChannelLayer()
+        self.assertTrue(await RELAY.pair(other, client.channel_name))
+        self.assertIs(client.relay_peer, outpost)
+        self.assertIsNone(other.relay_peer)
+        RELAY.unregister(client)
+        self.assertIsNone(outpost.relay_peer)
+        self.assertIsNone(client.relay_peer)
+
+    async def test_pair_unknown(self):
+        """Test pairing with a consumer of another process"""
+        outpost, _ = self.consumer()
+        self.assertFalse(await RELAY.pair(outpost, generate_id()))
+        self.assertIsNone(outpost.relay_peer)
+
+    async def test_pair_selected(self):
+        """Test outpost connections are told to disconnect when the client already selected
+        an outpost connection through the channel layer"""
+        client, _ = self.consumer()
+        RELAY.register(client)
+        client.dest_channel_id = generate_id()
+        outpost, _ = self.consumer()
+        outpost.channel_layer = InMemoryChannelLayer()
+        self.assertTrue(await RELAY.pair(outpost, client.channel_name))
+        self.assertIsNone(outpost.relay_peer)
+        self.assertIsNone(client.relay_peer)
+        self.assertEqual(
+            await outpost.channel_layer.receive(outpost.channel_name),
+            {"type": "event.disconnect"},
+        )
+        RELAY.unregister(client)
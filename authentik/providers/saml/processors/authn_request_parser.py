@@ -9,6 +9,7 @@ import xmlsec
 from defusedxml import ElementTree
 from structlog.stdlib import get_logger
 
+from authentik.crypto.cache import get_xmlsec_key
 from authentik.lib.xml import lxml_from_string
 from authentik.providers.saml.exceptions import CannotHandleAssertion
 from authentik.providers.saml.models import SAMLProvider
@@ -106,11 +107,7 @@ class AuthNRequestParser:
         if signature_node is not None:
             try:
                 ctx = xmlsec.SignatureContext()
-                key = xmlsec.Key.from_memory(
-                    verifier.certificate_data,
-                    xmlsec.constants.KeyDataFormatCertPem,
-                    None,
-                )
+                key = get_xmlsec_key(verifier, with_private_key=False)
                 ctx.key = key
                 ctx.verify(signature_node)
             except xmlsec.Error as exc:
@@ -145,9 +142,7 @@ class AuthNRequestParser:
             querystring += f"SigAlg={quote_plus(sig_alg)}"
 
             dsig_ctx = xmlsec.SignatureContext()
-            key = xmlsec.Key.from_memory(
-                verifier.certificate_data, xmlsec.constants.KeyDataFormatCertPem, None
-            )
+            key = get_xmlsec_key(verifier, with_private_key=False)
             dsig_ctx.key = key
 
             sign_algorithm_transform_map = {
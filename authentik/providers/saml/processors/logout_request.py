@@ -8,6 +8,7 @@ from lxml import etree  # nosec
 from lxml.etree import Element
 
 from authentik.core.models import User
+from authentik.crypto.cache import get_xmlsec_key
 from authentik.providers.saml.models import SAMLProvider
 from authentik.providers.saml.utils import get_random_id
 from authentik.providers.saml.utils.encoding import deflate_and_base64_encode
@@ -173,15 +174,7 @@ class LogoutRequestProcessor:
 
         ctx = xmlsec.SignatureContext()
 
-        key = xmlsec.Key.from_memory(
-            self.provider.signing_kp.key_data,
-            xmlsec.constants.KeyDataFormatPem,
-            None,
-        )
-        key.load_cert_from_memory(
-            self.provider.signing_kp.certificate_data,
-            xmlsec.constants.KeyDataFormatCertPem,
-        )
+        key = get_xmlsec_key(self.provider.signing_kp)
         ctx.key = key
         ctx.sign(signature_node)
 
@@ -204,11 +197,7 @@ class LogoutRequestProcessor:
             self.provider.signature_algorithm, xmlsec.constants.TransformRsaSha256
         )
 
-        key = xmlsec.Key.from_memory(
-            self.provider.signing_kp.key_data,
-            xmlsec.constants.KeyDataFormatPem,
-            None,
-        )
+        key = get_xmlsec_key(self.provider.signing_kp)
 
         ctx = xmlsec.SignatureContext()
         ctx.key = key
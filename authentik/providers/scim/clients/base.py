@@ -1,9 +1,12 @@
 """SCIM Client"""
 
+from collections.abc import Generator
+from itertools import chain
 from typing import TYPE_CHECKING
 
 from django.core.cache import cache
 from django.http import HttpResponseBadRequest, HttpResponseNotFound
+from orjson import dumps
 from pydantic import ValidationError
 from requests import RequestException, Session
 
@@ -15,14 +18,16 @@ from authentik.lib.sync.outgoing import (
 )
 from authentik.lib.sync.outgoing.base import SAFE_METHODS, BaseOutgoingSyncClient
 from authentik.lib.sync.outgoing.exceptions import (
+    BaseSyncException,
     DryRunRejected,
     NotFoundSyncException,
     ObjectExistsSyncException,
+    StopSync,
     TransientSyncException,
 )
 from authentik.lib.utils.http import get_http_session
 from authentik.providers.scim.clients.exceptions import SCIMRequestException
-from authentik.providers.scim.clients.schema import ServiceProviderConfiguration
+from authentik.providers.scim.clients.schema import BulkRequest, ServiceProviderConfiguration
 from authentik.providers.scim.models import SCIMCompatibilityMode, SCIMProvider
 
 if TYPE_CHECKING:
@@ -121,3 +126,109 @@ class SCIMClient[TModel: "Model", TConnection: "Model", TSchema: "BaseModel"](
         else:
             cache.delete(cache_key)
         return config
+
+    @property
+    def can_batch(self) -> bool:
+        return self._config.bulk.supported
+
+    def bulk_connection(self, obj: TModel, scim_id: str, attributes: dict) -> TConnection:
+        """Create the connection for `obj` after it was created in a bulk request"""
+        raise NotImplementedError()
+
+    def bulk_written(self, obj: TModel, connection: TConnection, attributes: dict, created: bool):
+        """Called after `obj` was created or updated in a bulk request, with the attributes
+        returned by the service provider (or the sent attributes if none were returned)"""
+
+    def _bulk_chunks(self, operations: list[dict]) -> Generator[list[dict]]:
+        """Split `operations` into chunks within the service provider's maximum number of
+        operations and payload size"""
+        max_operations = self._config.bulk.maxOperations
+        max_size = self._config.bulk.maxPayloadSize
+        chunk, chunk_size = [], 0
+        for operation in operations:
+            size = len(dumps(operation)) + 1
+            if chunk and (
+                (max_operations > 0 and len(chunk) >= max_operations)
+                or (max_size and chunk_size + size > max_size)
+            ):
+                yield chunk
+                chunk, chunk_size = [], 0
+            chunk.append(operation)
+            chunk_size += size
+        if chunk:
+            yield chunk
+
+    def _bulk(self, operations: list[dict]) -> dict[str, dict | BaseSyncException | None]:
+        """Send `operations` to the `/Bulk` endpoint, and return the result of each operation
+        by its `bulkId`. When a request fails, results of the previous requests are kept, and
+        operations of the failed and following requests get the exception, or None when the
+        request was rejected, so that they're written individually."""
+        results = {}
+        chunks = self._bulk_chunks(operations)
+        for chunk in chunks:
+            try:
+                response = self._request(
+                    "POST",
+                    "/Bulk",
+                    json=BulkRequest(Operations=chunk).model_dump(mode="json"),
+                )
+            except (NotFoundSyncException, SCIMRequestException):
+                # Bulk endpoint not available or request rejected
+                failed = None
+            except BaseSyncException as exc:
+                failed = exc
+            else:
+                for result in response.get("Operations", []):
+                    if result.get("bulkId"):
+                        results[result["bulkId"]] = result
+                continue
+            for operation in chain(chunk, *chunks):
+                results[operation["bulkId"]] = failed
+            break
+        return results
+
+    def _bulk_status(self, result: dict | None) -> int | None:
+        # Status is a string (optionally including the reason) according to the RFC,
+        # however some implementations return an integer
+        if not result or "status" not in result:
+            return None
+        try:
+            return int(str(result["status"]).split(" ")[0])
+        except ValueError:
+            return None
+
+    def batch_send(self, requests: dict[str, dict]) -> dict[str, dict | BaseSyncException | None]:
+        operations = []
+        for bulk_id, operation in requests.items():
+            operation["bulkId"] = bulk_id
+            operations.append(operation)
+        return self._bulk(operations)
+
+    def batch_result(
+        self,
+        obj: TModel,
+        connection: TConnection | None,
+        request: dict,
+        result: dict | BaseSyncException | None,
+    ) -> TConnection | None:
+        if isinstance(result, BaseSyncException):
+            raise result
+        status = self._bulk_status(result)
+        if status in [HTTP_TOO_MANY_REQUESTS, HTTP_SERVICE_UNAVAILABLE]:
+            raise TransientSyncException()
+        if status is None or status >= HttpResponseBadRequest.status_code:
+            return None
+        response = result.get("response") or {}
+        attributes = response or request.get("data", {})
+        created = connection is None
+        if created:
+            # The response body is optional for successful operations, in which case
+            # the ID is taken from the location of the created resource
+            scim_id = str(
+                response.get("id") or result.get("location", "").rstrip("/").rsplit("/", 1)[-1]
+            )
+            if not scim_id:
+                raise StopSync("SCIM Response with missing or invalid `id`")
+            connection = self.bulk_connection(obj, scim_id, attributes)
+        self.bulk_written(obj, connection, attributes, created)
+        return connection
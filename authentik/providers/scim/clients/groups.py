@@ -117,6 +117,46 @@ class SCIMGroupClient(SCIMClient[Group, SCIMProviderGroup, SCIMGroupSchema]):
         self._patch_add_users(connection, users)
         return connection
 
+    def batch_request(self, group: Group, connection: SCIMProviderGroup | None) -> dict | None:
+        scim_group = self.to_schema(group, connection)
+        if not connection:
+            return {
+                "method": "POST",
+                "path": "/Groups",
+                "data": scim_group.model_dump(mode="json", exclude_unset=True),
+            }
+        scim_group.id = connection.scim_id
+        payload = scim_group.model_dump(mode="json", exclude_unset=True)
+        # Unchanged groups only need their members compared, and AWS only supports
+        # patching specific attributes; both are handled by `update`
+        if (
+            not self.diff(payload, connection)
+            or self.provider.compatibility_mode == SCIMCompatibilityMode.AWS
+        ):
+            return None
+        if self._config.patch.supported:
+            return {
+                "method": "PATCH",
+                "path": f"/Groups/{connection.scim_id}",
+                "data": PatchRequest(
+                    Operations=[PatchOperation(op=PatchOp.replace, path=None, value=payload)]
+                ).model_dump(mode="json", exclude_unset=True, exclude_none=True),
+            }
+        return {"method": "PUT", "path": f"/Groups/{connection.scim_id}", "data": payload}
+
+    def bulk_connection(self, group: Group, scim_id: str, attributes: dict) -> SCIMProviderGroup:
+        return SCIMProviderGroup.objects.create(
+            provider=self.provider, group=group, scim_id=scim_id, attributes=attributes
+        )
+
+    def bulk_written(
+        self, group: Group, connection: SCIMProviderGroup, attributes: dict, created: bool
+    ):
+        if created:
+            users = list(group.users.order_by("id").values_list("id", flat=True))
+            return self._patch_add_users(connection, users)
+        return self.patch_compare_users(group)
+
     def diff(self, local_created: dict[str, Any], connection: SCIMProviderUser):
         """Check if a group is different than what we last wrote to the remote system.
         Returns true if there is a difference in data."""
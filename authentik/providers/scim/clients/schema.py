@@ -117,6 +117,7 @@ class Group(BaseGroup):
 class Bulk(BaseBulk):
 
     maxOperations: int = Field()
+    maxPayloadSize: int | None = Field(None)
 
 
 class ServiceProviderConfiguration(BaseServiceProviderConfiguration):
@@ -145,6 +146,13 @@ class ServiceProviderConfiguration(BaseServiceProviderConfiguration):
         )
 
 
+class BulkRequest(BaseModel):
+    """Bulk request as defined in RFC 7644 section 3.7"""
+
+    schemas: tuple[str] = ("urn:ietf:params:scim:api:messages:2.0:BulkRequest",)
+    Operations: list[dict]
+
+
 class PatchOp(str, Enum):
 
     replace = "replace"
@@ -96,6 +96,33 @@ class SCIMUserClient(SCIMClient[User, SCIMProviderUser, SCIMUserSchema]):
                     provider=self.provider, user=user, scim_id=scim_id, attributes=response
                 )
 
+    def batch_request(self, user: User, connection: SCIMProviderUser | None) -> dict | None:
+        scim_user = self.to_schema(user, connection)
+        if not connection:
+            return {
+                "method": "POST",
+                "path": "/Users",
+                "data": scim_user.model_dump(mode="json", exclude_unset=True),
+            }
+        scim_user.id = connection.scim_id
+        payload = scim_user.model_dump(mode="json", exclude_unset=True)
+        if not self.diff(payload, connection):
+            # Nothing to send, `update` skips the user
+            return None
+        return {"method": "PUT", "path": f"/Users/{connection.scim_id}", "data": payload}
+
+    def bulk_connection(self, user: User, scim_id: str, attributes: dict) -> SCIMProviderUser:
+        return SCIMProviderUser.objects.create(
+            provider=self.provider, user=user, scim_id=scim_id, attributes=attributes
+        )
+
+    def bulk_written(
+        self, user: User, connection: SCIMProviderUser, attributes: dict, created: bool
+    ):
+        if not created:
+            connection.attributes = attributes
+            connection.save()
+
     def diff(self, local_created: dict[str, Any], connection: SCIMProviderUser):
         """Check if a user is different than what we last wrote to the remote system.
         Returns true if there is a difference in data."""
@@ -397,6 +397,141 @@ class SCIMUserTests(TestCase):
             },
         )
 
+    @Mocker()
+    def test_sync_task_bulk(self, mock: Mocker):
+        """Test sync tasks with a service provider supporting bulk requests"""
+        mock.get(
+            "https://localhost/ServiceProviderConfig",
+            json={
+                "patch": {"supported": True},
+                "bulk": {"supported": True, "maxOperations": 2, "maxPayloadSize": 1048576},
+                "filter": {"supported": False},
+                "changePassword": {"supported": False},
+                "sort": {"supported": False},
+                "authenticationSchemes": [],
+            },
+        )
+        scim_ids = {}
+
+        def bulk(request, context):
+            results = []
+            for operation in loads(request.body)["Operations"]:
+                scim_id = generate_id()
+                scim_ids[operation["bulkId"]] = scim_id
+                results.append(
+                    {
+                        "method": operation["method"],
+                        "bulkId": operation["bulkId"],
+                        "location": f"https://localhost/Users/{scim_id}",
+                        "status": "201",
+                    }
+                )
+            return {
+                "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"],
+                "Operations": results,
+            }
+
+        mock.post("https://localhost/Bulk", json=bulk)
+        self.app.backchannel_providers.remove(self.provider)
+        users = []
+        for _ in range(3):
+            uid = generate_id()
+            users.append(
+                User.objects.create(
+                    username=uid,
+                    name=f"{uid} {uid}",
+                    email=f"{uid}@goauthentik.io",
+                )
+            )
+        self.app.backchannel_providers.add(self.provider)
+
+        scim_sync.send(self.provider.pk)
+
+        bulk_requests = [
+            request for request in mock.request_history if request.url == "https://localhost/Bulk"
+        ]
+        # 3 users with at most 2 operations per request
+        self.assertEqual(len(bulk_requests), 2)
+        for request in bulk_requests:
+            for operation in loads(request.body)["Operations"]:
+                self.assertEqual(operation["method"], "POST")
+                self.assertEqual(operation["path"], "/Users")
+        for user in users:
+            self.assertEqual(
+                SCIMProviderUser.objects.get(provider=self.provider, user=user).scim_id,
+                scim_ids[str(user.pk)],
+            )
+
+    @Mocker()
+    def test_sync_task_bulk_failed(self, mock: Mocker):
+        """Test sync tasks when a later bulk request fails, where only the objects of that
+        request are written individually"""
+        mock.get(
+            "https://localhost/ServiceProviderConfig",
+            json={
+                "patch": {"supported": True},
+                "bulk": {"supported": True, "maxOperations": 2, "maxPayloadSize": 1048576},
+                "filter": {"supported": False},
+                "changePassword": {"supported": False},
+                "sort": {"supported": False},
+                "authenticationSchemes": [],
+            },
+        )
+        scim_ids = {}
+
+        def bulk(request, context):
+            results = []
+            for operation in loads(request.body)["Operations"]:
+                scim_id = generate_id()
+                scim_ids[operation["bulkId"]] = scim_id
+                results.append(
+                    {
+                        "method": operation["method"],
+                        "bulkId": operation["bulkId"],
+                        "location": f"https://localhost/Users/{scim_id}",
+                        "status": "201",
+                    }
+                )
+            return {
+                "schemas": ["urn:ietf:params:scim:api:messages:2.0:BulkResponse"],
+                "Operations": results,
+            }
+
+        user_scim_id = generate_id()
+        mock.post("https://localhost/Bulk", [{"json": bulk}, {"status_code": 500}])
+        mock.post("https://localhost/Users", json={"id": user_scim_id})
+        self.app.backchannel_providers.remove(self.provider)
+        users = []
+        for _ in range(3):
+            uid = generate_id()
+            users.append(
+                User.objects.create(
+                    username=uid,
+                    name=f"{uid} {uid}",
+                    email=f"{uid}@goauthentik.io",
+                )
+            )
+        self.app.backchannel_providers.add(self.provider)
+
+        scim_sync.send(self.provider.pk)
+
+        bulk_requests = [
+            request for request in mock.request_history if request.url == "https://localhost/Bulk"
+        ]
+        user_requests = [
+            request for request in mock.request_history if request.url == "https://localhost/Users"
+        ]
+        self.assertEqual(len(bulk_requests), 2)
+        # Only the user of the failed bulk request is created again
+        self.assertEqual(len(user_requests), 1)
+        (failed,) = loads(bulk_requests[1].body)["Operations"]
+        scim_ids[failed["bulkId"]] = user_scim_id
+        for user in users:
+            self.assertEqual(
+                SCIMProviderUser.objects.get(provider=self.provider, user=user).scim_id,
+                scim_ids[str(user.pk)],
+            )
+
     def test_user_create_dry_run(self):
         """Test user creation (dry_run)"""
         # Update the provider before we start mocking as saving the provider triggers a full sync
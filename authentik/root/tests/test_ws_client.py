@@ -3,7 +3,9 @@ from unittest.mock import patch
 from asgiref.sync import sync_to_async
 from channels.routing import URLRouter
 from channels.testing import WebsocketCommunicator
-from django.http import HttpRequest
+from django.conf import settings
+from django.contrib.messages import INFO, WARNING
+from django.http import HttpRequest, HttpResponse
 from django.test import TransactionTestCase
 
 from authentik.core.tests.utils import create_test_user
@@ -17,6 +19,7 @@ from authentik.events.models import (
 from authentik.flows.apps import RefreshOtherFlowsAfterAuthentication
 from authentik.lib.generators import generate_id
 from authentik.root import websocket
+from authentik.root.ws.storage import ChannelsStorage
 from authentik.stages.password import BACKEND_INBUILT
 from authentik.stages.user_login.stage import COOKIE_NAME_KNOWN_DEVICE
 from authentik.tenants.utils import get_current_tenant
@@ -113,3 +116,32 @@ class TestClientWS(TransactionTestCase):
         self.assertEqual(evt["data"]["event"]["pk"], str(event.pk))
 
         await communicator.disconnect()
+
+    async def test_messages(self):
+        await self.client.aforce_login(self.user)
+        session = await self.client.asession()
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket.websocket_urlpatterns),
+            "/ws/client/",
+            headers=[(b"cookie", f"{settings.SESSION_COOKIE_NAME}={session.session_key}".encode())],
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+
+        request = HttpRequest()
+        request.session = session
+        storage = ChannelsStorage(request)
+        storage.add(INFO, "foo")
+        storage.add(WARNING, "bar")
+        await sync_to_async(storage.update)(HttpResponse())
+
+        evt = await communicator.receive_json_from(timeout=5)
+        self.assertEqual(evt["message"], "foo")
+        self.assertEqual(evt["level"], "info")
+        evt = await communicator.receive_json_from(timeout=5)
+        self.assertEqual(evt["message"], "bar")
+        self.assertEqual(evt["level"], "warning")
+        # Messages were sent over websocket and not stored in the session
+        self.assertNotIn(storage.session_key, request.session)
+
+        await communicator.disconnect()
@@ -0,0 +1,82 @@
+"""Test websocket message storage"""
+
+from datetime import timedelta
+from importlib import import_module
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.conf import settings
+from django.contrib import messages
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils.timezone import now
+
+from authentik.core.models import SessionChannel
+from authentik.lib.generators import generate_id
+from authentik.root.ws.consumer import GROUP_EXPIRY, build_session_group
+from authentik.root.ws.storage import ChannelsStorage
+
+
+class TestChannelsStorage(TestCase):
+    """Test websocket message storage"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        self.session.create()
+
+    def view(self, request: HttpRequest) -> HttpResponse:
+        """Sync view adding messages, storing them like `MessageMiddleware` does"""
+        request._messages = ChannelsStorage(request)
+        messages.info(request, "foo")
+        messages.warning(request, "bar")
+        response = HttpResponse()
+        request._messages.update(response)
+        return response
+
+    def test_store_session(self):
+        """Test messages are stored in the session without open connections"""
+        request = self.factory.get("/")
+        request.session = self.session
+        self.view(request)
+        stored = ChannelsStorage(request)
+        self.assertEqual([message.message for message in stored], ["foo", "bar"])
+
+    def store_channel(self, expires: timedelta) -> MagicMock:
+        """Store messages with an open connection expiring in `expires`, returning the
+        mocked channel layer"""
+        SessionChannel.objects.create(
+            channel_name=generate_id(),
+            session_key=self.session.session_key,
+            expires=now() + expires,
+        )
+        request = self.factory.get("/")
+        request.session = self.session
+        layer = MagicMock()
+        layer.group_add = AsyncMock()
+        layer.group_send = AsyncMock()
+        with patch("authentik.root.ws.storage.get_channel_layer", return_value=layer):
+            self.view(request)
+        self.assertEqual(list(ChannelsStorage(request)), [])
+        return layer
+
+    def test_store_channel(self):
+        """Test messages are sent to open connections"""
+        layer = self.store_channel(GROUP_EXPIRY)
+        layer.group_add.assert_not_awaited()
+        layer.group_send.assert_awaited_once()
+        group, event = layer.group_send.await_args.args
+        self.assertEqual(group, build_session_group(self.session.session_key))
+        self.assertEqual(
+            [message["message"] for message in event["messages"]],
+            ["foo", "bar"],
+        )
+
+    def test_store_channel_refresh(self):
+        """Test group memberships of connections are renewed before they expire"""
+        layer = self.store_channel(timedelta(hours=1))
+        channel = SessionChannel.objects.get(session_key=self.session.session_key)
+        layer.group_add.assert_awaited_once_with(
+            build_session_group(self.session.session_key), channel.channel_name
+        )
+        self.assertGreater(channel.expires, now() + GROUP_EXPIRY / 2)
+        layer.group_send.assert_awaited_once()
@@ -1,14 +1,17 @@
 """websocket Message consumer"""
 
+from datetime import timedelta
 from hashlib import sha256
 
 from asgiref.sync import async_to_sync
 from channels.generic.websocket import JsonWebsocketConsumer
-from django.core.cache import cache
 from django.db import connection
+from django.utils.timezone import now
 
-from authentik.core.models import User
-from authentik.root.ws.storage import CACHE_PREFIX
+from authentik.core.models import SessionChannel, User
+
+# Time after which group memberships expire, the default group expiry of channel layers
+GROUP_EXPIRY = timedelta(days=1)
 
 
 def build_session_group(session_key: str):
@@ -29,7 +32,8 @@ def build_user_group(user: User):
 
 class MessageConsumer(JsonWebsocketConsumer):
     """Consumer which sends django.contrib.messages Messages over WS.
-    channel_name is saved into cache with user_id, and when a add_message is called"""
+    channel_name is added to the session's group and saved as SessionChannel, so messages
+    added during a request of the session are sent to the group"""
 
     session_key: str
     device_cookie: str | None = None
@@ -39,7 +43,13 @@ class MessageConsumer(JsonWebsocketConsumer):
         self.accept()
         self.session_key = self.scope["session"].session_key
         if self.session_key:
-            cache.set(f"{CACHE_PREFIX}{self.session_key}_messages_{self.channel_name}", True, None)
+            async_to_sync(self.channel_layer.group_add)(
+                build_session_group(self.session_key), self.channel_name
+            )
+            SessionChannel.objects.update_or_create(
+                channel_name=self.channel_name,
+                defaults={"session_key": self.session_key, "expires": now() + GROUP_EXPIRY},
+            )
         if user := self.scope.get("user"):
             if user.is_authenticated:
                 async_to_sync(self.channel_layer.group_add)(
@@ -53,7 +63,10 @@ class MessageConsumer(JsonWebsocketConsumer):
 
     def disconnect(self, code):
         if self.session_key:
-            cache.delete(f"{CACHE_PREFIX}{self.session_key}_messages_{self.channel_name}")
+            SessionChannel.objects.filter(channel_name=self.channel_name).delete()
+            async_to_sync(self.channel_layer.group_discard)(
+                build_session_group(self.session_key), self.channel_name
+            )
         if self.device_cookie:
             async_to_sync(self.channel_layer.group_discard)(
                 build_device_group(self.device_cookie), self.channel_name
@@ -67,6 +80,11 @@ class MessageConsumer(JsonWebsocketConsumer):
         """Event handler which is called by Messages Storage backend"""
         self.send_json(event)
 
+    def event_messages(self, event: dict):
+        """Event handler for multiple messages sent by Messages Storage backend"""
+        for message in event["messages"]:
+            self.send_json({"type": "event.message", **message})
+
     def event_session_authenticated(self, event: dict):
         """Event handler post user authentication"""
         self.send_json({"message_type": "session.authenticated", **event})
@@ -4,11 +4,13 @@ from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 from django.contrib.messages.storage.base import Message
 from django.contrib.messages.storage.session import SessionStorage
-from django.core.cache import cache
 from django.http.request import HttpRequest
+from django.utils.timezone import now
+
+from authentik.core.models import SessionChannel
+from authentik.root.ws.consumer import GROUP_EXPIRY, build_session_group
 
 SESSION_KEY = "_messages"
-CACHE_PREFIX = "goauthentik.io/root/messages_"
 
 
 class ChannelsStorage(SessionStorage):
@@ -19,23 +21,39 @@ class ChannelsStorage(SessionStorage):
         self.channel = get_channel_layer()
 
     def _store(self, messages: list[Message], response, *args, **kwargs):
-        prefix = f"{CACHE_PREFIX}{self.request.session.session_key}_messages_"
-        keys = cache.keys(f"{prefix}*")
+        if not messages:
+            return super()._store(messages, response, *args, **kwargs)
+        session_key = self.request.session.session_key
+        channels = SessionChannel.objects.filter(
+            session_key=session_key, expires__gt=now()
+        ).values_list("channel_name", "expires")
         # if no active connections are open, fallback to storing messages in the
         # session, so they can always be retrieved
-        if len(keys) < 1:
+        if not channels:
             return super()._store(messages, response, *args, **kwargs)
-        for key in keys:
-            uid = key.replace(prefix, "")
-            for message in messages:
-                async_to_sync(self.channel.send)(
-                    uid,
+        group = build_session_group(session_key)
+        # Renew group memberships which expire soon, as connections can stay open longer
+        refresh_before = now() + GROUP_EXPIRY / 2
+        refresh = [name for name, expires in channels if expires < refresh_before]
+        for channel_name in refresh:
+            async_to_sync(self.channel.group_add)(group, channel_name)
+        if refresh:
+            SessionChannel.objects.filter(channel_name__in=refresh).update(
+                expires=now() + GROUP_EXPIRY
+            )
+        async_to_sync(self.channel.group_send)(
+            group,
+            {
+                "type": "event.messages",
+                "messages": [
                     {
-                        "type": "event.message",
                         "message_type": "message",
                         "level": message.level_tag,
                         "tags": message.tags,
                         "message": message.message,
-                    },
-                )
+                    }
+                    for message in messages
+                ],
+            },
+        )
         return []
@@ -1,7 +1,20 @@
 """authentik ldap source config"""
 
+from prometheus_client import Gauge, Histogram
+
 from authentik.blueprints.apps import ManagedAppConfig
 
+GAUGE_LDAP_POOL_CONNECTIONS = Gauge(
+    "authentik_sources_ldap_pool_connections",
+    "Pooled LDAP connections per source",
+    ["tenant", "source", "state"],
+)
+HIST_LDAP_POOL_BIND_DURATION = Histogram(
+    "authentik_sources_ldap_pool_bind_duration_seconds",
+    "Duration of user binds through the LDAP connection pool",
+    ["tenant", "source", "reused"],
+)
+
 
 class AuthentikSourceLDAPConfig(ManagedAppConfig):
     """Authentik ldap app config"""
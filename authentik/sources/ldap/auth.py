@@ -7,6 +7,7 @@ from structlog.stdlib import get_logger
 from authentik.core.auth import InbuiltBackend
 from authentik.core.models import User
 from authentik.sources.ldap.models import LDAP_DISTINGUISHED_NAME, LDAPSource
+from authentik.sources.ldap.pool import get_pool
 
 LOGGER = get_logger()
 
@@ -18,7 +19,9 @@ class LDAPBackend(InbuiltBackend):
         """Try to authenticate a user via ldap"""
         if "password" not in kwargs:
             return None
-        for source in LDAPSource.objects.filter(enabled=True):
+        for source in LDAPSource.objects.filter(enabled=True).select_related(
+            "peer_certificate", "client_certificate"
+        ):
             LOGGER.debug("LDAP Auth attempt", source=source)
             user = self.auth_user(request, source, **kwargs)
             if user:
@@ -54,18 +57,13 @@ class LDAPBackend(InbuiltBackend):
 
     def auth_user_by_bind(self, source: LDAPSource, user: User, password: str) -> User | None:
         """Attempt authentication by binding to the LDAP server as `user`. This
-        method should be avoided as its slow to do the bind."""
+        method should be avoided as its slow to do the bind, even though connections
+        are re-used from the source's connection pool."""
         # Try to bind as new user
         LOGGER.debug("Attempting to bind as user", user=user)
         try:
-            # source.connection also attempts to bind
-            source.connection(
-                connection_kwargs={
-                    "user": user.attributes.get(LDAP_DISTINGUISHED_NAME),
-                    "password": password,
-                }
-            )
-            return user
+            if get_pool(source).bind(user.attributes.get(LDAP_DISTINGUISHED_NAME), password):
+                return user
         except LDAPInvalidCredentialsResult as exc:
             LOGGER.debug("invalid LDAP credentials", user=user, exc=exc)
         except LDAPException as exc:
@@ -252,14 +252,17 @@ class LDAPSource(IncomingSyncSource):
         server: Server | None = None,
         server_kwargs: dict | None = None,
         connection_kwargs: dict | None = None,
+        read_server_info: bool = True,
     ) -> Connection:
-        """Get a fully connected and bound LDAP Connection"""
+        """Get a fully connected and bound LDAP Connection. When `server` is given,
+        the caller is responsible for cleaning up TLS files with `cleanup_tls_files`"""
         server_kwargs = server_kwargs or {}
         connection_kwargs = connection_kwargs or {}
         if self.bind_cn is not None:
             connection_kwargs.setdefault("user", self.bind_cn)
         if self.bind_password is not None:
             connection_kwargs.setdefault("password", self.bind_password)
+        owns_server = server is None
         conn = Connection(
             server or self.server(**server_kwargs),
             raise_exceptions=True,
@@ -270,7 +273,7 @@ class LDAPSource(IncomingSyncSource):
         if self.start_tls:
             conn.start_tls(read_server_info=False)
         try:
-            successful = conn.bind()
+            successful = conn.bind(read_server_info=read_server_info)
             if successful:
                 return conn
         except (LDAPSchemaError, LDAPInsufficientAccessRightsResult) as exc:
@@ -280,14 +283,19 @@ class LDAPSource(IncomingSyncSource):
             if server_kwargs.get("get_info", ALL) == NONE:
                 raise exc
             server_kwargs["get_info"] = NONE
-            return self.connection(server, server_kwargs, connection_kwargs)
+            return self.connection(server, server_kwargs, connection_kwargs, read_server_info)
         finally:
-            if conn.server.tls.certificate_file is not None and exists(
-                conn.server.tls.certificate_file
-            ):
-                rmtree(dirname(conn.server.tls.certificate_file))
+            if owns_server:
+                self.cleanup_tls_files(conn.server)
         return RuntimeError("Failed to bind")
 
+    def cleanup_tls_files(self, server: Server | ServerPool):
+        """Remove temporary client certificate files created by `server()`"""
+        servers = server.servers if isinstance(server, ServerPool) else [server]
+        for srv in servers:
+            if srv.tls.certificate_file is not None and exists(srv.tls.certificate_file):
+                rmtree(dirname(srv.tls.certificate_file))
+
     @property
     def sync_lock(self) -> pglock.advisory:
         """Postgres lock for syncing LDAP to prevent multiple parallel syncs happening"""
@@ -312,18 +320,21 @@ class LDAPSource(IncomingSyncSource):
         servers = self.server()
         server_info = {}
         # Check each individual server
-        for server in servers.servers:
-            server: Server
-            try:
-                conn = self.connection(server=server)
-                server_info[server.host] = {
-                    "status": "ok",
-                    **self.get_ldap_server_info(conn.server),
-                }
-            except LDAPException as exc:
-                server_info[server.host] = {
-                    "status": str(exc),
-                }
+        try:
+            for server in servers.servers:
+                server: Server
+                try:
+                    conn = self.connection(server=server)
+                    server_info[server.host] = {
+                        "status": "ok",
+                        **self.get_ldap_server_info(conn.server),
+                    }
+                except LDAPException as exc:
+                    server_info[server.host] = {
+                        "status": str(exc),
+                    }
+        finally:
+            self.cleanup_tls_files(servers)
         # Check server pool
         try:
             conn = self.connection()
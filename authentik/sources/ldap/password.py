@@ -14,6 +14,7 @@ from structlog.stdlib import get_logger
 from authentik.core.models import User
 from authentik.sources.ldap.auth import LDAP_DISTINGUISHED_NAME
 from authentik.sources.ldap.models import LDAPSource
+from authentik.sources.ldap.pool import get_pool
 
 LOGGER = get_logger()
 
@@ -52,7 +53,7 @@ class LDAPPasswordChanger:
 
     def __init__(self, source: LDAPSource) -> None:
         self._source = source
-        self._connection = source.connection()
+        self._pool = get_pool(source)
 
     @staticmethod
     def should_check_user(user: User) -> bool:
@@ -61,7 +62,8 @@ class LDAPPasswordChanger:
 
     def get_domain_root_dn(self) -> str:
         """Attempt to get root DN via MS specific fields or generic LDAP fields"""
-        info = self._connection.server.info
+        with self._pool.connection() as connection:
+            info = connection.server.info
         if "rootDomainNamingContext" in info.other:
             return info.other["rootDomainNamingContext"][0]
         naming_contexts = info.naming_contexts
@@ -72,13 +74,14 @@ class LDAPPasswordChanger:
         """Check if DOMAIN_PASSWORD_COMPLEX is enabled"""
         root_dn = self.get_domain_root_dn()
         try:
-            root_attrs = self._connection.extend.standard.paged_search(
-                search_base=root_dn,
-                search_filter="(objectClass=*)",
-                search_scope=BASE,
-                attributes=["pwdProperties"],
-            )
-            root_attrs = list(root_attrs)[0]
+            with self._pool.connection() as connection:
+                root_attrs = connection.extend.standard.paged_search(
+                    search_base=root_dn,
+                    search_filter="(objectClass=*)",
+                    search_scope=BASE,
+                    attributes=["pwdProperties"],
+                )
+                root_attrs = list(root_attrs)[0]
         except (LDAPAttributeError, LDAPUnwillingToPerformResult, KeyError, IndexError):
             return False
         raw_pwd_properties = root_attrs.get("attributes", {}).get("pwdProperties", None)
@@ -100,21 +103,23 @@ class LDAPPasswordChanger:
         if not user_dn:
             LOGGER.info(f"User has no {LDAP_DISTINGUISHED_NAME} set.")
             return
-        try:
-            self._connection.extend.microsoft.modify_password(user_dn, password)
-        except (LDAPAttributeError, LDAPUnwillingToPerformResult, LDAPNoSuchAttributeResult):
-            self._connection.extend.standard.modify_password(user_dn, new_password=password)
+        with self._pool.connection() as connection:
+            try:
+                connection.extend.microsoft.modify_password(user_dn, password)
+            except (LDAPAttributeError, LDAPUnwillingToPerformResult, LDAPNoSuchAttributeResult):
+                connection.extend.standard.modify_password(user_dn, new_password=password)
 
     def _ad_check_password_existing(self, password: str, user_dn: str) -> bool:
         """Check if a password contains sAMAccount or displayName"""
-        users = list(
-            self._connection.extend.standard.paged_search(
-                search_base=user_dn,
-                search_filter=self._source.user_object_filter,
-                search_scope=BASE,
-                attributes=["displayName", "sAMAccountName"],
+        with self._pool.connection() as connection:
+            users = list(
+                connection.extend.standard.paged_search(
+                    search_base=user_dn,
+                    search_filter=self._source.user_object_filter,
+                    search_scope=BASE,
+                    attributes=["displayName", "sAMAccountName"],
+                )
             )
-        )
         if len(users) != 1:
             raise AssertionError()
         user_attributes = users[0]["attributes"]
@@ -0,0 +1,246 @@
+"""LDAP connection pooling"""
+
+from collections import deque
+from collections.abc import Generator
+from contextlib import contextmanager
+from hashlib import sha256
+from threading import Lock
+from time import perf_counter, time
+
+from django.db import connection as db_connection
+from ldap3 import NONE, Connection, ServerPool
+from ldap3.core.exceptions import (
+    LDAPCommunicationError,
+    LDAPException,
+    LDAPInsufficientAccessRightsResult,
+    LDAPSchemaError,
+)
+from structlog.stdlib import get_logger
+
+from authentik.lib.config import CONFIG
+from authentik.sources.ldap.apps import (
+    GAUGE_LDAP_POOL_CONNECTIONS,
+    HIST_LDAP_POOL_BIND_DURATION,
+)
+from authentik.sources.ldap.models import LDAPSource
+
+LOGGER = get_logger()
+
+
+class LDAPConnectionPool:
+    """Per-source pool of LDAP connections sharing a single `ServerPool`.
+
+    The server pool (and with it the TLS settings, client certificate files and
+    the server info/schema fetched on the first bind) is created once and reused
+    for all connections. Service connections are bound as the source's bind user,
+    bind connections are only used to verify user credentials via rebind."""
+
+    def __init__(self, source: LDAPSource) -> None:
+        self.source = source
+        self.fingerprint = LDAPConnectionPool.fingerprint_for(source)
+        self.size = CONFIG.get_int("ldap.pool.size", 5)
+        self.max_idle = CONFIG.get_int("ldap.pool.max_idle_seconds", 300)
+        self._lock = Lock()
+        self._server: ServerPool | None = None
+        self._server_kwargs = {}
+        # Idle connections as tuple of connection and time they were returned
+        self._idle: deque[tuple[Connection, float]] = deque()
+        self._bind_idle: deque[tuple[Connection, float]] = deque()
+        self._in_use = 0
+
+    @staticmethod
+    def fingerprint_for(source: LDAPSource) -> str:
+        """Fingerprint of all attributes that influence how we connect to the server"""
+        parts = [
+            source.server_uri,
+            source.bind_cn,
+            source.bind_password,
+            str(source.start_tls),
+            str(source.sni),
+        ]
+        for keypair in [source.peer_certificate, source.client_certificate]:
+            parts.append(str(keypair.pk) if keypair else "")
+            parts.append(keypair.last_updated.isoformat() if keypair else "")
+        return sha256("\0".join(parts).encode()).hexdigest()
+
+    @property
+    def server(self) -> ServerPool:
+        """Lazily create the server pool, which is then kept for the lifetime of this pool"""
+        with self._lock:
+            if not self._server:
+                self._server = self.source.server(**self._server_kwargs)
+            return self._server
+
+    def _update_metrics(self):
+        GAUGE_LDAP_POOL_CONNECTIONS.labels(
+            tenant=db_connection.schema_name, source=self.source.slug, state="idle"
+        ).set(len(self._idle) + len(self._bind_idle))
+        GAUGE_LDAP_POOL_CONNECTIONS.labels(
+            tenant=db_connection.schema_name, source=self.source.slug, state="in_use"
+        ).set(self._in_use)
+
+    def _pop_idle(self, queue: deque[tuple[Connection, float]]) -> Connection | None:
+        """Get the most recently returned idle connection, discarding
+        connections which have been idle for too long"""
+        with self._lock:
+            while queue:
+                conn, returned = queue.pop()
+                if time() - returned > self.max_idle or conn.closed:
+                    self._discard(conn)
+                    continue
+                self._in_use += 1
+                return conn
+            self._in_use += 1
+            return None
+
+    def _push_idle(self, queue: deque[tuple[Connection, float]], conn: Connection | None):
+        with self._lock:
+            self._in_use -= 1
+            if conn is None:
+                return
+            if conn.closed or len(queue) >= self.size:
+                self._discard(conn)
+                return
+            queue.append((conn, time()))
+
+    def _discard(self, conn: Connection):
+        try:
+            conn.unbind()
+        except LDAPException:
+            pass
+
+    def _ensure_server_info(self, conn: Connection):
+        """Server info is only read on the first bind against each server of the pool"""
+        if conn.server.info is None and conn.server.get_info != NONE:
+            conn.refresh_server_info()
+
+    def _connect(self, connection_kwargs: dict | None = None) -> Connection:
+        try:
+            conn = self.source.connection(
+                server=self.server,
+                connection_kwargs=connection_kwargs,
+                read_server_info=False,
+            )
+        except (LDAPSchemaError, LDAPInsufficientAccessRightsResult) as exc:
+            # Same fallback as `LDAPSource.connection`, however we need to re-create
+            # the server pool as the server kwargs are part of the pool
+            # See https://github.com/goauthentik/authentik/issues/4590
+            if self._server_kwargs.get("get_info") == NONE:
+                raise exc
+            LOGGER.debug("Failed to read server info, disabling", source=self.source, exc=exc)
+            self.close()
+            self._server_kwargs["get_info"] = NONE
+            return self._connect(connection_kwargs)
+        self._ensure_server_info(conn)
+        return conn
+
+    @contextmanager
+    def connection(self) -> Generator[Connection]:
+        """Get a connection bound as the source's bind user, which is returned to the pool
+        after use. Connections which raised a communication error are not re-used."""
+        conn = self._pop_idle(self._idle)
+        try:
+            if not conn:
+                conn = self._connect()
+            self._update_metrics()
+            yield conn
+        except LDAPCommunicationError:
+            if conn:
+                self._discard(conn)
+            conn = None
+            raise
+        finally:
+            self._push_idle(self._idle, conn)
+            self._update_metrics()
+
+    def bind(self, user_dn: str, password: str) -> bool:
+        """Check if `user_dn` can bind with `password`, re-using an existing connection
+        (and its TLS session) when possible.
+
+        Raises `LDAPInvalidCredentialsResult` when the credentials are invalid, except
+        for connections that don't raise exceptions, in which case `False` is returned."""
+        start = perf_counter()
+        conn = self._pop_idle(self._bind_idle)
+        reused = conn is not None
+        try:
+            if conn:
+                return conn.rebind(user=user_dn, password=password, read_server_info=False)
+            conn = self._connect(
+                connection_kwargs={
+                    "user": user_dn,
+                    "password": password,
+                }
+            )
+            return True
+        except LDAPCommunicationError:
+            if conn:
+                self._discard(conn)
+            conn = None
+            raise
+        finally:
+            self._push_idle(self._bind_idle, conn)
+            self._update_metrics()
+            HIST_LDAP_POOL_BIND_DURATION.labels(
+                tenant=db_connection.schema_name,
+                source=self.source.slug,
+                reused=reused,
+            ).observe(perf_counter() - start)
+
+    def close(self):
+        """Close all idle connections and remove any temporary TLS files"""
+        with self._lock:
+            for queue in [self._idle, self._bind_idle]:
+                while queue:
+                    conn, _ = queue.pop()
+                    self._discard(conn)
+            if self._server:
+                self.source.cleanup_tls_files(self._server)
+            self._server = None
+        self._update_metrics()
+
+
+_pools: dict[tuple[str, str], LDAPConnectionPool] = {}
+_pools_lock = Lock()
+
+
+def get_pool(source: LDAPSource) -> LDAPConnectionPool:
+    """Get the connection pool for `source`, re-creating it when the source's
+    connection settings changed (possibly in another process)"""
+    key = (db_connection.schema_name, str(source.pk))
+    fingerprint = LDAPConnectionPool.fingerprint_for(source)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool and pool.fingerprint == fingerprint:
+            pool.source = source
+            return pool
+        if pool:
+            pool.close()
+        pool = LDAPConnectionPool(source)
+        _pools[key] = pool
+        return pool
+
+
+def invalidate_pool(source_pk: str):
+    """Close and remove the pool of the source with `source_pk`"""
+    key = (db_connection.schema_name, str(source_pk))
+    with _pools_lock:
+        pool = _pools.pop(key, None)
+    if pool:
+        pool.close()
+
+
+def invalidate_pools_for_keypair(keypair_pk: str):
+    """Close and remove pools of sources using the keypair `keypair_pk`"""
+    with _pools_lock:
+        keys = [
+            key
+            for key, pool in _pools.items()
+            if keypair_pk
+            in (
+                str(pool.source.peer_certificate_id),
+                str(pool.source.client_certificate_id),
+            )
+        ]
+        pools = [_pools.pop(key) for key in keys]
+    for pool in pools:
+        pool.close()
@@ -2,6 +2,7 @@
 
 from typing import Any
 
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils.translation import gettext_lazy as _
 from ldap3.core.exceptions import LDAPOperationResult
@@ -10,22 +11,41 @@ from structlog.stdlib import get_logger
 
 from authentik.core.models import User
 from authentik.core.signals import password_changed
+from authentik.crypto.models import CertificateKeyPair
 from authentik.events.models import Event, EventAction
 from authentik.flows.planner import PLAN_CONTEXT_PENDING_USER
 from authentik.sources.ldap.models import LDAPSource
 from authentik.sources.ldap.password import LDAPPasswordChanger
+from authentik.sources.ldap.pool import invalidate_pool, invalidate_pools_for_keypair
 from authentik.stages.prompt.signals import password_validate
 
 LOGGER = get_logger()
 
 
+@receiver(post_save, sender=LDAPSource)
+@receiver(post_delete, sender=LDAPSource)
+def ldap_source_invalidate_pool(sender, instance: LDAPSource, **_):
+    """Close pooled connections when a source is changed or deleted"""
+    invalidate_pool(instance.pk)
+
+
+@receiver(post_save, sender=CertificateKeyPair)
+def ldap_keypair_invalidate_pool(sender, instance: CertificateKeyPair, **_):
+    """Close pooled connections of sources using a changed keypair"""
+    invalidate_pools_for_keypair(str(instance.pk))
+
+
 @receiver(password_validate)
 def ldap_password_validate(sender, password: str, plan_context: dict[str, Any], **__):
     """if there's an LDAP Source with enabled password sync, check the password"""
-    sources = LDAPSource.objects.filter(sync_users_password=True, enabled=True)
-    if not sources.exists():
+    # Load the keypairs with the source, as they're part of the connection pool's fingerprint
+    source = (
+        LDAPSource.objects.filter(sync_users_password=True, enabled=True)
+        .select_related("peer_certificate", "client_certificate")
+        .first()
+    )
+    if not source:
         return
-    source = sources.first()
     user = plan_context.get(PLAN_CONTEXT_PENDING_USER, None)
     if user and not LDAPPasswordChanger.should_check_user(user):
         return
@@ -39,10 +59,14 @@ def ldap_password_validate(sender, password: str, plan_context: dict[str, Any],
 @receiver(password_changed)
 def ldap_sync_password(sender, user: User, password: str, **_):
     """Connect to ldap and update password."""
-    sources = LDAPSource.objects.filter(sync_users_password=True, enabled=True)
-    if not sources.exists():
+    # Load the keypairs with the source, as they're part of the connection pool's fingerprint
+    source = (
+        LDAPSource.objects.filter(sync_users_password=True, enabled=True)
+        .select_related("peer_certificate", "client_certificate")
+        .first()
+    )
+    if not source:
         return
-    source = sources.first()
     if source.pk == getattr(sender, "pk", None):
         return
     if not LDAPPasswordChanger.should_check_user(user):
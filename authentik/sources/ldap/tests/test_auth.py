@@ -1,6 +1,6 @@
 """LDAP Source tests"""
 
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import ANY, MagicMock, Mock, patch
 
 from django.db.models import Q
 from django.test import TestCase
@@ -55,10 +55,12 @@ class LDAPSyncTests(TestCase):
                 user,
             )
             connection.assert_called_with(
+                server=ANY,
                 connection_kwargs={
                     "user": "cn=user0,ou=foo,ou=users,dc=goauthentik,dc=io",
                     "password": LDAP_PASSWORD,
-                }
+                },
+                read_server_info=False,
             )
             bind_mock.assert_not_called()
 
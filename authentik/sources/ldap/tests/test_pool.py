@@ -0,0 +1,54 @@
+"""LDAP Connection pool tests"""
+
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from authentik.lib.generators import generate_key
+from authentik.sources.ldap.models import LDAPSource
+from authentik.sources.ldap.pool import get_pool
+from authentik.sources.ldap.tests.mock_ad import mock_ad_connection
+
+LDAP_PASSWORD = generate_key()
+USER_DN = "cn=user0,ou=foo,ou=users,dc=goauthentik,dc=io"
+
+
+class LDAPPoolTests(TestCase):
+    """LDAP Connection pool tests"""
+
+    def setUp(self):
+        self.source = LDAPSource.objects.create(
+            name="ldap",
+            slug="ldap",
+            server_uri="ldap://localhost",
+            base_dn="dc=goauthentik,dc=io",
+        )
+
+    def test_bind_reuse(self):
+        """Test that user binds re-use connections"""
+        connection = MagicMock(return_value=mock_ad_connection(LDAP_PASSWORD))
+        with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+            pool = get_pool(self.source)
+            self.assertTrue(pool.bind(USER_DN, LDAP_PASSWORD))
+            self.assertTrue(pool.bind(USER_DN, LDAP_PASSWORD))
+            self.assertFalse(pool.bind(USER_DN, "invalid"))
+            self.assertEqual(connection.call_count, 1)
+
+    def test_connection_reuse(self):
+        """Test that service connections are returned to the pool"""
+        connection = MagicMock(return_value=mock_ad_connection(LDAP_PASSWORD))
+        with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+            pool = get_pool(self.source)
+            with pool.connection() as first:
+                pass
+            with pool.connection() as second:
+                self.assertEqual(first, second)
+            self.assertEqual(connection.call_count, 1)
+
+    def test_invalidate(self):
+        """Test that changing the source re-creates the pool"""
+        pool = get_pool(self.source)
+        self.assertEqual(get_pool(self.source), pool)
+        self.source.server_uri = "ldap://other"
+        self.source.save()
+        self.assertNotEqual(get_pool(self.source), pool)
@@ -8,6 +8,7 @@ from django.http import HttpRequest
 from lxml import etree  # nosec
 from lxml.etree import Element  # nosec
 
+from authentik.crypto.cache import get_xmlsec_key
 from authentik.providers.saml.utils import get_random_id
 from authentik.providers.saml.utils.encoding import deflate_and_base64_encode
 from authentik.providers.saml.utils.time import get_time_string
@@ -94,13 +95,7 @@ class RequestProcessor:
 
             ctx = xmlsec.SignatureContext()
 
-            key = xmlsec.Key.from_memory(
-                self.source.signing_kp.key_data, xmlsec.constants.KeyDataFormatPem, None
-            )
-            key.load_cert_from_memory(
-                self.source.signing_kp.certificate_data,
-                xmlsec.constants.KeyDataFormatCertPem,
-            )
+            key = get_xmlsec_key(self.source.signing_kp)
             ctx.key = key
 
             digest_algorithm_transform = DIGEST_ALGORITHM_TRANSLATION_MAP.get(
@@ -150,13 +145,7 @@ class RequestProcessor:
 
             ctx = xmlsec.SignatureContext()
 
-            key = xmlsec.Key.from_memory(
-                self.source.signing_kp.key_data, xmlsec.constants.KeyDataFormatPem, None
-            )
-            key.load_cert_from_memory(
-                self.source.signing_kp.certificate_data,
-                xmlsec.constants.KeyDataFormatPem,
-            )
+            key = get_xmlsec_key(self.source.signing_kp)
             ctx.key = key
 
             signature = ctx.sign_binary(querystring.encode("utf-8"), sign_algorithm_transform)
@@ -21,6 +21,7 @@ from authentik.core.models import (
     User,
 )
 from authentik.core.sources.flow_manager import SourceFlowManager
+from authentik.crypto.cache import get_xmlsec_key
 from authentik.lib.utils.time import timedelta_from_string
 from authentik.sources.saml.exceptions import (
     InvalidEncryption,
@@ -88,10 +89,7 @@ class ResponseProcessor:
     def _decrypt_response(self):
         """Decrypt SAMLResponse EncryptedAssertion Element"""
         manager = xmlsec.KeysManager()
-        key = xmlsec.Key.from_memory(
-            self._source.encryption_kp.key_data,
-            xmlsec.constants.KeyDataFormatPem,
-        )
+        key = get_xmlsec_key(self._source.encryption_kp)
 
         manager.add_key(key)
         encryption_context = xmlsec.EncryptionContext(manager)
@@ -141,10 +139,7 @@ class ResponseProcessor:
             xmlsec.tree.add_ids(self._root, ["ID"])
 
             ctx = xmlsec.SignatureContext()
-            key = xmlsec.Key.from_memory(
-                self._source.verification_kp.certificate_data,
-                xmlsec.constants.KeyDataFormatCertPem,
-            )
+            key = get_xmlsec_key(self._source.verification_kp, with_private_key=False)
             ctx.key = key
 
             ctx.set_enabled_key_data([xmlsec.constants.KeyDataX509])